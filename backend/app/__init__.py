@@ -21,6 +21,32 @@ celery = Celery(
     backend=os.getenv('CELERY_RESULT_BACKEND', 'redis://redis:6379/0')
 )
 
+# Property tasks run seconds-to-minutes (LLM + ATTOM calls), so the
+# default prefetch pins queued work behind busy workers. One task per
+# worker slot, acked on completion, and a dedicated queue keep the
+# pipeline spread across whatever concurrency the worker is given.
+celery.conf.update(
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    # Tasks log through get_task_logger; leave stdout and the root
+    # logger alone so stray prints don't serialize through the worker's
+    # redirection machinery
+    worker_redirect_stdouts=False,
+    worker_hijack_root_logger=False,
+    # msgpack messages are meaningfully smaller than JSON on the broker;
+    # json stays accepted so messages queued before a deploy still run
+    task_serializer='msgpack',
+    result_serializer='msgpack',
+    accept_content=['msgpack', 'json'],
+    result_accept_content=['msgpack', 'json'],
+    task_routes={
+        'process_floor_plan': {'queue': 'property'},
+        'enrich_property_data': {'queue': 'property'},
+        'generate_listing_copy': {'queue': 'property'},
+        'process_property_workflow': {'queue': 'property'},
+    },
+)
+
 # Import tasks to register them with Celery
 # Must be after celery initialization
 try:
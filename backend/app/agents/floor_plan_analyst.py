@@ -244,7 +244,11 @@ class FloorPlanAnalyst:
             if image_bytes:
                 ocr_result = self.ocr_parser.parse_dimensions_from_image(image_bytes)
                 print(f"   OCR found {len(ocr_result.get('dimensions', []))} dimensions via {ocr_result.get('extraction_method', 'unknown')}")
-            
+            # OCR was the last consumer of the raw buffer; release it so the
+            # worker doesn't hold both the image and its base64 copy (often
+            # 5-20MB each) through the whole vision call
+            image_bytes = None
+
             # STEP 2: Analyze floor plan layout with Gemini Vision
             print("🔍 Step 2: Analyzing floor plan layout with Gemini Vision...")
             result_text = _analyze_with_gemini_vision(
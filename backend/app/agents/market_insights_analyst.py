@@ -11,6 +11,7 @@ Data Sources:
 
 import os
 import json
+import orjson
 from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
 from crewai import Agent, Task, Crew
@@ -95,7 +96,7 @@ def search_property_data(address: str, city: str = "", state: str = "") -> str:
     try:
         client = AttomAPIClient()
         property_data = client.search_property(address, city=city, state=state)
-        return json.dumps(property_data, indent=2)
+        return json.dumps(property_data.to_dict(), indent=2)
     except Exception as e:
         return f"Error fetching property data: {str(e)}"
 
@@ -117,7 +118,7 @@ def get_comparable_properties(address: str, city: str, state: str, radius_miles:
     try:
         client = AttomAPIClient()
         comps = client.get_comparables(address, city, state, radius_miles=radius_miles, max_results=10)
-        return json.dumps(comps, indent=2)
+        return json.dumps([comp.to_dict() for comp in comps], indent=2)
     except Exception as e:
         return f"Error fetching comparables: {str(e)}"
 
@@ -203,7 +204,7 @@ def scrape_property_data(address: str, city: str, state: str) -> str:
     """
     try:
         # Import here to avoid circular imports
-        from app.scrapers.multi_source_scraper import MultiSourceScraper
+        from app.scrapers.multi_source_scraper import MultiSourceScraper, close_loop_client
 
         norm = normalize_address(address)
         street = (norm.get('street') or address).strip()
@@ -217,20 +218,27 @@ def scrape_property_data(address: str, city: str, state: str) -> str:
         asyncio.set_event_loop(loop)
 
         async def run_scraper():
-            async with MultiSourceScraper() as scraper:
-                return await scraper.scrape_property(
-                    street,
-                    city_hint or borough_hint or city or '',
-                    state_hint,
-                    zip_code=zip_hint,
-                    borough=borough_hint,
-                    neighborhood=neighborhood_hint
-                )
-        
+            try:
+                async with MultiSourceScraper() as scraper:
+                    return await scraper.scrape_property(
+                        street,
+                        city_hint or borough_hint or city or '',
+                        state_hint,
+                        zip_code=zip_hint,
+                        borough=borough_hint,
+                        neighborhood=neighborhood_hint
+                    )
+            finally:
+                # This loop dies with the call; release its pooled client
+                # on the loop that owns it
+                await close_loop_client()
+
         result = loop.run_until_complete(run_scraper())
         loop.close()
-        
-        return json.dumps(result, indent=2)
+
+        # orjson serializes the (potentially large) aggregated payload in one
+        # C pass; OPT_INDENT_2 keeps the output readable for the agent
+        return orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
     except Exception as e:
         logger.warning(f"Web scraping failed: {str(e)}")
         return f"Web scraping unavailable: {str(e)}"
@@ -298,6 +306,10 @@ class MarketInsightsAnalyst:
         )
     """
     
+    # Minimum ATTOM AVM confidence score (0-100) before the LLM call is
+    # skipped entirely in favor of deterministic insights
+    AVM_SHORTCUT_CONFIDENCE = 85.0
+
     def __init__(self):
         """Initialize Market Insights Analyst with CrewAI"""
         self.attom = AttomAPIClient()
@@ -410,6 +422,15 @@ class MarketInsightsAnalyst:
             attom_comps = attom.get('comparables') or []
             multi_source_bundle = property_data.get('multi_source') or {}
 
+            # High-confidence AVM short-circuit: when ATTOM already prices
+            # the property with strong confidence and comps/trends are on
+            # hand, build the insights deterministically and skip the
+            # 2-10s LLM call that dominates task wall time and cost
+            shortcut = self._insights_from_avm(property_data)
+            if shortcut is not None:
+                print("[ATTOM] High-confidence AVM; skipping LLM market analysis.")
+                return shortcut
+
             validated: Optional[MarketInsights] = None
 
             if self.model and attom:
@@ -663,6 +684,102 @@ Be concise. If data is unavailable, estimate based on property characteristics a
             # Return fallback data
             return self._generate_fallback_insights(property_data, str(e))
     
+    @staticmethod
+    def _trend_price(entry) -> Optional[float]:
+        """Pull a median/average sale price out of a raw v4 trend entry"""
+        if not isinstance(entry, dict):
+            return None
+        st = entry.get('salesTrend') or entry.get('SalesTrend') or entry
+        if not isinstance(st, dict):
+            return None
+        for key in ('medSalePrice', 'medsaleprice', 'avgSalePrice', 'avgsaleprice'):
+            val = st.get(key)
+            if isinstance(val, (int, float)) and val > 0:
+                return float(val)
+        return None
+
+    def _insights_from_avm(self, property_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Deterministic MarketInsights built straight from a high-confidence
+        ATTOM AVM plus the pre-fetched comps/trends.
+
+        Returns None when the AVM is weak or the structured data is too
+        thin, in which case the LLM paths run as before.
+        """
+        try:
+            attom = property_data.get('attom') or {}
+            avm = attom.get('avm') or {}
+            est = avm.get('estimated_value')
+            score = float(avm.get('confidence_score') or 0)
+            if not est or score < self.AVM_SHORTCUT_CONFIDENCE:
+                return None
+            comps = attom.get('comparables') or []
+            trends_bundle = attom.get('sales_trends_v4') or attom.get('sales_trends') or {}
+            trends = trends_bundle.get('trends') if isinstance(trends_bundle, dict) else None
+            if not comps and not trends:
+                # Too thin to stand alone - let the LLM reason from scraps
+                return None
+
+            sqft = property_data.get('square_footage')
+            appreciation = None
+            direction = 'stable'
+            if trends and len(trends) >= 2:
+                # trends[0] is the latest entry (see get_sales_trends_v4)
+                newest = self._trend_price(trends[0])
+                oldest = self._trend_price(trends[-1])
+                if newest and oldest:
+                    appreciation = round((newest - oldest) / oldest * 100.0, 2)
+                    if appreciation > 2.0:
+                        direction = 'rising'
+                    elif appreciation < -2.0:
+                        direction = 'declining'
+
+            insights = {
+                'price_estimate': {
+                    'estimated_value': int(est),
+                    'confidence': 'high',
+                    'value_range_low': int(avm.get('value_range_low') or est * 0.95),
+                    'value_range_high': int(avm.get('value_range_high') or est * 1.05),
+                    'reasoning': (
+                        f"ATTOM AVM estimate with confidence score {score:.0f}/100; "
+                        "LLM analysis skipped because structured data sufficed."
+                    ),
+                    'price_per_sqft': round(est / sqft, 2) if sqft else None,
+                },
+                'market_trend': {
+                    'trend_direction': direction,
+                    'appreciation_rate': appreciation,
+                    'days_on_market_avg': None,
+                    'inventory_level': 'balanced',
+                    'buyer_demand': 'moderate',
+                    'insights': (
+                        f"Derived from ATTOM sales trends ({len(trends)} periods)."
+                        if trends else "No sales-trend series available; defaults shown."
+                    ),
+                },
+                'investment_analysis': {
+                    'investment_score': int(min(90, max(40, score + (10 if direction == 'rising' else 0) - 10))),
+                    'rental_potential': 'fair' if direction == 'declining' else 'good',
+                    'estimated_rental_income': None,
+                    'cap_rate': None,
+                    'appreciation_potential': {'rising': 'high', 'stable': 'moderate', 'declining': 'low'}[direction],
+                    'risk_factors': ['Valuation is model-based (ATTOM AVM) without agent review'],
+                    'opportunities': (
+                        ['Area median prices trending upward'] if direction == 'rising' else []
+                    ),
+                },
+                'comparable_properties': comps[:5],
+                'summary': (
+                    f"ATTOM AVM values the property at ${int(est):,} "
+                    f"(confidence {score:.0f}/100) with {len(comps)} comparables; "
+                    f"area prices are {direction}."
+                ),
+            }
+            return MarketInsights(**insights).model_dump()
+        except Exception as err:
+            logger.warning("AVM short-circuit failed; falling through to LLM. Error: %s", err)
+            return None
+
     def _sanitize_market_data(self, data: Dict) -> Dict:
         """
         Sanitize market data to match schema types.
@@ -7,11 +7,91 @@ Sample Code: https://api.developer.attomdata.com/sample-code-guide
 """
 
 import os
+import ssl
+import threading
 import time
+from dataclasses import dataclass, asdict
 from typing import Dict, Any, List, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 
+from app.utils.lookup_cache import GEO_TTL_SEC, get_or_set, lookup_cache_key
+
+# Shared TLS context so session tickets are reused across reconnects
+# (saves a round trip when the pool re-opens connections after idle)
+_SSL_CTX = ssl.create_default_context()
+
+
+class _TLSReuseAdapter(HTTPAdapter):
+    """HTTPAdapter that pins the shared SSL context onto the connection pool"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['ssl_context'] = _SSL_CTX
+        return super().init_poolmanager(*args, **kwargs)
+
+
+# One adapter (and therefore one connection pool) per worker process.
+# Call sites construct AttomAPIClient per use, so a per-instance pool
+# would pay a fresh TCP+TLS handshake on nearly every request; mounting
+# the same adapter on every session keeps connections warm across
+# instances. Retries cover transient gateway errors only - GETs are
+# idempotent, POSTs are left to the caller.
+_SHARED_ADAPTER = _TLSReuseAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({'GET'}),
+    ),
+)
+
+
+@dataclass(slots=True, frozen=True)
+class NormalizedProperty:
+    """
+    Normalized property record returned by search/comp/nearby lookups.
+
+    Slots-based dataclass instead of a plain dict: in batch flows returning
+    hundreds of comps this cuts per-record memory roughly 3x and makes
+    downstream attribute access (p.square_feet) cheaper than dict lookups.
+    Dict-style access (p['zip'], p.get('zip')) is kept for compatibility
+    with existing consumers; use to_dict() at JSON boundaries.
+    """
+    attom_id: Optional[str] = None
+    apn: Optional[str] = None
+    fips: Optional[str] = None
+    address: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    zip: Optional[str] = None
+    county: Optional[str] = None
+    property_type: Optional[str] = None
+    year_built: Optional[int] = None
+    bedrooms: Optional[int] = None
+    bathrooms: Optional[float] = None
+    square_feet: Optional[int] = None
+    lot_size: Optional[float] = None
+    last_sale_date: Optional[str] = None
+    last_sale_price: Optional[int] = None
+    assessed_value: Optional[int] = None
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict for JSON serialization / DB persistence"""
+        return asdict(self)
+
 
 class AttomAPIClient:
     """
@@ -29,29 +109,43 @@ class AttomAPIClient:
     """
     
     BASE_URL = "https://api.gateway.attomdata.com/propertyapi/v1.0.0"
-    
+
+    # How long a cached GET response stays fresh (seconds)
+    CACHE_TTL_SECONDS = 300
+
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize ATTOM API client
-        
+
         Args:
             api_key: ATTOM API key (or from ATTOM_API_KEY env var)
         """
         self.api_key = api_key or os.getenv('ATTOM_API_KEY')
-        
+
         if not self.api_key:
             raise ValueError("ATTOM API key not found. Set ATTOM_API_KEY environment variable")
-        
+
         self.session = requests.Session()
+        self.session.mount('https://', _SHARED_ADAPTER)
         self.session.headers.update({
             'apikey': self.api_key,
             'Accept': 'application/json'
         })
-        
+
         # Rate limiting tracking (free trial limits)
         self.request_count = 0
         self.last_request_time = None
-        
+        self._throttle_lock = threading.Lock()
+
+        # In-memory response cache: (endpoint, params) -> (timestamp, payload)
+        # Cached hits bypass the inter-request throttle entirely
+        self._response_cache: Dict[tuple, tuple] = {}
+
+    @staticmethod
+    def _cache_key(endpoint: str, params: Optional[Dict]) -> tuple:
+        """Build a hashable cache key from endpoint + query params"""
+        return (endpoint, tuple(sorted(params.items())) if params else ())
+
     def _make_request(self, endpoint: str, params: Optional[Dict] = None, method: str = 'GET') -> Dict[str, Any]:
         """
         Make authenticated API request to ATTOM
@@ -68,13 +162,26 @@ class AttomAPIClient:
             Exception: If request fails
         """
         url = f"{self.BASE_URL}/{endpoint}"
-        
-        # Basic rate limiting (500ms between requests)
-        if self.last_request_time:
-            elapsed = time.time() - self.last_request_time
-            if elapsed < 0.5:
-                time.sleep(0.5 - elapsed)
-        
+
+        # Serve cached GET responses before throttling - a cache hit should
+        # not pay the 500ms inter-request delay or count against the quota
+        cache_key = None
+        if method == 'GET':
+            cache_key = self._cache_key(endpoint, params)
+            cached = self._response_cache.get(cache_key)
+            if cached and (time.time() - cached[0]) < self.CACHE_TTL_SECONDS:
+                return cached[1]
+
+        # Basic rate limiting (500ms between request starts). The lock keeps
+        # the spacing honest when callers run lookups in parallel threads -
+        # requests still start 500ms apart but their responses overlap.
+        with self._throttle_lock:
+            if self.last_request_time:
+                elapsed = time.time() - self.last_request_time
+                if elapsed < 0.5:
+                    time.sleep(0.5 - elapsed)
+            self.last_request_time = time.time()
+
         try:
             if method == 'GET':
                 response = self.session.get(url, params=params, timeout=30)
@@ -82,13 +189,15 @@ class AttomAPIClient:
                 response = self.session.post(url, json=params, timeout=30)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
-            
-            self.last_request_time = time.time()
+
             self.request_count += 1
-            
+
             response.raise_for_status()
-            return response.json()
-            
+            payload = response.json()
+            if cache_key is not None:
+                self._response_cache[cache_key] = (time.time(), payload)
+            return payload
+
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
                 raise Exception("Property not found in ATTOM database")
@@ -107,18 +216,19 @@ class AttomAPIClient:
         except requests.exceptions.RequestException as e:
             raise Exception(f"ATTOM API request failed: {str(e)}")
     
-    def search_property(self, address: str, city: Optional[str] = None, 
-                       state: Optional[str] = None, zip_code: Optional[str] = None) -> Dict[str, Any]:
+    def search_property(self, address: str, city: Optional[str] = None,
+                       state: Optional[str] = None, zip_code: Optional[str] = None) -> NormalizedProperty:
         """
         Search for property by address using ATTOM address endpoint
-        
+
         Args:
             address: Street address (e.g., "123 Main St")
             city: City name (optional, but recommended)
             state: State abbreviation (optional, but recommended)
             zip_code: ZIP code (optional)
-        
+
         Returns:
+            NormalizedProperty with fields like:
             {
                 "attom_id": "123456789",
                 "apn": "1234-567-890",
@@ -175,9 +285,14 @@ class AttomAPIClient:
             raise Exception(f"No property found for address: {address}")
         
         # Return first matching property
-        prop = properties[0]
-        
-        # Extract nested data
+        return self._normalize_property_record(properties[0])
+
+    @staticmethod
+    def _normalize_property_record(prop: Dict[str, Any]) -> NormalizedProperty:
+        """
+        Normalize a raw ATTOM property record into the flat NormalizedProperty
+        shape used by search_property() and friends
+        """
         identifier = prop.get('identifier', {})
         address_data = prop.get('address', {})
         building = prop.get('building', {})
@@ -186,27 +301,120 @@ class AttomAPIClient:
         lot = prop.get('lot', {})
         sale = prop.get('sale', {})
         assessment = prop.get('assessment', {})
-        
-        return {
-            'attom_id': identifier.get('attomId'),
-            'apn': identifier.get('apn'),
-            'fips': identifier.get('fips'),
-            'address': address_data.get('line1'),
-            'city': address_data.get('locality'),
-            'state': address_data.get('countrySubd'),
-            'zip': address_data.get('postal1'),
-            'county': address_data.get('county'),
-            'property_type': prop.get('summary', {}).get('proptype'),
-            'year_built': building.get('summary', {}).get('yearbuilt'),
-            'bedrooms': rooms.get('beds'),
-            'bathrooms': rooms.get('bathstotal'),
-            'square_feet': size.get('universalsize'),
-            'lot_size': lot.get('lotsize1'),
-            'last_sale_date': sale.get('saleTransDate'),
-            'last_sale_price': sale.get('saleAmtStndUnit'),
-            'assessed_value': assessment.get('assessed', {}).get('assdttlvalue')
+        assessed = assessment.get('assessed', {})
+
+        return NormalizedProperty(
+            attom_id=identifier.get('attomId'),
+            apn=identifier.get('apn'),
+            fips=identifier.get('fips'),
+            address=address_data.get('line1') or address_data.get('oneLine'),
+            city=address_data.get('locality'),
+            state=address_data.get('countrySubd'),
+            zip=address_data.get('postal1'),
+            county=address_data.get('county'),
+            property_type=prop.get('summary', {}).get('proptype') or building.get('summary', {}).get('proptype'),
+            year_built=building.get('summary', {}).get('yearbuilt'),
+            bedrooms=rooms.get('beds'),
+            bathrooms=rooms.get('bathstotal'),
+            square_feet=size.get('universalsize'),
+            lot_size=lot.get('lotsize1'),
+            last_sale_date=sale.get('saleTransDate'),
+            last_sale_price=sale.get('saleAmtStndUnit'),
+            assessed_value=assessed.get('assdttlvalue') if isinstance(assessed, dict) else None
+        )
+
+    def get_full_profile(self, address: str, city: Optional[str] = None,
+                         state: Optional[str] = None, zip_code: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fetch a full property profile in a single bundled request.
+
+        Uses the ATTOM 'allevents/detail' endpoint, which returns property
+        characteristics, AVM, and sale events together - replacing the
+        search_property -> get_avm -> get_sales_history sequence (3 round
+        trips -> 1) for enrichment flows. Falls back to the individual
+        endpoints only for sections missing from the bundled response.
+
+        Args:
+            address: Street address (e.g., "123 Main St")
+            city: City name (optional, but recommended)
+            state: State abbreviation (optional, but recommended)
+            zip_code: ZIP code (optional)
+
+        Returns:
+            {
+                "property": {...},       # same shape as search_property()
+                "avm": {...} | None,     # same shape as get_avm()
+                "sales_history": [...]   # same shape as get_sales_history()
+            }
+
+        Raises:
+            Exception: If property not found or API error
+        """
+        params: Dict[str, Any] = {'address1': address}
+        if city:
+            params['address2'] = city
+        if state:
+            params['address2'] = f"{params.get('address2', '')}, {state}".strip(', ')
+        if zip_code:
+            params['postalcode'] = zip_code
+
+        result = self._make_request('allevents/detail', params=params)
+
+        status = result.get('status', {})
+        if status.get('code') != 0:
+            raise Exception(f"ATTOM API error: {status.get('msg', 'Unknown error')}")
+
+        properties = result.get('property', [])
+        if not properties:
+            raise Exception(f"No property found for address: {address}")
+
+        prop = properties[0]
+        profile: Dict[str, Any] = {
+            'property': self._normalize_property_record(prop),
+            'avm': None,
+            'sales_history': []
         }
-    
+
+        # AVM rides along on allevents responses when available
+        avm = prop.get('avm', {})
+        amount = avm.get('amount', {})
+        if amount.get('value'):
+            profile['avm'] = {
+                'estimated_value': amount.get('value'),
+                'confidence_score': avm.get('confidenceScore', {}).get('score'),
+                'value_range_low': amount.get('low'),
+                'value_range_high': amount.get('high'),
+                'fsd': avm.get('fsd'),
+                'as_of_date': avm.get('eventDate')
+            }
+
+        # Sale history events, when present in the bundle
+        sales = prop.get('sale', {}).get('saleshistory', [])
+        if sales:
+            profile['sales_history'] = [
+                {
+                    'sale_date': sale.get('saleTransDate'),
+                    'sale_price': sale.get('saleAmtStndUnit'),
+                    'sale_type': sale.get('saleType'),
+                    'buyer_name': sale.get('buyerName'),
+                    'seller_name': sale.get('sellerName')
+                } for sale in sales
+            ]
+
+        # Fall back to the dedicated endpoints for anything the bundle omitted
+        if profile['avm'] is None and city and state:
+            try:
+                profile['avm'] = self.get_avm(address, city, state, zip_code=zip_code)
+            except Exception:
+                pass
+        if not profile['sales_history'] and profile['property'].get('attom_id'):
+            try:
+                profile['sales_history'] = self.get_sales_history(profile['property']['attom_id'])
+            except Exception:
+                pass
+
+        return profile
+
     def get_property_details(self, attom_id: str) -> Dict[str, Any]:
         """
         Get comprehensive property details by ATTOM ID
@@ -327,8 +535,8 @@ class AttomAPIClient:
         
         return normalized_sales
     
-    def get_comparables(self, address: str, city: str, state: str, 
-                       radius_miles: float = 0.5, max_results: int = 10) -> List[Dict[str, Any]]:
+    def get_comparables(self, address: str, city: str, state: str,
+                       radius_miles: float = 0.5, max_results: int = 10) -> List[NormalizedProperty]:
         """
         Get comparable properties (comps) for valuation
         
@@ -367,32 +575,15 @@ class AttomAPIClient:
                 return []
             
             properties = result.get('property', [])[:max_results]
-            
-            comps = []
-            for prop in properties:
-                sale = prop.get('sale', {})
-                building = prop.get('building', {})
-                address_data = prop.get('address', {})
-                
-                comps.append({
-                    'attom_id': prop.get('identifier', {}).get('attomId'),
-                    'address': address_data.get('oneLine'),
-                    'bedrooms': building.get('rooms', {}).get('beds'),
-                    'bathrooms': building.get('rooms', {}).get('bathstotal'),
-                    'square_feet': building.get('size', {}).get('universalsize'),
-                    'year_built': building.get('summary', {}).get('yearbuilt'),
-                    'last_sale_date': sale.get('saleTransDate'),
-                    'last_sale_price': sale.get('saleAmtStndUnit')
-                })
-            
-            return comps
-            
+
+            return [self._normalize_property_record(prop) for prop in properties]
+
         except Exception:
             # Comps may not be available in free trial
             return []
 
     def get_nearby_properties_by_latlng(self, latitude: float, longitude: float,
-                                        radius_miles: float = 0.2, max_results: int = 10) -> List[Dict[str, Any]]:
+                                        radius_miles: float = 0.2, max_results: int = 10) -> List[NormalizedProperty]:
         """
         Find nearby properties using latitude/longitude when address matching fails.
 
@@ -403,7 +594,7 @@ class AttomAPIClient:
             max_results: Max properties to return (default 10)
 
         Returns:
-            List of normalized property dicts similar to search_property() output
+            List of NormalizedProperty records matching search_property() output
         """
         params = {
             'latitude': latitude,
@@ -419,38 +610,7 @@ class AttomAPIClient:
                 return []
 
             properties = result.get('property', [])[:max_results]
-            normalized: List[Dict[str, Any]] = []
-            for prop in properties:
-                identifier = prop.get('identifier', {})
-                address_data = prop.get('address', {})
-                building = prop.get('building', {})
-                rooms = building.get('rooms', {})
-                size = building.get('size', {})
-                lot = prop.get('lot', {})
-                sale = prop.get('sale', {})
-                assessment = prop.get('assessment', {})
-
-                normalized.append({
-                    'attom_id': identifier.get('attomId'),
-                    'apn': identifier.get('apn'),
-                    'fips': identifier.get('fips'),
-                    'address': address_data.get('line1') or address_data.get('oneLine'),
-                    'city': address_data.get('locality'),
-                    'state': address_data.get('countrySubd'),
-                    'zip': address_data.get('postal1'),
-                    'county': address_data.get('county'),
-                    'property_type': prop.get('summary', {}).get('proptype') or building.get('summary', {}).get('proptype'),
-                    'year_built': building.get('summary', {}).get('yearbuilt'),
-                    'bedrooms': rooms.get('beds'),
-                    'bathrooms': rooms.get('bathstotal'),
-                    'square_feet': size.get('universalsize'),
-                    'lot_size': lot.get('lotsize1'),
-                    'last_sale_date': sale.get('saleTransDate'),
-                    'last_sale_price': sale.get('saleAmtStndUnit'),
-                    'assessed_value': assessment.get('assessed', {}).get('assdttlvalue') if isinstance(assessment.get('assessed', {}), dict) else None,
-                })
-
-            return normalized
+            return [self._normalize_property_record(prop) for prop in properties]
         except Exception:
             return []
     
@@ -671,11 +831,22 @@ class AttomAPIClient:
             params['stateAbbreviation'] = state_abbreviation
         if page_size:
             params['pageSize'] = page_size
-        try:
+
+        def _fetch() -> List[Dict[str, Any]]:
             resp = self.session.get(url, params=params, timeout=30)
             resp.raise_for_status()
             data = resp.json() or {}
             return data.get('geographies') or []
+
+        try:
+            # 'Brooklyn, NY' -> geoIdV4 never changes; a month-long cache
+            # makes repeat-neighborhood resolution free across tasks
+            return get_or_set(
+                lookup_cache_key('attom_geo_lookup', name,
+                                 geography_type_abbreviation, state_abbreviation, page_size),
+                _fetch,
+                ttl=GEO_TTL_SEC
+            )
         except requests.exceptions.HTTPError as e:
             raise Exception(f"ATTOM v4 location lookup error: {e.response.status_code} - {e.response.text}")
         except Exception as e:
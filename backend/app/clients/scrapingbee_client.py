@@ -9,11 +9,12 @@ Docs: https://www.scrapingbee.com/documentation/
 """
 from __future__ import annotations
 
+import asyncio
 import os
 import json
 import random
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import httpx
 
@@ -69,10 +70,25 @@ class ScrapingBeeClient:
         )
 
         self._client: Optional[httpx.AsyncClient] = None
+        # In-flight request coalescing: concurrent fetches of the same
+        # URL+params await one future instead of each spending a credit
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
 
     async def connect(self) -> None:
         if self._client is None:
-            self._client = httpx.AsyncClient(timeout=httpx.Timeout(60.0))
+            # One shared session for all three scrapers: keep-alive pooling
+            # reuses TCP/TLS connections across the parallel _safe_scrape
+            # tasks instead of paying a fresh handshake per request
+            limits = httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=30.0,
+            )
+            # HTTP/2 multiplexes the parallel scraper requests over fewer
+            # TLS connections, saving a handshake per pooled-connection miss
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(90.0), limits=limits, http2=True
+            )
             logger.info("✅ ScrapingBee client ready (async)")
 
     async def close(self) -> None:
@@ -113,7 +129,44 @@ class ScrapingBeeClient:
     ) -> httpx.Response:
         """
         Low-level fetch with support for custom ScrapingBee params and optional non-raising behavior.
+
+        Identical concurrent requests (same URL and params) are coalesced:
+        the second caller awaits the first one's future rather than issuing
+        a duplicate request.
         """
+        key = (url, wait_for, wait_timeout, allow_failure,
+               tuple(sorted((extra_params or {}).items())))
+        existing = self._inflight.get(key)
+        if existing is not None:
+            # shield: one caller being cancelled must not cancel the fetch
+            # the others are waiting on
+            return await asyncio.shield(existing)
+
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            resp = await self._fetch_once(url, wait_for, wait_timeout, extra_params, allow_failure)
+        except BaseException as e:
+            if not fut.cancelled():
+                fut.set_exception(e)
+                fut.exception()  # mark retrieved for solo callers
+            raise
+        else:
+            if not fut.cancelled():
+                fut.set_result(resp)
+            return resp
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _fetch_once(
+        self,
+        url: str,
+        wait_for: Optional[str] = None,
+        wait_timeout: int = 10000,
+        extra_params: Optional[Dict[str, Any]] = None,
+        allow_failure: bool = False,
+    ) -> httpx.Response:
+        """Issue a single ScrapingBee request (no coalescing)"""
         if self._client is None:
             await self.connect()
         params = self._base_params(url, wait_for, wait_timeout)
@@ -151,6 +204,47 @@ class ScrapingBeeClient:
                 return e.response
             raise
 
+    async def fetch_html_stream(
+        self,
+        url: str,
+        wait_for: Optional[str] = None,
+        wait_timeout: int = 10000,
+        extra_params: Optional[Dict[str, Any]] = None,
+        sentinel: Optional[bytes] = None,
+        sentinel_slack: int = 256 * 1024,
+    ) -> str:
+        """
+        Stream the response body, aborting once `sentinel` has been seen
+        and `sentinel_slack` further bytes have arrived.
+
+        Listing pages run to 1-2 MB but some parsers only consume the
+        fragment around a known marker (e.g. the first result card);
+        stopping shortly after it skips transferring and decoding the
+        rest of the document. Non-2xx bodies stream through unraised,
+        matching the transparent_status_code fetches this backs.
+        """
+        if self._client is None:
+            await self.connect()
+        params = self._base_params(url, wait_for, wait_timeout)
+        if extra_params:
+            params.update({k: v for k, v in extra_params.items() if v is not None})
+        buf = bytearray()
+        sentinel_at = -1
+        assert self._client is not None
+        logger.info(f"ScrapingBee: GET {url} (stream)")
+        async with self._client.stream("GET", self.BASE_URL, params=params) as resp:
+            async for chunk in resp.aiter_bytes(16384):
+                buf.extend(chunk)
+                if sentinel:
+                    if sentinel_at < 0:
+                        # Scan only the new tail; back up in case the
+                        # sentinel straddles a chunk boundary
+                        start = max(0, len(buf) - len(chunk) - len(sentinel))
+                        sentinel_at = buf.find(sentinel, start)
+                    if sentinel_at >= 0 and len(buf) >= sentinel_at + sentinel_slack:
+                        break
+        return buf.decode('utf-8', errors='replace')
+
     async def scrape_page(
         self,
         url: str,
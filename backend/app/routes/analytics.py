@@ -10,13 +10,20 @@ Features:
 - Calculate square footage impact
 """
 
+import hashlib
 import logging
-from flask import Blueprint, request, jsonify
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from flask import Blueprint, request, jsonify, g, has_app_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.utils.supabase_client import get_db, get_admin_db
 from app.services.regression_models import (
     PropertyRegressionModel,
     PropertyFeatures,
+    derive_property_features,
     format_comparison_report
 )
 
@@ -25,88 +32,273 @@ logger = logging.getLogger(__name__)
 # Create blueprint
 analytics_bp = Blueprint('analytics', __name__, url_prefix='/api/analytics')
 
+# Translation table deleting everything except numeric characters; a single
+# C-level str.translate pass beats running the regex engine per comp value
+_NUMERIC_KEEP = set('0123456789.-')
+_NUMERIC_TRANS = str.maketrans('', '', ''.join(chr(c) for c in range(128) if chr(c) not in _NUMERIC_KEEP))
+
+
+def _trimmed_median(values):
+    """
+    Median of the 5th-95th percentile band via O(n) selection
+
+    Small samples (< 10) short-circuit straight to np.median (introselect,
+    no trim). Larger samples use one multi-index np.partition to isolate the
+    5th-95th band — the slice between the two pivot positions holds exactly
+    those order statistics — then take its median, avoiding the full
+    O(n log n) sort.
+
+    Returns:
+        float median, or None for an empty input
+    """
+    arr = np.asarray(values, dtype=float)
+    n = arr.size
+    if n == 0:
+        return None
+    if n < 10:
+        return float(np.median(arr))
+    lo = int(0.05 * n)
+    hi = int(0.95 * n)
+    if hi <= lo:
+        return float(np.median(arr))
+    part = np.partition(arr, [lo, hi - 1])
+    return float(np.median(part[lo:hi]))
+
+
+def _coerce_numeric(ser: pd.Series) -> pd.Series:
+    """
+    Coerce a comp-field Series to floats in bulk
+
+    pd.to_numeric handles the common clean case in one C pass; entries it
+    rejects (e.g. "$450,000") get a vectorized str.translate cleanup and a
+    second coercion instead of per-value Python parsing.
+    """
+    num = pd.to_numeric(ser, errors='coerce')
+    salvage = num.isna() & ser.notna()
+    if salvage.any():
+        cleaned = ser[salvage].astype(str).str.translate(_NUMERIC_TRANS)
+        num.loc[salvage] = pd.to_numeric(cleaned, errors='coerce')
+    return num
+
+
+def _comps_median_ppsf(comp_records: list):
+    """
+    Outlier-trimmed median price-per-sqft across flattened comp dicts
+
+    Flattens the comps with pd.json_normalize and does the field-preference
+    chain, coercion, and division as column operations, so the per-comp work
+    happens in pandas C paths rather than a nested Python loop.
+
+    Returns:
+        float median PPSF, or None when no usable price/sqft pairs exist
+    """
+    if not comp_records:
+        return None
+    df = pd.json_normalize(comp_records)
+
+    def first_present(names):
+        out = None
+        for name in names:
+            if name in df.columns:
+                col = _coerce_numeric(df[name])
+                out = col if out is None else out.fillna(col)
+        return out
+
+    price = first_present(['last_sale_price', 'sale_price', 'price'])
+    sqft = first_present(['square_feet', 'sqft'])
+    if price is None or sqft is None:
+        return None
+    mask = price.notna() & sqft.notna() & (price > 0) & (sqft > 0)
+    if not mask.any():
+        return None
+    return _trimmed_median((price[mask] / sqft[mask]).to_numpy())
+
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+# Process-local cache of fitted models: (user_id, model_type) -> (timestamp, model)
+# Refitting sklearn on every request is the dominant CPU cost on these endpoints
+_MODEL_CACHE = {}
+_MODEL_CACHE_TTL_SEC = 300
+
+# Background training: sklearn fits take seconds and would otherwise hold a
+# gunicorn worker for the whole request
+_TRAIN_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+# job_id -> (user_id, Future); entries are evicted when the owner polls a
+# finished job, so completed results don't accumulate for the worker's life
+_TRAIN_JOBS = {}
+
+
+def get_or_train_model(user_id: str, model_type: str = 'ridge',
+                       train_if_missing: bool = False, min_properties: int = 5) -> PropertyRegressionModel:
+    """
+    Return a fitted PropertyRegressionModel for the user, reusing a cached
+    one when fresh instead of re-fetching features and re-fitting sklearn
+
+    Args:
+        user_id: User UUID (cache key component)
+        model_type: 'ridge' | 'linear' | 'random_forest'
+        train_if_missing: Train a new model when no fresh cached one exists
+        min_properties: Minimum properties required for training
+
+    Returns:
+        A fitted model when cached or trainable, otherwise an untrained one
+    """
+    key = (user_id, model_type)
+    entry = _MODEL_CACHE.get(key)
+    if entry and (time.monotonic() - entry[0]) < _MODEL_CACHE_TTL_SEC:
+        return entry[1]
+
+    db = get_admin_db()
+    model = PropertyRegressionModel(db_client=db)
+
+    if train_if_missing:
+        all_features = model.extract_property_features(min_properties=min_properties)
+        if len(all_features) >= min_properties:
+            results = model.build_room_dimension_model(all_features, model_type=model_type)
+            if results:
+                _MODEL_CACHE[key] = (time.monotonic(), model)
+
+    return model
+
+
+def _model_cache_ts(user_id: str, model_type: str = 'ridge') -> float:
+    """Timestamp of the user's cached model, or 0.0 when none is fresh
+
+    Applies the same TTL as get_or_train_model: once an entry expires the
+    serving path changes (fallback instead of the cached model), so the
+    conditional-request validator must change with it.
+    """
+    entry = _MODEL_CACHE.get((user_id, model_type))
+    if entry and (time.monotonic() - entry[0]) < _MODEL_CACHE_TTL_SEC:
+        return entry[0]
+    return 0.0
+
+
+def _weak_etag(*parts) -> str:
+    """Short validator hash over the inputs that determine a response"""
+    raw = ':'.join(str(p) for p in parts).encode()
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+def _etag_matches(etag: str) -> bool:
+    """Check the request's If-None-Match header against a computed ETag"""
+    inm = request.headers.get('If-None-Match')
+    return inm is not None and etag in inm
+
+
+def _get_property_rows(property_ids: list, user_id: str) -> dict:
+    """
+    Fetch properties rows (with joined measurements), memoized per request
+
+    Within one request the row cache lives on flask.g, so endpoints that
+    need the same property twice (e.g. /property-analytics hitting both
+    quality score and feature extraction) issue a single Supabase query.
+    flask.g is scoped to the app context, so no explicit teardown is needed.
+
+    Returns:
+        Dict mapping property_id -> properties row (missing/unauthorized
+        properties are absent from the result)
+    """
+    if has_app_context():
+        if not hasattr(g, '_prop_cache'):
+            g._prop_cache = {}
+        cache = g._prop_cache
+    else:
+        cache = {}
+
+    missing = [pid for pid in property_ids if (pid, user_id) not in cache]
+    if missing:
+        db = get_db()
+        result = db.table('properties')\
+            .select('*, floor_plan_measurements(*)')\
+            .in_('id', missing)\
+            .eq('agent_id', user_id)\
+            .execute()
+        for prop in (result.data or []):
+            cache[(prop['id'], user_id)] = prop
+
+    return {pid: cache[(pid, user_id)] for pid in property_ids if (pid, user_id) in cache}
+
+
+def get_property_features_batch(property_ids: list, user_id: str) -> dict:
+    """
+    Retrieve property features for multiple properties in one query
+
+    Args:
+        property_ids: List of property UUIDs
+        user_id: User UUID for authorization
+
+    Returns:
+        Dict mapping property_id -> PropertyFeatures (missing/unauthorized
+        properties are absent from the result)
+
+    Raises:
+        ValueError: If a matched property has no floor plan measurements
+    """
+    rows = _get_property_rows(property_ids, user_id)
+
+    features_by_id = {}
+    for property_id, prop in rows.items():
+        if not prop.get('floor_plan_measurements'):
+            raise ValueError("Property has no floor plan measurements")
+        features_by_id[property_id] = _build_property_features(prop)
+
+    return features_by_id
+
+
 def get_property_features_from_db(property_id: str, user_id: str) -> PropertyFeatures:
     """
     Retrieve property features from database
-    
+
+    Thin single-id wrapper around get_property_features_batch()
+
     Args:
         property_id: Property UUID
         user_id: User UUID for authorization
-        
+
     Returns:
         PropertyFeatures object
-        
+
     Raises:
         ValueError: If property not found or unauthorized
     """
-    db = get_db()
-    
-    # Get property with measurements
-    result = db.table('properties')\
-        .select('*, floor_plan_measurements(*)')\
-        .eq('id', property_id)\
-        .eq('agent_id', user_id)\
-        .single()\
-        .execute()
-    
-    if not result.data:
+    features = get_property_features_batch([property_id], user_id).get(property_id)
+
+    if features is None:
         raise ValueError("Property not found or unauthorized")
-    
-    prop = result.data
+
+    return features
+
+
+def _build_property_features(prop: dict) -> PropertyFeatures:
+    """
+    Build PropertyFeatures for a properties row (with joined measurements)
+
+    Prefers the derived_features column precomputed at ingest; rows written
+    before that column existed (or with a stale schema) fall back to deriving
+    the features from extracted_data + measurements on the fly.
+    """
+    derived = prop.get('derived_features')
+    if derived:
+        try:
+            return PropertyFeatures(**derived)
+        except TypeError:
+            # Stored payload predates a PropertyFeatures schema change;
+            # re-derive from the raw data instead
+            logger.warning(f"Stale derived_features for property {prop.get('id')}, re-deriving")
+
     measurements = prop.get('floor_plan_measurements')
-    
-    if not measurements:
-        raise ValueError("Property has no floor plan measurements")
-    
-    # Parse into PropertyFeatures
-    extracted_data = prop.get('extracted_data', {}) or {}
-    rooms = measurements.get('rooms', []) or []
-    detected_features = measurements.get('detected_features', {}) or {}
-    
-    # Room statistics
-    room_sqfts = [r.get('sqft', 0) for r in rooms if isinstance(r, dict) and r.get('sqft')]
-    room_count = len(room_sqfts)
-    avg_room_sqft = sum(room_sqfts) / room_count if room_count > 0 else 0.0
-    largest_room_sqft = max(room_sqfts) if room_sqfts else 0
-    smallest_room_sqft = min(room_sqfts) if room_sqfts else 0
-    
-    # Amenities
-    totals = detected_features.get('totals', {}) if isinstance(detected_features, dict) else {}
-    num_doors = totals.get('doors', 0)
-    num_windows = totals.get('windows', 0)
-    closets = totals.get('closets', 0)
-    
-    # Check for specific amenities
-    room_list = extracted_data.get('rooms', []) or []
-    has_garage = any('garage' in str(r.get('type', '')).lower() for r in room_list if isinstance(r, dict))
-    has_fireplace = any('fireplace' in str(r.get('features', [])) for r in room_list if isinstance(r, dict))
-    has_balcony = any('balcony' in str(r.get('features', [])) for r in room_list if isinstance(r, dict))
-    
-    features = PropertyFeatures(
-        property_id=property_id,
-        bedrooms=extracted_data.get('bedrooms', 0),
-        bathrooms=extracted_data.get('bathrooms', 0.0),
-        total_sqft=measurements.get('total_square_feet', 0),
-        room_count=room_count,
-        avg_room_sqft=avg_room_sqft,
-        largest_room_sqft=largest_room_sqft,
-        smallest_room_sqft=smallest_room_sqft,
-        has_garage=1 if has_garage else 0,
-        has_fireplace=1 if has_fireplace else 0,
-        has_balcony=1 if has_balcony else 0,
-        has_closets=1 if closets > 0 else 0,
-        num_doors=num_doors,
-        num_windows=num_windows,
-        quality_score=measurements.get('quality_score', 0),
-        confidence=measurements.get('total_square_feet_confidence', 0.0) or 0.0
+    if isinstance(measurements, list):
+        measurements = measurements[0] if measurements else {}
+
+    return derive_property_features(
+        property_id=prop.get('id'),
+        extracted_data=prop.get('extracted_data', {}) or {},
+        measurements=measurements or {}
     )
-    
-    return features
 
 
 # ============================================================================
@@ -150,58 +342,48 @@ def train_model():
     try:
         user_id = get_jwt_identity()
         data = request.get_json() or {}
-        
+
         model_type = data.get('model_type', 'ridge')
         min_properties = data.get('min_properties', 10)
-        
+        run_async = bool(data.get('async', False))
+
         if model_type not in ['ridge', 'linear', 'random_forest']:
             return jsonify({
                 'error': 'Invalid model type',
                 'valid_types': ['ridge', 'linear', 'random_forest']
             }), 400
-        
+
         logger.info(f"Training {model_type} model for user {user_id}")
-        
-        # Initialize model with database
-        db = get_admin_db()
-        model = PropertyRegressionModel(db_client=db)
-        
-        # Extract features
-        features_list = model.extract_property_features(min_properties=min_properties)
-        
-        if not features_list:
+
+        if run_async:
+            # Hand the sklearn fit to the background executor so the request
+            # thread is freed immediately; poll /model/train/status/<job_id>
+            job_id = str(uuid.uuid4())
+            _TRAIN_JOBS[job_id] = (user_id, _TRAIN_EXECUTOR.submit(
+                _train_model_job, user_id, model_type, min_properties
+            ))
+            return jsonify({
+                'success': True,
+                'job_id': job_id,
+                'status': 'queued'
+            }), 202
+
+        try:
+            payload = _train_model_job(user_id, model_type, min_properties)
+        except _InsufficientDataError as e:
             return jsonify({
                 'error': 'Insufficient data',
-                'message': f'Need at least {min_properties} properties with measurements and prices',
+                'message': str(e),
                 'current_properties': 0
             }), 400
-        
-        # Train model
-        results = model.build_room_dimension_model(features_list, model_type=model_type)
-        
-        if not results:
+        except _TrainingFailedError as e:
             return jsonify({
                 'error': 'Model training failed',
-                'message': 'Could not train model with available data'
+                'message': str(e)
             }), 500
-        
-        # Return results
-        return jsonify({
-            'success': True,
-            'model_type': results.model_type,
-            'performance': {
-                'r2_score': round(results.r2_score, 4),
-                'mae': round(results.mae, 2),
-                'rmse': round(results.rmse, 2),
-                'mean_cv_score': round(sum(results.cross_val_scores) / len(results.cross_val_scores), 4) if results.cross_val_scores else 0
-            },
-            'feature_importance': results.feature_importance,
-            'num_properties': len(features_list),
-            'num_predictions': len(results.predictions),
-            'coefficients': results.coefficients,
-            'intercept': results.intercept
-        }), 200
-    
+
+        return jsonify(payload), 200
+
     except Exception as e:
         logger.error(f"Error training model: {e}")
         return jsonify({
@@ -210,6 +392,102 @@ def train_model():
         }), 500
 
 
+@analytics_bp.route('/model/train/status/<job_id>', methods=['GET'])
+@jwt_required()
+def get_train_status(job_id):
+    """
+    Poll the status of a background training job started with async=true
+
+    A terminal status ('complete' or 'failed') is delivered once: the job
+    entry is evicted as it is reported, so a later poll returns 404.
+
+    Returns:
+        {"job_id": "...", "status": "running" | "complete" | "failed", "result": {...}}
+    """
+    entry = _TRAIN_JOBS.get(job_id)
+
+    # Jobs are only visible to the user who started them; an unknown id
+    # and another user's id are indistinguishable on purpose
+    if entry is None or entry[0] != get_jwt_identity():
+        return jsonify({
+            'error': 'Job not found',
+            'message': f'No training job with id {job_id}'
+        }), 404
+
+    future = entry[1]
+    if not future.done():
+        return jsonify({'job_id': job_id, 'status': 'running'}), 200
+
+    _TRAIN_JOBS.pop(job_id, None)
+
+    try:
+        result = future.result()
+    except Exception as e:
+        return jsonify({
+            'job_id': job_id,
+            'status': 'failed',
+            'message': str(e)
+        }), 200
+
+    return jsonify({
+        'job_id': job_id,
+        'status': 'complete',
+        'result': result
+    }), 200
+
+
+class _InsufficientDataError(ValueError):
+    """Raised when too few properties exist to train a model"""
+
+
+class _TrainingFailedError(RuntimeError):
+    """Raised when sklearn training produces no usable model"""
+
+
+def _train_model_job(user_id: str, model_type: str, min_properties: int) -> dict:
+    """
+    Fetch features, fit the model, refresh the model cache, and build the
+    response payload. Shared by the synchronous path and background jobs.
+    """
+    # Initialize model with database
+    db = get_admin_db()
+    model = PropertyRegressionModel(db_client=db)
+
+    # Extract features
+    features_list = model.extract_property_features(min_properties=min_properties)
+
+    if not features_list:
+        raise _InsufficientDataError(
+            f'Need at least {min_properties} properties with measurements and prices'
+        )
+
+    # Train model
+    results = model.build_room_dimension_model(features_list, model_type=model_type)
+
+    if not results:
+        raise _TrainingFailedError('Could not train model with available data')
+
+    # Refresh the process-local cache so subsequent predict/compare/
+    # sqft-impact calls reuse this fitted model
+    _MODEL_CACHE[(user_id, model_type)] = (time.monotonic(), model)
+
+    return {
+        'success': True,
+        'model_type': results.model_type,
+        'performance': {
+            'r2_score': round(results.r2_score, 4),
+            'mae': round(results.mae, 2),
+            'rmse': round(results.rmse, 2),
+            'mean_cv_score': round(sum(results.cross_val_scores) / len(results.cross_val_scores), 4) if results.cross_val_scores else 0
+        },
+        'feature_importance': results.feature_importance,
+        'num_properties': len(features_list),
+        'num_predictions': len(results.predictions),
+        'coefficients': results.coefficients,
+        'intercept': results.intercept
+    }
+
+
 @analytics_bp.route('/predict/<property_id>', methods=['GET'])
 @jwt_required()
 def predict_price(property_id):
@@ -245,20 +523,30 @@ def predict_price(property_id):
         train_first = request.args.get('train_model', 'false').lower() == 'true'
         
         logger.info(f"Predicting price for property {property_id}")
-        
+
+        # Conditional-request check: the response is a pure function of the
+        # property row and the cached model, so an unchanged validator lets
+        # us skip feature extraction, prediction, and serialization entirely.
+        # The row fetch here is reused by the feature lookup via flask.g.
+        # Best-effort: a failed validator lookup falls through to the
+        # normal path, which surfaces the real error.
+        etag = None
+        try:
+            row = _get_property_rows([property_id], user_id).get(property_id)
+        except Exception:
+            row = None
+        if row is not None:
+            etag = _weak_etag(row.get('updated_at'), _model_cache_ts(user_id))
+            # An explicit train_model=true request must retrain, never 304
+            if not train_first and _etag_matches(etag):
+                return '', 304
+
         # Get property features
         features = get_property_features_from_db(property_id, user_id)
-        
-        # Initialize model
-        db = get_admin_db()
-        model = PropertyRegressionModel(db_client=db)
-        
-        # Train model if requested
-        if train_first:
-            all_features = model.extract_property_features(min_properties=5)
-            if len(all_features) >= 5:
-                model.build_room_dimension_model(all_features)
-        
+
+        # Reuse a cached fitted model; train one only when requested
+        model = get_or_train_model(user_id, train_if_missing=train_first, min_properties=5)
+
         # Predict price
         predicted_price = model.predict_price(features)
         
@@ -281,8 +569,8 @@ def predict_price(property_id):
             confidence = 'medium'
         else:
             confidence = 'low'
-        
-        return jsonify({
+
+        response = jsonify({
             'property_id': property_id,
             'predicted_price': round(predicted_price, 2),
             'price_per_sqft': round(price_per_sqft, 2),
@@ -300,8 +588,11 @@ def predict_price(property_id):
             },
             'sqft_impact': round(sqft_impact, 2) if sqft_impact else None,
             'quality_score': features.quality_score
-        }), 200
-    
+        })
+        if etag:
+            response.headers['ETag'] = etag
+        return response, 200
+
     except ValueError as e:
         return jsonify({
             'error': 'Property not found',
@@ -372,20 +663,16 @@ def compare_properties():
         
         logger.info(f"Comparing properties {property_a_id} vs {property_b_id}")
         
-        # Get features for both properties
-        features_a = get_property_features_from_db(property_a_id, user_id)
-        features_b = get_property_features_from_db(property_b_id, user_id)
-        
-        # Initialize model
-        db = get_admin_db()
-        model = PropertyRegressionModel(db_client=db)
-        
-        # Train model if requested
-        if train_first:
-            all_features = model.extract_property_features(min_properties=5)
-            if len(all_features) >= 5:
-                model.build_room_dimension_model(all_features)
+        # Get features for both properties in a single query
+        features_map = get_property_features_batch([property_a_id, property_b_id], user_id)
+        features_a = features_map.get(property_a_id)
+        features_b = features_map.get(property_b_id)
+        if features_a is None or features_b is None:
+            raise ValueError("Property not found or unauthorized")
         
+        # Reuse a cached fitted model; train one only when requested
+        model = get_or_train_model(user_id, train_if_missing=train_first, min_properties=5)
+
         # Compare properties
         comparison = model.compare_properties(features_a, features_b)
         
@@ -459,18 +746,19 @@ def get_sqft_impact():
     try:
         user_id = get_jwt_identity()
         train_first = request.args.get('train_model', 'false').lower() == 'true'
-        
-        # Initialize model
-        db = get_admin_db()
-        model = PropertyRegressionModel(db_client=db)
-        
-        # Train model if requested (use lower threshold in dev)
-        if train_first:
-            all_features = model.extract_property_features(min_properties=3)
-            if len(all_features) >= 3:
-                results = model.build_room_dimension_model(all_features)
-                # If results is None, continue to fallback below
-        
+
+        # Conditional-request check keyed on the cached model's timestamp;
+        # only applies when a model is actually cached — the comps-median
+        # fallback depends on DB state we have no cheap validator for
+        model_ts = _model_cache_ts(user_id)
+        etag = _weak_etag(model_ts) if model_ts else None
+        if etag and not train_first and _etag_matches(etag):
+            return '', 304
+
+        # Reuse a cached fitted model; train if requested (lower threshold in dev)
+        # If training fails, calculate_sqft_impact returns None and we fall back below
+        model = get_or_train_model(user_id, train_if_missing=train_first, min_properties=3)
+
         # Calculate sqft impact
         sqft_impact = model.calculate_sqft_impact()
         
@@ -478,40 +766,30 @@ def get_sqft_impact():
             # Fallback: compute median PPSF from saved comparable_properties across all properties
             try:
                 db = get_admin_db()
-                props = db.table('properties').select('extracted_data,status').in_('status', ['complete','enrichment_complete']).limit(1000).execute()
-                ppsf_values = []
-                import re as _re
-                def to_num(v):
-                    if v is None:
-                        return None
-                    if isinstance(v, (int, float)):
-                        return float(v)
-                    if isinstance(v, str):
-                        s = _re.sub(r'[^0-9\.-]', '', v)
-                        return float(s) if s else None
-                    return None
-                for row in (props.data or []):
-                    ed = row.get('extracted_data') or {}
-                    mi = (ed.get('market_insights') or {}) if isinstance(ed, dict) else {}
-                    comps = (mi.get('comparable_properties') or []) if isinstance(mi, dict) else []
-                    for c in comps:
-                        if not isinstance(c, dict):
-                            continue
-                        price = c.get('last_sale_price') or c.get('sale_price') or c.get('price')
-                        sqft = c.get('square_feet') or c.get('sqft')
-                        price = to_num(price)
-                        sqft = to_num(sqft)
-                        if price and sqft and sqft > 0:
-                            ppsf_values.append(price / sqft)
-                if ppsf_values:
-                    # Basic outlier trim: 5th-95th percentile
-                    import numpy as _np
-                    arr = _np.array(sorted(ppsf_values))
-                    if len(arr) >= 10:
-                        lower = _np.percentile(arr, 5)
-                        upper = _np.percentile(arr, 95)
-                        arr = arr[(arr >= lower) & (arr <= upper)]
-                    median_ppsf = float(_np.median(arr)) if len(arr) else None
+                # Stream pages of 200 rows (projected to just the comps array
+                # server-side) rather than one 1000-row response, stopping
+                # early once enough samples for a stable median are collected;
+                # the per-comp arithmetic then runs as pandas column ops
+                comp_records = []
+                page_size = 200
+                max_samples = 1000
+                offset = 0
+                while True:
+                    page = db.table('properties')\
+                        .select('comps:extracted_data->market_insights->comparable_properties')\
+                        .in_('status', ['complete', 'enrichment_complete'])\
+                        .range(offset, offset + page_size - 1)\
+                        .execute()
+                    rows = page.data or []
+                    for row in rows:
+                        comps = row.get('comps') or []
+                        if isinstance(comps, list):
+                            comp_records.extend(c for c in comps if isinstance(c, dict))
+                    if len(rows) < page_size or len(comp_records) >= max_samples:
+                        break
+                    offset += page_size
+                if comp_records:
+                    median_ppsf = _comps_median_ppsf(comp_records)
                     if median_ppsf and median_ppsf > 0:
                         return jsonify({
                             'price_per_sqft': round(median_ppsf, 2),
@@ -530,7 +808,7 @@ def get_sqft_impact():
                 'message': 'Model not trained and no fallback PPSF available'
             }), 400
         
-        return jsonify({
+        response = jsonify({
             'price_per_sqft': round(sqft_impact, 2),
             'examples': {
                 '100_sqft': round(sqft_impact * 100, 0),
@@ -538,7 +816,12 @@ def get_sqft_impact():
                 '1000_sqft': round(sqft_impact * 1000, 0)
             },
             'model_trained': True
-        }), 200
+        })
+        # The model may have just been (re)trained; hash the current cache ts
+        model_ts = _model_cache_ts(user_id)
+        if model_ts:
+            response.headers['ETag'] = _weak_etag(model_ts)
+        return response, 200
     
     except Exception as e:
         logger.error(f"Error calculating sqft impact: {e}")
@@ -564,75 +847,40 @@ def get_quality_score(property_id):
     """
     try:
         user_id = get_jwt_identity()
-        db = get_db()
-        
-        # Get property and measurements (use execute() without single() to avoid exception)
-        property_result = db.table('properties')\
-            .select('*, floor_plan_measurements(*)')\
-            .eq('id', property_id)\
-            .eq('agent_id', user_id)\
-            .execute()
-        
-        if not property_result.data or len(property_result.data) == 0:
+
+        # Conditional-request check keyed on the row's updated_at: the score
+        # only changes when the property (or its measurements) is rewritten.
+        # The row fetch is reused by _compute_quality_score via flask.g.
+        # Best-effort: a failed validator lookup falls through to the
+        # normal path, which surfaces the real error.
+        etag = None
+        try:
+            row = _get_property_rows([property_id], user_id).get(property_id)
+        except Exception:
+            row = None
+        if row is not None:
+            etag = _weak_etag(row.get('updated_at'))
+            if _etag_matches(etag):
+                return '', 304
+
+        try:
+            payload = _compute_quality_score(property_id, user_id)
+        except _PropertyNotFoundError as e:
             return jsonify({
                 'error': 'Property not found',
-                'message': f'Property with ID {property_id} not found or unauthorized'
+                'message': str(e)
             }), 404
-        
-        property_data = property_result.data[0]
-        measurements = property_data.get('floor_plan_measurements')
-        
-        if not measurements:
+        except _NoMeasurementsError as e:
             return jsonify({
                 'error': 'No measurements',
-                'message': 'Property has no floor plan measurements'
+                'message': str(e)
             }), 400
-        
-        # Calculate quality score components
-        quality_score = measurements.get('quality_score', 0)
-        quality_factors = measurements.get('quality_factors', {})
-        
-        # Build detailed breakdown
-        breakdown = {
-            'completeness': quality_factors.get('completeness', 0),
-            'accuracy': quality_factors.get('accuracy', 0),
-            'clarity': quality_factors.get('clarity', 0),
-            'consistency': quality_factors.get('consistency', 0)
-        }
-        
-        # Determine quality level
-        if quality_score >= 80:
-            quality_level = 'excellent'
-            color = 'green'
-        elif quality_score >= 60:
-            quality_level = 'good'
-            color = 'blue'
-        elif quality_score >= 40:
-            quality_level = 'fair'
-            color = 'yellow'
-        else:
-            quality_level = 'poor'
-            color = 'red'
-        
-        # Get room count and total sqft
-        rooms = measurements.get('rooms', [])
-        total_sqft = measurements.get('total_square_feet', 0)
-        
-        return jsonify({
-            'property_id': property_id,
-            'quality_score': quality_score,
-            'quality_level': quality_level,
-            'color': color,
-            'breakdown': breakdown,
-            'metadata': {
-                'rooms_measured': len(rooms),
-                'total_square_feet': total_sqft,
-                'measurement_method': measurements.get('measurement_method', 'unknown'),
-                'confidence': measurements.get('total_square_feet_confidence', 0)
-            },
-            'recommendations': get_quality_recommendations(quality_score, breakdown)
-        }), 200
-    
+
+        response = jsonify(payload)
+        if etag:
+            response.headers['ETag'] = etag
+        return response, 200
+
     except Exception as e:
         logger.error(f"Error calculating quality score: {e}")
         return jsonify({
@@ -641,6 +889,83 @@ def get_quality_score(property_id):
         }), 500
 
 
+class _PropertyNotFoundError(ValueError):
+    """Raised when a property row is missing or unauthorized"""
+
+
+class _NoMeasurementsError(ValueError):
+    """Raised when a property has no floor plan measurements"""
+
+
+def _compute_quality_score(property_id: str, user_id: str) -> dict:
+    """
+    Build the quality score payload as a plain dict
+
+    Shared by the /quality-score route and /property-analytics so the
+    aggregate endpoint avoids constructing and re-parsing a Flask
+    response for an in-process call.
+
+    Raises:
+        _PropertyNotFoundError: Property missing or unauthorized
+        _NoMeasurementsError: Property has no floor plan measurements
+    """
+    # Get property and measurements (memoized per request via flask.g)
+    property_data = _get_property_rows([property_id], user_id).get(property_id)
+
+    if not property_data:
+        raise _PropertyNotFoundError(f'Property with ID {property_id} not found or unauthorized')
+
+    measurements = property_data.get('floor_plan_measurements')
+
+    if not measurements:
+        raise _NoMeasurementsError('Property has no floor plan measurements')
+
+    # Calculate quality score components
+    quality_score = measurements.get('quality_score', 0)
+    quality_factors = measurements.get('quality_factors', {})
+
+    # Build detailed breakdown
+    breakdown = {
+        'completeness': quality_factors.get('completeness', 0),
+        'accuracy': quality_factors.get('accuracy', 0),
+        'clarity': quality_factors.get('clarity', 0),
+        'consistency': quality_factors.get('consistency', 0)
+    }
+
+    # Determine quality level
+    if quality_score >= 80:
+        quality_level = 'excellent'
+        color = 'green'
+    elif quality_score >= 60:
+        quality_level = 'good'
+        color = 'blue'
+    elif quality_score >= 40:
+        quality_level = 'fair'
+        color = 'yellow'
+    else:
+        quality_level = 'poor'
+        color = 'red'
+
+    # Get room count and total sqft
+    rooms = measurements.get('rooms', [])
+    total_sqft = measurements.get('total_square_feet', 0)
+
+    return {
+        'property_id': property_id,
+        'quality_score': quality_score,
+        'quality_level': quality_level,
+        'color': color,
+        'breakdown': breakdown,
+        'metadata': {
+            'rooms_measured': len(rooms),
+            'total_square_feet': total_sqft,
+            'measurement_method': measurements.get('measurement_method', 'unknown'),
+            'confidence': measurements.get('total_square_feet_confidence', 0)
+        },
+        'recommendations': get_quality_recommendations(quality_score, breakdown)
+    }
+
+
 def get_quality_recommendations(score: int, breakdown: dict) -> list:
     """Generate recommendations based on quality score"""
     recommendations = []
@@ -678,9 +1003,12 @@ def get_property_analytics(property_id):
     try:
         user_id = get_jwt_identity()
         
-        # Get quality score
-        quality_response = get_quality_score(property_id)
-        quality_data = quality_response[0].get_json() if quality_response[1] == 200 else None
+        # Get quality score (pure function, no intermediate Flask response)
+        try:
+            quality_data = _compute_quality_score(property_id, user_id)
+        except ValueError as qe:
+            logger.warning(f"Quality score unavailable: {qe}")
+            quality_data = None
         
         # Get price prediction - directly call with params
         try:
@@ -11,31 +11,107 @@ from flask_jwt_extended import (
     get_jwt
 )
 from app.utils.supabase_client import get_supabase_client, get_admin_db
+from app.utils.json_response import json_response
 from datetime import timedelta
+from functools import lru_cache
 import logging
-import re
+import os
+import threading
+import time
 
 auth_bp = Blueprint('auth', __name__)
 
 
 logger = logging.getLogger(__name__)
 
+# Charset delete-tables for email validation: translating an input against
+# one of these yields an empty string only when every character is allowed,
+# so the checks run as C-level table lookups instead of regex NFA walks
+_ASCII_ALNUM = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+_EMAIL_LOCAL_DELETE = str.maketrans('', '', _ASCII_ALNUM + '._%+-')
+_EMAIL_DOMAIN_DELETE = str.maketrans('', '', _ASCII_ALNUM + '.-')
 
-def _get_admin_client(primary_client):
-    """Return admin Supabase client or fallback to the provided primary client."""
+# Input length caps checked before any validation or Supabase call, so a
+# hostile megabyte-long field is rejected in O(1) instead of being scanned
+# and shipped to the auth backend. 254 is the RFC 5321 address limit.
+_MAX_EMAIL_LEN = 254
+_MAX_PASSWORD_LEN = 128
+_MAX_NAME_LEN = 200
+
+# Token lifetime resolved once at import (same source as the app config
+# default) so create_access_token skips the per-call config lookup
+_JWT_LIFETIME = timedelta(seconds=int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES', 3600)))
+
+
+# Short-TTL cache of users-table rows for the verify/me hot path. The JWT
+# signature is still verified on every request by flask_jwt_extended; this
+# only skips the repeated Supabase round trip for the profile row, so there
+# is no stale-auth window — at worst a profile edit takes a few seconds to
+# show up in /verify responses.
+_USER_CACHE = {}  # user_id -> (expires_at, user_row)
+_USER_CACHE_TTL_SEC = 10
+_USER_CACHE_LOCK = threading.Lock()
+
+
+def _fetch_user_row(user_id):
+    """Fetch the users-table row for an id, cached for a few seconds"""
+    with _USER_CACHE_LOCK:
+        entry = _USER_CACHE.get(user_id)
+        if entry and time.monotonic() < entry[0]:
+            return entry[1]
+
+    supabase = get_supabase_client()
+    # Project just the columns the verify/me payloads use; users rows can
+    # carry wide profile fields that would otherwise be serialized per call
+    user_response = supabase.table('users')\
+        .select('id, email, full_name, created_at')\
+        .eq('id', user_id)\
+        .limit(1)\
+        .execute()
+    row = user_response.data[0] if user_response.data else None
+
+    if row is not None:
+        with _USER_CACHE_LOCK:
+            _USER_CACHE[user_id] = (time.monotonic() + _USER_CACHE_TTL_SEC, row)
+
+    return row
+
+
+@lru_cache(maxsize=1)
+def _resolve_admin():
+    """Resolve the admin client once per worker; None when unavailable"""
     try:
-        admin_client = get_admin_db()
-        if admin_client:
-            return admin_client
+        return get_admin_db()
     except Exception as exc:
         logger.warning("Falling back to primary Supabase client: %s", exc)
-    return primary_client
+        return None
+
+
+def _get_admin_client(primary_client):
+    """Return admin Supabase client or fallback to the provided primary client."""
+    return _resolve_admin() or primary_client
 
 
 def validate_email(email):
-    """Validate email format"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    """
+    Validate email format
+
+    Same shape the old regex enforced (local@domain.tld, 2+ letter TLD),
+    done with one '@' split plus charset table scans
+    """
+    at = email.rfind('@')
+    if at <= 0 or at == len(email) - 1:
+        return False
+    if email[:at].translate(_EMAIL_LOCAL_DELETE):
+        return False
+    domain = email[at + 1:]
+    dot = domain.rfind('.')
+    if dot <= 0:
+        return False
+    tld = domain[dot + 1:]
+    if len(tld) < 2 or not (tld.isascii() and tld.isalpha()):
+        return False
+    return not domain[:dot].translate(_EMAIL_DOMAIN_DELETE)
 
 
 def validate_password(password):
@@ -45,13 +121,23 @@ def validate_password(password):
     """
     if len(password) < 8:
         return False, "Password must be at least 8 characters"
-    
-    if not re.search(r'[A-Za-z]', password):
+
+    # Single pass setting both flags, instead of two regex scans
+    has_letter = has_digit = False
+    for c in password:
+        if c.isalpha():
+            has_letter = True
+        elif c.isdigit():
+            has_digit = True
+        if has_letter and has_digit:
+            break
+
+    if not has_letter:
         return False, "Password must contain at least one letter"
-    
-    if not re.search(r'\d', password):
+
+    if not has_digit:
         return False, "Password must contain at least one number"
-    
+
     return True, ""
 
 
@@ -90,7 +176,15 @@ def register():
                 'error': 'Missing required fields',
                 'message': 'Email and password are required'
             }), 400
-        
+
+        # Reject over-long inputs before any scanning or auth round trip
+        if len(email) > _MAX_EMAIL_LEN or len(password) > _MAX_PASSWORD_LEN \
+                or len(full_name) > _MAX_NAME_LEN:
+            return jsonify({
+                'error': 'Invalid input',
+                'message': 'One or more fields exceed the maximum allowed length'
+            }), 400
+
         # Validate email format
         if not validate_email(email):
             return jsonify({
@@ -144,7 +238,8 @@ def register():
         # Create JWT access token
         access_token = create_access_token(
             identity=user_id,
-            additional_claims={'email': email}
+            additional_claims={'email': email},
+            expires_delta=_JWT_LIFETIME
         )
         
         return jsonify({
@@ -157,8 +252,9 @@ def register():
         }), 201
         
     except Exception as e:
-        # Check for duplicate email
-        if 'already registered' in str(e).lower() or 'duplicate' in str(e).lower():
+        # Check for duplicate email (lower the message once, scan twice)
+        msg = str(e).lower()
+        if 'already registered' in msg or 'duplicate' in msg:
             return jsonify({
                 'error': 'Email already exists',
                 'message': 'An account with this email already exists'
@@ -202,6 +298,13 @@ def login():
                 'error': 'Missing credentials',
                 'message': 'Email and password are required'
             }), 400
+
+        # Reject over-long inputs before the auth round trip
+        if len(email) > _MAX_EMAIL_LEN or len(password) > _MAX_PASSWORD_LEN:
+            return jsonify({
+                'error': 'Authentication failed',
+                'message': 'Invalid email or password'
+            }), 401
         
         # Authenticate with Supabase Auth
         supabase = get_supabase_client()
@@ -219,9 +322,9 @@ def login():
         
         user_id = auth_response.user.id
         
-        # Fetch extended user data
-        user_response = supabase.table('users').select('*').eq('id', user_id).execute()
-        
+        # Fetch extended user data (only the columns the response uses)
+        user_response = supabase.table('users').select('id, email, full_name').eq('id', user_id).limit(1).execute()
+
         user_data = user_response.data[0] if user_response.data else {}
         
         # Auto-upsert minimal user profile if missing
@@ -234,7 +337,7 @@ def login():
                     'full_name': user_data.get('full_name', '') if isinstance(user_data, dict) else ''
                 }, on_conflict='id').execute()
                 # Re-fetch for response payload
-                refetch = supabase.table('users').select('*').eq('id', user_id).execute()
+                refetch = supabase.table('users').select('id, email, full_name').eq('id', user_id).limit(1).execute()
                 if refetch.data:
                     user_data = refetch.data[0]
             except Exception:
@@ -243,17 +346,18 @@ def login():
         # Create JWT access token
         access_token = create_access_token(
             identity=user_id,
-            additional_claims={'email': email}
+            additional_claims={'email': email},
+            expires_delta=_JWT_LIFETIME
         )
         
-        return jsonify({
+        return json_response({
             'token': access_token,
             'user': {
                 'id': user_id,
                 'email': email,
                 'full_name': user_data.get('full_name', '')
             }
-        }), 200
+        })
         
     except Exception as e:
         return jsonify({
@@ -315,11 +419,10 @@ def verify():
         jwt_data = get_jwt()
         email = jwt_data.get('email')
         
-        # Fetch user data from database
-        supabase = get_supabase_client()
-        user_response = supabase.table('users').select('*').eq('id', user_id).execute()
-        
-        if not user_response.data:
+        # Fetch user data from database (short-TTL cached)
+        user_data = _fetch_user_row(user_id)
+
+        if user_data is None:
             try:
                 admin_client = get_admin_db()
                 admin_client.table('users').upsert({
@@ -340,16 +443,14 @@ def verify():
                     'error': 'User not found',
                     'message': 'Invalid token or user does not exist'
                 }), 404
-        
-        user_data = user_response.data[0]
-        
-        return jsonify({
+
+        return json_response({
             'user': {
                 'id': user_id,
                 'email': user_data.get('email', email),
                 'full_name': user_data.get('full_name', '')
             }
-        }), 200
+        })
         
     except Exception as e:
         return jsonify({
@@ -380,20 +481,17 @@ def get_current_user():
     """
     try:
         user_id = get_jwt_identity()
-        
-        supabase = get_supabase_client()
-        user_response = supabase.table('users').select('*').eq('id', user_id).execute()
-        
-        if not user_response.data:
+
+        user_data = _fetch_user_row(user_id)
+
+        if user_data is None:
             return jsonify({
                 'error': 'User not found'
             }), 404
-        
-        user_data = user_response.data[0]
-        
-        return jsonify({
+
+        return json_response({
             'user': user_data
-        }), 200
+        })
         
     except Exception as e:
         return jsonify({
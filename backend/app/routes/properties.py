@@ -153,7 +153,9 @@ def upload_floor_plan_endpoint():
         
         property_record = result.data[0]
         
-        # Trigger complete 3-agent workflow
+        # Trigger complete 3-agent workflow: a single task that runs the
+        # three stages in-process, so the pipeline costs one broker
+        # message and one worker pickup.
         from app.tasks.property_tasks import process_property_workflow
         task = process_property_workflow.delay(property_record['id'])
         
@@ -814,28 +816,43 @@ def analyze_floor_plan_enhanced(property_id):
             # Store results in database if requested
             if store_results:
                 admin_db = get_admin_db()
-                
-                # Update properties.extracted_data
-                admin_db.table('properties').update({
+
+                property_update = {
                     'extracted_data': analysis_result['basic_analysis'],
                     'status': 'parsing_complete'
-                }).eq('id', property_id).execute()
-                
+                }
+
                 # Store detailed measurements if available
                 if analysis_result.get('detailed_measurements'):
                     measurements_data = analysis_result['detailed_measurements'].copy()
                     measurements_data['property_id'] = property_id
-                    
+
                     # Merge feature detection data if available
                     if analysis_result.get('feature_detection'):
                         # The feature detection goes into detected_features field
                         measurements_data['detected_features'] = analysis_result['feature_detection']
-                    
+
+                    # Precompute regression features at ingest so analytics
+                    # endpoints read them back instead of re-deriving per request
+                    from dataclasses import asdict
+                    from app.services.regression_models import derive_property_features
+                    try:
+                        property_update['derived_features'] = asdict(derive_property_features(
+                            property_id=property_id,
+                            extracted_data=analysis_result['basic_analysis'],
+                            measurements=measurements_data
+                        ))
+                    except Exception as derive_error:
+                        print(f"Warning: could not derive features for {property_id}: {derive_error}")
+
                     # Upsert (insert or update)
                     admin_db.table('floor_plan_measurements').upsert(
                         measurements_data,
                         on_conflict='property_id'
                     ).execute()
+
+                # Update properties.extracted_data (+ derived features)
+                admin_db.table('properties').update(property_update).eq('id', property_id).execute()
             
             # Return results
             return jsonify({
@@ -938,12 +955,14 @@ def retrigger_enrichment(property_id):
                 'message': 'Property does not exist or you do not have access'
             }), 404
 
-        # Immediately mark as in-progress so frontend starts polling (use allowed status)
+        # Immediately mark as in-progress so frontend starts polling (use
+        # allowed status). neq skips the no-op UPDATE when a re-run finds
+        # the row already in 'processing' - no write, no history row.
         try:
             admin_db = get_admin_db()
             admin_db.table('properties').update({
                 'status': 'processing'
-            }).eq('id', property_id).eq('agent_id', user_id).execute()
+            }).eq('id', property_id).eq('agent_id', user_id).neq('status', 'processing').execute()
         except Exception as e:
             # Non-fatal: continue to queue task
             print(f"Failed to set enrichment_in_progress for {property_id}: {e}")
@@ -5,13 +5,111 @@ These routes are accessible via shareable tokens and don't require JWT authentic
 Used for public property reports shared with potential buyers.
 """
 
-from flask import Blueprint, jsonify, request
-from datetime import datetime
+from flask import Blueprint, request
+from datetime import datetime, timezone
+from functools import lru_cache
 from app.utils.supabase_client import get_admin_db
+from app.utils.json_response import json_response
+import logging
 import os
+import queue
+import threading
+import time
+
+_UTC = timezone.utc
+
+logger = logging.getLogger(__name__)
+
+# View logging is fire-and-forget and batched: events are queued and a
+# single daemon thread flushes them every 250 ms (or 100 rows) as one
+# multi-row insert, so N concurrent viewers cost one Supabase round trip
+# instead of N. The bounded queue drops events rather than growing
+# without limit under extreme load — view logs are best-effort.
+_VIEW_QUEUE = queue.Queue(maxsize=10000)
+_VIEW_FLUSH_MAX_ROWS = 100
+_VIEW_FLUSH_MAX_WAIT_SEC = 0.25
+
+
+def _drain_view_queue():
+    """Block briefly for the first event, then batch up whatever is queued"""
+    try:
+        batch = [_VIEW_QUEUE.get(timeout=_VIEW_FLUSH_MAX_WAIT_SEC)]
+    except queue.Empty:
+        return []
+    while len(batch) < _VIEW_FLUSH_MAX_ROWS:
+        try:
+            batch.append(_VIEW_QUEUE.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+
+def _view_flush_loop():
+    """Daemon loop inserting queued view events in multi-row batches"""
+    while True:
+        batch = _drain_view_queue()
+        if not batch:
+            continue
+        try:
+            db = get_admin_db()
+            db.table('property_views').insert(batch).execute()
+        except Exception as e:
+            logger.warning(f"Failed to log {len(batch)} property view(s): {e}")
+
+
+_VIEW_WORKER = threading.Thread(target=_view_flush_loop, name='view-log-flusher', daemon=True)
+_VIEW_WORKER.start()
 
 public_bp = Blueprint('public', __name__, url_prefix='/api/public')
 
+# Short-TTL cache of assembled report/validate payloads per token. Share
+# links fan out to many viewers hitting the same token; within the TTL each
+# extra viewer costs a dict lookup instead of a Supabase query. Only
+# responses that are stable for the TTL are cached (success, and expired —
+# which never becomes valid again); 404s are not, so newly created or
+# reactivated links show up immediately.
+_REPORT_CACHE = {}  # (view, token) -> (expires_monotonic, payload, status)
+_REPORT_CACHE_TTL_SEC = 30
+_REPORT_CACHE_MAX = 4096
+
+# Property columns exposed on the public report, and agent-only keys
+# stripped from extracted_data before it leaves the API
+_PUBLIC_FIELDS = ('id', 'address', 'floor_plan_url', 'status', 'created_at')
+_SENSITIVE_KEYS = ('agent_id', 'agent_notes')
+
+
+@lru_cache(maxsize=4096)
+def _expires_ts(expires_at):
+    """
+    Parse an ISO-8601 expiry string to a UNIX timestamp
+
+    Expiry checks then degrade to a single float compare against
+    time.time() instead of allocating and comparing datetime objects.
+    Memoized — the same link's expiry string repeats across requests,
+    so repeat hits skip the fromisoformat parse entirely.
+    """
+    if expires_at.endswith('Z'):
+        expires_at = expires_at[:-1] + '+00:00'
+    dt = datetime.fromisoformat(expires_at)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=_UTC)
+    return dt.timestamp()
+
+
+def _report_cache_get(key):
+    """Return a fresh cached (payload, status) pair, or None"""
+    entry = _REPORT_CACHE.get(key)
+    if entry and time.monotonic() < entry[0]:
+        return entry[1], entry[2]
+    return None
+
+
+def _report_cache_put(key, payload, status):
+    """Store a payload, evicting oldest-inserted entries past the size cap"""
+    if len(_REPORT_CACHE) >= _REPORT_CACHE_MAX:
+        _REPORT_CACHE.pop(next(iter(_REPORT_CACHE)))
+    _REPORT_CACHE[key] = (time.monotonic() + _REPORT_CACHE_TTL_SEC, payload, status)
+
 
 @public_bp.route('/report/<token>', methods=['GET'])
 def get_public_report(token):
@@ -43,69 +141,73 @@ def get_public_report(token):
         410: Token has been deactivated
     """
     try:
+        cached = _report_cache_get(('report', token))
+        if cached:
+            return json_response(cached[0], cached[1], compress=True)
+
         db = get_admin_db()
-        
-        # Find the shareable link by token
-        link_result = db.table('shareable_links').select('*').eq('token', token).eq('is_active', True).execute()
-        
+
+        # Fetch the link and its property in one PostgREST embed query
+        # instead of two sequential round trips
+        link_result = db.table('shareable_links')\
+            .select('token, property_id, expires_at, is_active, properties(id, address, extracted_data, floor_plan_url, status, created_at)')\
+            .eq('token', token)\
+            .eq('is_active', True)\
+            .limit(1)\
+            .execute()
+
         if not link_result.data or len(link_result.data) == 0:
-            return jsonify({
+            return json_response({
                 'error': 'Link not found',
                 'message': 'This shareable link does not exist or has been deactivated'
-            }), 404
-        
+            }, 404)
+
         link = link_result.data[0]
-        
-        # Check if token has expired
-        expires_at = datetime.fromisoformat(link['expires_at'].replace('Z', '+00:00'))
-        if datetime.utcnow().replace(tzinfo=expires_at.tzinfo) > expires_at:
-            return jsonify({
+
+        # Check if token has expired (single float compare)
+        if time.time() > _expires_ts(link['expires_at']):
+            payload = {
                 'error': 'Link expired',
                 'message': 'This shareable link has expired'
-            }), 410
-        
-        # Fetch the property data
-        property_id = link['property_id']
-        property_result = db.table('properties').select('*').eq('id', property_id).execute()
-        
-        if not property_result.data or len(property_result.data) == 0:
-            return jsonify({
+            }
+            # An expired link never becomes valid again, safe to cache
+            _report_cache_put(('report', token), payload, 410)
+            return json_response(payload, 410)
+
+        # Embedded property row (many-to-one, so PostgREST returns an object)
+        property_data = link.get('properties')
+        if isinstance(property_data, list):
+            property_data = property_data[0] if property_data else None
+
+        if not property_data:
+            return json_response({
                 'error': 'Property not found',
                 'message': 'The property associated with this link no longer exists'
-            }), 404
-        
-        property_data = property_result.data[0]
+            }, 404)
         
         # Sanitize property data - remove sensitive agent information
-        sanitized_property = {
-            'id': property_data['id'],
-            'address': property_data.get('address', ''),
-            'extracted_data': property_data.get('extracted_data', {}),
-            'floor_plan_url': property_data.get('floor_plan_url', ''),
-            'status': property_data.get('status', ''),
-            'created_at': property_data.get('created_at', '')
-        }
-        
-        # Remove agent-specific data from extracted_data if present
-        if 'agent_id' in sanitized_property['extracted_data']:
-            del sanitized_property['extracted_data']['agent_id']
-        if 'agent_notes' in sanitized_property['extracted_data']:
-            del sanitized_property['extracted_data']['agent_notes']
-        
+        sanitized_property = {k: property_data.get(k, '') for k in _PUBLIC_FIELDS}
+        extracted = property_data.get('extracted_data') or {}
+        for k in _SENSITIVE_KEYS:
+            extracted.pop(k, None)
+        sanitized_property['extracted_data'] = extracted
+
         # Return public report data
-        return jsonify({
+        payload = {
             'property': sanitized_property,
             'token_info': {
                 'expires_at': link['expires_at'],
                 'is_active': link['is_active']
             }
-        }), 200
+        }
+        _report_cache_put(('report', token), payload, 200)
+        return json_response(payload, 200, compress=True)
         
     except Exception as e:
-        return jsonify({
+        return json_response({
             'error': 'Failed to fetch property report',
             'message': str(e)
-        }), 500
+        }, 500)
 
 
 @public_bp.route('/report/<token>/log_view', methods=['POST'])
@@ -133,27 +235,36 @@ def log_property_view(token):
         }
     """
     try:
-        db = get_admin_db()
-        
-        # Verify token exists and is active
-        link_result = db.table('shareable_links').select('property_id').eq('token', token).eq('is_active', True).execute()
-        
-        if not link_result.data or len(link_result.data) == 0:
-            return jsonify({
-                'error': 'Invalid token',
-                'message': 'This shareable link is not valid'
-            }), 404
-        
-        property_id = link_result.data[0]['property_id']
-        
+        # Resolve the property id from the report cache when the viewer has
+        # already loaded the page, skipping the verification round trip
+        property_id = None
+        cached = _report_cache_get(('report', token))
+        if cached and cached[1] == 200:
+            property_id = cached[0].get('property', {}).get('id')
+
+        if property_id is None:
+            db = get_admin_db()
+            link_result = db.table('shareable_links').select('property_id').eq('token', token).eq('is_active', True).limit(1).execute()
+
+            if not link_result.data or len(link_result.data) == 0:
+                return json_response({
+                    'error': 'Invalid token',
+                    'message': 'This shareable link is not valid'
+                }, 404)
+
+            property_id = link_result.data[0]['property_id']
+
         # Get request data
         data = request.get_json() or {}
-        
+
         # Capture view metadata
         user_agent = data.get('user_agent') or request.headers.get('User-Agent', 'Unknown')
-        ip_address = request.headers.get('X-Forwarded-For', request.remote_addr)
+        # Only the first X-Forwarded-For hop is the client IP; storing the
+        # whole comma-joined proxy chain bloated every inserted row
+        xff = request.headers.get('X-Forwarded-For')
+        ip_address = xff.partition(',')[0].strip() if xff else request.remote_addr
         referrer = data.get('referrer') or request.headers.get('Referer', '')
-        
+
         # Log the view in property_views table
         view_data = {
             'property_id': property_id,
@@ -164,21 +275,25 @@ def log_property_view(token):
             'viewport_width': data.get('viewport_width'),
             'viewport_height': data.get('viewport_height')
         }
-        
-        db.table('property_views').insert(view_data).execute()
-        
-        return jsonify({
+
+        # Fire-and-forget: enqueue for the batching flusher thread
+        try:
+            _VIEW_QUEUE.put_nowait(view_data)
+        except queue.Full:
+            logger.warning("property_views queue full; dropping view event")
+
+        return json_response({
             'success': True,
             'message': 'View logged successfully'
-        }), 201
-        
+        }, 202)
+
     except Exception as e:
         # Don't fail the page load if view logging fails
-        return jsonify({
+        return json_response({
             'success': False,
             'message': 'Failed to log view',
             'error': str(e)
-        }), 500
+        }, 500)
 
 
 @public_bp.route('/report/<token>/validate', methods=['GET'])
@@ -199,47 +314,57 @@ def validate_token(token):
         }
     """
     try:
+        cached = _report_cache_get(('validate', token))
+        if cached:
+            return json_response(cached[0], cached[1])
+
         db = get_admin_db()
-        
-        # Find the shareable link
-        link_result = db.table('shareable_links').select('*').eq('token', token).eq('is_active', True).execute()
-        
+
+        # Fetch the link and the property's address fields in one embed query
+        link_result = db.table('shareable_links')\
+            .select('expires_at, is_active, properties(address, extracted_data)')\
+            .eq('token', token)\
+            .eq('is_active', True)\
+            .limit(1)\
+            .execute()
+
         if not link_result.data or len(link_result.data) == 0:
-            return jsonify({
+            return json_response({
                 'valid': False,
                 'message': 'Token not found or inactive'
-            }), 200
-        
+            }, 200)
+
         link = link_result.data[0]
-        
-        # Check expiration
-        expires_at = datetime.fromisoformat(link['expires_at'].replace('Z', '+00:00'))
-        is_expired = datetime.utcnow().replace(tzinfo=expires_at.tzinfo) > expires_at
-        
-        if is_expired:
-            return jsonify({
+
+        # Check expiration (single float compare)
+        if time.time() > _expires_ts(link['expires_at']):
+            payload = {
                 'valid': False,
                 'message': 'Token has expired',
                 'expires_at': link['expires_at']
-            }), 200
-        
-        # Get basic property info
-        property_result = db.table('properties').select('address, extracted_data').eq('id', link['property_id']).execute()
-        
+            }
+            _report_cache_put(('validate', token), payload, 200)
+            return json_response(payload, 200)
+
+        prop = link.get('properties')
+        if isinstance(prop, list):
+            prop = prop[0] if prop else None
+
         address = 'Property'
-        if property_result.data and len(property_result.data) > 0:
-            prop = property_result.data[0]
-            address = prop.get('extracted_data', {}).get('address') or prop.get('address', 'Property')
+        if prop:
+            address = (prop.get('extracted_data') or {}).get('address') or prop.get('address', 'Property')
         
-        return jsonify({
+        payload = {
             'valid': True,
             'expires_at': link['expires_at'],
             'property_address': address
-        }), 200
+        }
+        _report_cache_put(('validate', token), payload, 200)
+        return json_response(payload, 200)
         
     except Exception as e:
-        return jsonify({
+        return json_response({
             'valid': False,
             'message': 'Validation failed',
             'error': str(e)
-        }), 500
+        }, 500)
@@ -3,6 +3,7 @@ Base Scraper Class
 Common functionality for all real estate website scrapers
 """
 
+import asyncio
 import re
 import logging
 from typing import Dict, Any, Optional, List
@@ -61,17 +62,44 @@ class BaseScraper(ABC):
         """
         pass
     
-    def parse_html(self, html: str) -> BeautifulSoup:
+    # Documents smaller than this are parsed inline; the executor round
+    # trip costs more than the parse itself for tiny payloads
+    PARSE_OFFLOAD_MIN_BYTES = 64 * 1024
+
+    def parse_html(self, html: str, parse_only=None) -> BeautifulSoup:
         """
         Parse HTML content with BeautifulSoup
-        
+
         Args:
             html: HTML string
-        
+            parse_only: Optional SoupStrainer restricting which elements
+                        are kept — parsers that only read a known subtree
+                        skip building the rest of the DOM
+
+        Returns:
+            BeautifulSoup object
+        """
+        return BeautifulSoup(html, 'lxml', parse_only=parse_only)
+
+    async def parse_html_async(self, html: str, parse_only=None) -> BeautifulSoup:
+        """
+        Parse HTML without blocking the event loop
+
+        Listing pages can run to hundreds of KB and parsing one inline
+        stalls every other scraper task in the gather. Large documents go
+        through a worker thread (lxml releases the GIL for the bulk of
+        the parse), so the three source scrapes genuinely overlap.
+
+        Args:
+            html: HTML string
+            parse_only: Optional SoupStrainer, forwarded to parse_html
+
         Returns:
             BeautifulSoup object
         """
-        return BeautifulSoup(html, 'lxml')
+        if html and len(html) >= self.PARSE_OFFLOAD_MIN_BYTES:
+            return await asyncio.to_thread(self.parse_html, html, parse_only)
+        return self.parse_html(html, parse_only)
     
     def clean_text(self, text: Optional[str]) -> Optional[str]:
         """
@@ -0,0 +1,104 @@
+"""
+TTL Response Cache for Scraper Fetches
+
+Every ScrapingBee request costs seconds of latency and an API credit, and
+the scrapers re-issue identical requests whenever a lookup is retried or
+the same address is scraped twice. This module caches responses in-process,
+keyed by a blake2b hash of the URL plus its sorted extra params, so a
+repeat fetch within the TTL is a dict lookup instead of a network round
+trip.
+
+TTLs are tiered: autocomplete lookups resolve addresses to listing URLs
+and addresses rarely move, so they keep for a week; listing HTML goes
+stale faster (price/status changes) and keeps for a day.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Addresses rarely change their canonical listing URL
+AUTOCOMPLETE_TTL_SEC = 7 * 24 * 3600
+# Listing pages change with price/status updates
+LISTING_TTL_SEC = 24 * 3600
+
+_FETCH_CACHE: Dict[str, Any] = {}  # key -> (expires_monotonic, value)
+_FETCH_CACHE_LOCK = threading.Lock()
+_FETCH_CACHE_MAX = 512
+
+
+def fetch_cache_key(url: str, extra_params: Optional[Dict[str, Any]] = None) -> str:
+    """Stable cache key for a fetch: blake2b of the URL + sorted params"""
+    parts = [url]
+    if extra_params:
+        parts.extend(f"{k}={v}" for k, v in sorted(extra_params.items()) if v is not None)
+    return hashlib.blake2b('|'.join(parts).encode(), digest_size=16).hexdigest()
+
+
+def cache_get(key: str) -> Any:
+    """Return the cached value for key if still fresh, else None"""
+    with _FETCH_CACHE_LOCK:
+        entry = _FETCH_CACHE.get(key)
+        if entry and time.monotonic() < entry[0]:
+            return entry[1]
+        if entry:
+            del _FETCH_CACHE[key]
+    return None
+
+
+def cache_put(key: str, value: Any, ttl: float) -> None:
+    """Store a value, evicting the oldest-inserted entry past the size cap"""
+    with _FETCH_CACHE_LOCK:
+        if len(_FETCH_CACHE) >= _FETCH_CACHE_MAX:
+            _FETCH_CACHE.pop(next(iter(_FETCH_CACHE)))
+        _FETCH_CACHE[key] = (time.monotonic() + ttl, value)
+
+
+async def cached_fetch(client, url: str, *, ttl: float = LISTING_TTL_SEC,
+                       force_refresh: bool = False, **fetch_kwargs):
+    """
+    Wrap client.fetch() with the TTL cache
+
+    Only successful (2xx) responses are cached, so transient failures and
+    blocked requests are always retried. force_refresh bypasses the lookup
+    but still refreshes the stored entry.
+    """
+    key = fetch_cache_key(url, fetch_kwargs.get('extra_params'))
+    if not force_refresh:
+        hit = cache_get(key)
+        if hit is not None:
+            return hit
+    resp = await client.fetch(url, **fetch_kwargs)
+    status = getattr(resp, 'status_code', None)
+    if isinstance(status, int) and 200 <= status < 300:
+        cache_put(key, resp, ttl)
+    return resp
+
+
+async def cached_fetch_html(client, url: str, *, ttl: float = LISTING_TTL_SEC,
+                            force_refresh: bool = False, **stream_kwargs) -> str:
+    """Wrap client.fetch_html_stream() with the TTL cache (caches the HTML)"""
+    key = fetch_cache_key(url, {'_stream': '1', **(stream_kwargs.get('extra_params') or {})})
+    if not force_refresh:
+        hit = cache_get(key)
+        if hit is not None:
+            return hit
+    html = await client.fetch_html_stream(url, **stream_kwargs)
+    if isinstance(html, str) and html:
+        cache_put(key, html, ttl)
+    return html
+
+
+async def cached_scrape_page(client, url: str, *, ttl: float = LISTING_TTL_SEC,
+                             force_refresh: bool = False, **scrape_kwargs) -> str:
+    """Wrap client.scrape_page() with the TTL cache (caches the HTML string)"""
+    key = fetch_cache_key(url, {'_scrape_page': '1', **scrape_kwargs})
+    if not force_refresh:
+        hit = cache_get(key)
+        if hit is not None:
+            return hit
+    html = await client.scrape_page(url, **scrape_kwargs)
+    if isinstance(html, str) and html:
+        cache_put(key, html, ttl)
+    return html
@@ -5,18 +5,202 @@ Aggregates and normalizes data from multiple sources
 """
 
 import asyncio
+import atexit
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+import os
+import statistics
+import threading
+import time
+from collections import Counter, deque
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timezone
 
 from app.clients.scrapingbee_client import ScrapingBeeClient
 from .zillow_scraper import ZillowScraper
 from .redfin_scraper import RedfinScraper
 from .streeteasy_scraper import StreetEasyScraper
+from .fetch_cache import cache_get, cache_put, fetch_cache_key
 from app.utils.geocoding import NYC_BOROUGHS
 
 logger = logging.getLogger(__name__)
 
+# The scrape pipeline is dominated by concurrent network waits; uvloop's
+# libuv-based transports noticeably speed up fetch-heavy gathers. Optional:
+# fall back to the stdlib loop where it isn't installed (e.g. Windows).
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+# Aggregated results keep for an hour: a repeat lookup for the same address
+# within that window skips all three scrapers (and their ScrapingBee credits)
+_AGGREGATE_TTL_SEC = 3600
+
+# Per-source throttles. Bounded concurrency plus a minimum interval between
+# requests keeps many concurrent scrape_property calls under the targets'
+# rate limits — steady throughput beats a burst followed by 429 retries.
+# Intervals (seconds) are overridable via SCRAPER_RATE_LIMIT_DELAY_<SOURCE>.
+_SOURCE_CONCURRENCY = {'Zillow': 4, 'Redfin': 2, 'StreetEasy': 2}
+_SOURCE_MIN_INTERVAL = {'Zillow': 1.0, 'Redfin': 2.0, 'StreetEasy': 2.0}
+
+# Fields resolved by cross-source consensus during aggregation
+_CONSENSUS_FIELDS = ('address', 'city', 'state', 'zip_code',
+                     'bedrooms', 'bathrooms', 'property_type', 'year_built')
+
+# Fields counted toward the data quality (completeness) score
+_QUALITY_FIELDS = ('price', 'bedrooms', 'bathrooms', 'square_feet')
+
+# Once a source has returned a record with all quality fields, stragglers
+# still grinding through fallbacks are cancelled — but only after this
+# minimum wait, so fast responses from every source still feed consensus
+_EARLY_EXIT_MIN_WAIT_SEC = 10.0
+
+
+# Adaptive throttling: once a source's sliding-window error rate crosses
+# the threshold, its request interval doubles (capped); healthy windows
+# ease it back toward the configured base. Halving the request rate beats
+# a full rate that ends in retries.
+_ADAPT_WINDOW = 20
+_ADAPT_MIN_SAMPLES = 10
+_ADAPT_ERROR_THRESHOLD = 0.3
+_ADAPT_MAX_INTERVAL_FACTOR = 8.0
+
+
+def _has_signal(source: Dict[str, Any]) -> bool:
+    """True when a source result carries any usable data"""
+    return bool(source.get('price') or source.get('listing_url') or source.get('address'))
+
+
+def _is_complete(result: Optional[Dict[str, Any]]) -> bool:
+    """True when a source returned every field the quality score requires"""
+    return bool(result) and all(result.get(f) for f in _QUALITY_FIELDS)
+
+
+# One connected ScrapingBeeClient per event loop. Building a fresh client
+# (and its pooled httpx session) per MultiSourceScraper instance re-paid
+# session setup on every scrape; keyed by loop because a session can't hop
+# between loops, and processes mix a persistent worker loop with
+# short-lived per-call loops. Entries are closed deterministically: via
+# close_loop_client() before an ephemeral loop shuts down, by the stale
+# sweep in _get_shared_client, and by the atexit hook at process exit —
+# an httpx pool's sockets are NOT reclaimed just because its loop closed.
+_SHARED_CLIENTS: Dict[asyncio.AbstractEventLoop, ScrapingBeeClient] = {}
+_SHARED_CLIENTS_LOCK = threading.Lock()
+
+
+async def _get_shared_client(api_key: Optional[str] = None) -> ScrapingBeeClient:
+    """Return the loop's shared connected client, creating it on first use"""
+    loop = asyncio.get_running_loop()
+    with _SHARED_CLIENTS_LOCK:
+        client = _SHARED_CLIENTS.get(loop)
+        # Sweep clients whose owning loop has closed without calling
+        # close_loop_client(); their pools must still be released
+        stale = [(l, c) for l, c in _SHARED_CLIENTS.items() if l.is_closed()]
+        for l, _ in stale:
+            del _SHARED_CLIENTS[l]
+    for _, orphan in stale:
+        try:
+            await orphan.close()
+        except Exception:
+            # Pool was bound to the dead loop; dropping the last
+            # reference lets GC close the file descriptors
+            logger.debug("Could not close orphaned scraping client cleanly")
+    if client is not None and client._client is not None:
+        return client
+    client = ScrapingBeeClient(
+        api_key=api_key,
+        country_code='us',
+        premium_proxy=False,
+        stealth_proxy_fallback=True,
+        render_js=True,
+        default_timeout_ms=60000,
+        device='desktop',
+    )
+    await client.connect()
+    with _SHARED_CLIENTS_LOCK:
+        _SHARED_CLIENTS[loop] = client
+    return client
+
+
+async def close_loop_client() -> None:
+    """Close and evict the current loop's shared client
+
+    Callers that run scrapes on a short-lived event loop must await this
+    before closing the loop, so the httpx pool is released on the loop
+    that owns it. Long-lived loops skip it and keep their warm pool.
+    """
+    loop = asyncio.get_running_loop()
+    with _SHARED_CLIENTS_LOCK:
+        client = _SHARED_CLIENTS.pop(loop, None)
+    if client is not None:
+        await client.close()
+
+
+def _close_shared_clients() -> None:
+    """atexit hook: release every still-open shared client"""
+    with _SHARED_CLIENTS_LOCK:
+        entries = list(_SHARED_CLIENTS.items())
+        _SHARED_CLIENTS.clear()
+    for loop, client in entries:
+        try:
+            if loop.is_closed():
+                continue
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(client.close(), loop).result(timeout=5)
+            else:
+                loop.run_until_complete(client.close())
+        except Exception:
+            logger.debug("Could not close shared scraping client at exit")
+
+
+atexit.register(_close_shared_clients)
+
+
+# scraped_at timestamps don't need sub-second precision; refresh the
+# formatted string at most every 250 ms so batch aggregation skips the
+# datetime alloc + format per property
+_TS_CACHE = [0.0, '']
+
+
+def _now_iso() -> str:
+    """UTC ISO timestamp (naive, matching the old utcnow format), cached briefly"""
+    t = time.time()
+    if t - _TS_CACHE[0] > 0.25:
+        _TS_CACHE[0] = t
+        _TS_CACHE[1] = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+    return _TS_CACHE[1]
+
+
+@lru_cache(maxsize=4096)
+def _compute_hints(city: Optional[str], borough: Optional[str],
+                   neighborhood: Optional[str]) -> Tuple[str, str, str, Optional[str]]:
+    """
+    Resolve the per-source city hints for a (city, borough, neighborhood)
+
+    Pure function of its inputs, so it's memoized — the same location
+    tuple repeats across every property in a batch and on retries.
+
+    Returns:
+        (zillow_city, redfin_city, streeteasy_city, streeteasy_neighborhood)
+    """
+    city_is_borough = city.upper() in NYC_BOROUGHS if city else False
+    zillow_city = city or (borough or '')
+    if city_is_borough and borough:
+        zillow_city = borough
+    if not zillow_city and borough:
+        zillow_city = borough
+
+    redfin_city = zillow_city or city or borough or ''
+
+    streeteasy_city = borough or city or ''
+    if streeteasy_city and streeteasy_city.upper() not in NYC_BOROUGHS and borough:
+        streeteasy_city = borough
+    streeteasy_neighborhood = neighborhood or (city if not city_is_borough else None)
+
+    return zillow_city, redfin_city, streeteasy_city, streeteasy_neighborhood
+
 
 class MultiSourceScraper:
     """
@@ -44,6 +228,20 @@ class MultiSourceScraper:
         self.zillow = None
         self.redfin = None
         self.streeteasy = None
+
+        # Per-source rate limiting state (shared across scrape_property calls
+        # on this instance)
+        self._sems = {src: asyncio.Semaphore(n) for src, n in _SOURCE_CONCURRENCY.items()}
+        self._min_interval = {
+            src: float(os.getenv(f'SCRAPER_RATE_LIMIT_DELAY_{src.upper()}', default))
+            for src, default in _SOURCE_MIN_INTERVAL.items()
+        }
+        self._last_call = {src: 0.0 for src in _SOURCE_CONCURRENCY}
+
+        # Sliding window of recent outcomes per source (1 = usable result,
+        # 0 = empty or raised) driving the adaptive interval adjustments
+        self._stats = {src: deque(maxlen=_ADAPT_WINDOW) for src in _SOURCE_CONCURRENCY}
+        self._base_interval = dict(self._min_interval)
     
     async def __aenter__(self):
         """Async context manager entry"""
@@ -58,19 +256,13 @@ class MultiSourceScraper:
         """Connect to scraping client and initialize scrapers"""
         try:
             logger.info("Initializing Multi-Source Scraper...")
-            
-            # Initialize ScrapingBee client (US geolocation). Prefer stealth by disabling premium_proxy.
-            self.client = ScrapingBeeClient(
-                api_key=self.api_key,
-                country_code='us',
-                premium_proxy=False,
-                stealth_proxy_fallback=True,
-                render_js=True,
-                default_timeout_ms=60000,
-                device='desktop',
-            )
-            await self.client.connect()
-            
+
+            # Reuse the per-loop ScrapingBee client (US geolocation, stealth
+            # preferred by disabling premium_proxy) instead of building one
+            # per scraper instance
+            self.client = await _get_shared_client(self.api_key)
+
+
             # Initialize scrapers with shared client
             self.zillow = ZillowScraper(brightdata_client=self.client)
             self.redfin = RedfinScraper(brightdata_client=self.client)
@@ -83,10 +275,15 @@ class MultiSourceScraper:
             raise
     
     async def disconnect(self):
-        """Disconnect from Bright Data"""
-        if self.client:
-            await self.client.close()
-            self.client = None
+        """
+        Release this scraper's reference to the shared client
+
+        The client itself stays connected and cached per event loop so
+        later scrapes reuse its warm pooled connections. It is closed by
+        close_loop_client() (which short-lived-loop callers await before
+        closing their loop) or by the atexit hook at process exit.
+        """
+        self.client = None
     
     async def scrape_property(
         self,
@@ -96,62 +293,68 @@ class MultiSourceScraper:
         *,
         zip_code: Optional[str] = None,
         borough: Optional[str] = None,
-        neighborhood: Optional[str] = None
+        neighborhood: Optional[str] = None,
+        force_refresh: bool = False
     ) -> Dict[str, Any]:
         """
         Scrape property data from all sources
-        
+
         Args:
             address: Street address
             city: City name
             state: State abbreviation
-        
+            force_refresh: Bypass cached responses and re-scrape
+
         Returns:
             Aggregated property data from all sources
         """
         logger.info(f"Starting multi-source scrape for {address}, {city}, {state}")
 
+        # Repeat lookups for the same normalized address skip scraping entirely
+        aggregate_key = fetch_cache_key('aggregate', {
+            'address': (address or '').strip().lower(),
+            'city': (city or '').strip().lower(),
+            'state': (state or '').strip().lower(),
+            'zip': (zip_code or '').strip()
+        })
+        if not force_refresh:
+            cached = cache_get(aggregate_key)
+            if cached is not None:
+                logger.info(f"✅ Multi-source scrape served from cache for {address}")
+                return cached
+
         city = (city or '').strip()
         borough = (borough or '').strip() or None
         neighborhood = (neighborhood or '').strip() or None
         state = (state or '').strip()
         zip_code = (zip_code or '').strip() or None
 
-        # Determine best city hints per source
-        city_is_borough = city.upper() in NYC_BOROUGHS if city else False
-        zillow_city = city or (borough or '')
-        if city_is_borough and borough:
-            zillow_city = borough
-        if not zillow_city and borough:
-            zillow_city = borough
-
-        redfin_city = zillow_city or city or borough or ''
-
-        streeteasy_city = borough or city or ''
-        if streeteasy_city and streeteasy_city.upper() not in NYC_BOROUGHS and borough:
-            streeteasy_city = borough
-        streeteasy_neighborhood = neighborhood or (city if not city_is_borough else None)
+        # Determine best city hints per source (memoized)
+        zillow_city, redfin_city, streeteasy_city, streeteasy_neighborhood = \
+            _compute_hints(city, borough, neighborhood)
 
         # Run all scrapers in parallel
-        tasks = [
-            self._safe_scrape(
+        task_map = {
+            'zillow': asyncio.create_task(self._safe_scrape(
                 self.zillow.search_property,
                 address,
                 zillow_city,
                 state,
                 "Zillow",
-                zip_code=zip_code
-            ),
-            self._safe_scrape(
+                zip_code=zip_code,
+                force_refresh=force_refresh
+            )),
+            'redfin': asyncio.create_task(self._safe_scrape(
                 self.redfin.search_property,
                 address,
                 redfin_city,
                 state,
                 "Redfin",
                 zip_code=zip_code,
-                borough=borough
-            ),
-            self._safe_scrape(
+                borough=borough,
+                force_refresh=force_refresh
+            )),
+            'streeteasy': asyncio.create_task(self._safe_scrape(
                 self.streeteasy.search_property,
                 address,
                 streeteasy_city,
@@ -159,26 +362,87 @@ class MultiSourceScraper:
                 "StreetEasy",
                 zip_code=zip_code,
                 neighborhood=streeteasy_neighborhood,
-                borough=borough
+                borough=borough,
+                force_refresh=force_refresh
+            ))
+        }
+
+        # Await results, but stop waiting for stragglers once a complete
+        # record is in hand and the minimum consensus window has passed
+        started = time.monotonic()
+        pending = set(task_map.values())
+        while pending:
+            # Wake at the minimum-wait mark even if nothing new finishes,
+            # so a complete result that landed early still triggers the
+            # exit instead of waiting out the slowest straggler
+            remaining = _EARLY_EXIT_MIN_WAIT_SEC - (time.monotonic() - started)
+            _done, pending = await asyncio.wait(
+                pending,
+                timeout=remaining if remaining > 0 else None,
+                return_when=asyncio.FIRST_COMPLETED,
             )
-        ]
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Process results
-        zillow_data, redfin_data, streeteasy_data = results
-        
+            # Consider every finished task, not just this wake-up's batch:
+            # a task that completed on an earlier iteration never appears
+            # in done again
+            if pending and time.monotonic() - started >= _EARLY_EXIT_MIN_WAIT_SEC \
+                    and any(_is_complete(self._task_result(t))
+                            for t in task_map.values() if t.done()):
+                logger.info("Complete result in hand; cancelling remaining scrapers")
+                for t in pending:
+                    t.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                break
+
         # Aggregate data
         aggregated = self._aggregate_property_data(
-            zillow_data if not isinstance(zillow_data, Exception) else None,
-            redfin_data if not isinstance(redfin_data, Exception) else None,
-            streeteasy_data if not isinstance(streeteasy_data, Exception) else None
+            self._task_result(task_map['zillow']),
+            self._task_result(task_map['redfin']),
+            self._task_result(task_map['streeteasy'])
         )
         
         logger.info(f"✅ Multi-source scrape complete. Sources: {aggregated['sources_count']}")
-        
+
+        # Only cache results that actually found something, so failed scrapes
+        # are retried instead of pinning an empty result for the TTL
+        if aggregated['sources_count'] > 0:
+            cache_put(aggregate_key, aggregated, _AGGREGATE_TTL_SEC)
+
         return aggregated
     
+    @staticmethod
+    def _task_result(task: asyncio.Task) -> Optional[Dict[str, Any]]:
+        """Result of a finished scrape task, or None if cancelled/failed/pending"""
+        if not task.done() or task.cancelled() or task.exception() is not None:
+            return None
+        return task.result()
+
+    async def scrape_properties(self, addresses: List[Dict[str, Any]], max_in_flight: int = 16):
+        """
+        Scrape many addresses concurrently, yielding results as they complete
+
+        All per-source calls overlap in one pool instead of iterating the
+        addresses sequentially; the per-source semaphores in _safe_scrape
+        keep each target host under its rate cap while different hosts
+        still run in parallel.
+
+        Args:
+            addresses: List of kwargs dicts for scrape_property
+                       (address, city, state plus optional keyword hints)
+            max_in_flight: Cap on concurrently running scrape_property calls
+
+        Yields:
+            Aggregated property data dicts, in completion order
+        """
+        sem = asyncio.Semaphore(max_in_flight)
+
+        async def scoped(addr: Dict[str, Any]) -> Dict[str, Any]:
+            async with sem:
+                return await self.scrape_property(**addr)
+
+        tasks = [asyncio.create_task(scoped(addr)) for addr in addresses]
+        for coro in asyncio.as_completed(tasks):
+            yield await coro
+
     async def _safe_scrape(self, scrape_func, address: str, city: str, state: str, source_name: str, **kwargs) -> Optional[Dict[str, Any]]:
         """
         Safely execute scraping function with error handling
@@ -194,10 +458,49 @@ class MultiSourceScraper:
             Scraped data or None if failed
         """
         try:
-            return await scrape_func(address, city, state, **kwargs)
+            # Bound concurrency per source, then enforce the minimum spacing
+            # between consecutive requests to the same source
+            async with self._sems[source_name]:
+                wait = self._min_interval[source_name] - (time.monotonic() - self._last_call[source_name])
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._last_call[source_name] = time.monotonic()
+                result = await scrape_func(address, city, state, **kwargs)
+                self._record_outcome(source_name, bool(result) and _has_signal(result))
+                return result
         except Exception as e:
             logger.warning(f"{source_name} scraping failed: {str(e)}")
+            self._record_outcome(source_name, False)
             return None
+
+    def _record_outcome(self, source_name: str, ok: bool) -> None:
+        """
+        Record a scrape outcome and adapt the source's request interval
+
+        When the sliding-window error rate crosses the threshold the
+        interval doubles (capped at a multiple of the configured base);
+        once the window recovers it halves back toward the base.
+        Cancelled stragglers never reach here, so early exits don't
+        count against a source.
+        """
+        stats = self._stats[source_name]
+        stats.append(1 if ok else 0)
+        if len(stats) < _ADAPT_MIN_SAMPLES:
+            return
+
+        error_rate = 1 - sum(stats) / len(stats)
+        current = self._min_interval[source_name]
+        base = self._base_interval[source_name]
+        if error_rate > _ADAPT_ERROR_THRESHOLD:
+            slowed = min((current * 2) or 1.0, (base * _ADAPT_MAX_INTERVAL_FACTOR) or _ADAPT_MAX_INTERVAL_FACTOR)
+            if slowed > current:
+                logger.warning(
+                    f"{source_name} error rate {error_rate:.0%} over last {len(stats)} "
+                    f"calls; backing off interval {current:.1f}s -> {slowed:.1f}s"
+                )
+                self._min_interval[source_name] = slowed
+        elif current > base:
+            self._min_interval[source_name] = max(base, current / 2)
     
     def _aggregate_property_data(self, zillow: Optional[Dict], redfin: Optional[Dict], 
                                  streeteasy: Optional[Dict]) -> Dict[str, Any]:
@@ -212,42 +515,64 @@ class MultiSourceScraper:
         Returns:
             Aggregated property data with consensus values
         """
-        sources = []
-        def has_signal(s: Dict[str, Any]) -> bool:
-            return bool(s.get('price') or s.get('listing_url') or s.get('address'))
-        if zillow and has_signal(zillow):
-            sources.append(zillow)
-        if redfin and has_signal(redfin):
-            sources.append(redfin)
-        if streeteasy and has_signal(streeteasy):
-            sources.append(streeteasy)
-        
+        # Fast path: when every source came back empty (the common failure
+        # mode), skip straight to the empty structure instead of entering
+        # the consensus/price/quality machinery
+        sources = [s for s in (zillow, redfin, streeteasy) if s and _has_signal(s)]
         if not sources:
             logger.warning("No valid data from any source")
             return self._empty_aggregated_data()
         
-        # Calculate consensus values
-        prices = [s['price'] for s in sources if s.get('price')]
-        sqfts = [s['square_feet'] for s in sources if s.get('square_feet')]
-        
+        # Single pass over the sources: collect consensus candidates, the
+        # numeric series, and the completeness tally together instead of
+        # re-traversing once per field plus once for the quality score
+        field_values = {k: [] for k in _CONSENSUS_FIELDS}
+        prices = []
+        sqfts = []
+        complete_fields = 0
+        for s in sources:
+            for k in _CONSENSUS_FIELDS:
+                v = s.get(k)
+                if v is not None:
+                    field_values[k].append(v)
+            if s.get('price'):
+                prices.append(s['price'])
+            if s.get('square_feet'):
+                sqfts.append(s['square_feet'])
+            complete_fields += sum(1 for f in _QUALITY_FIELDS if s.get(f))
+
+        consensus = {k: self._get_consensus_value(v) for k, v in field_values.items()}
+
+        # Sort once and derive low/high/median from the sorted list instead
+        # of separate min/max/median traversals
+        price_low = price_high = price_median = price_average = None
+        if prices:
+            prices.sort()
+            n = len(prices)
+            price_low = prices[0]
+            price_high = prices[-1]
+            price_average = sum(prices) // n
+            price_median = prices[n // 2] if n % 2 else (prices[n // 2 - 1] + prices[n // 2]) / 2
+
         aggregated = {
-            'address': self._get_consensus_value([s.get('address') for s in sources]),
-            'city': self._get_consensus_value([s.get('city') for s in sources]),
-            'state': self._get_consensus_value([s.get('state') for s in sources]),
-            'zip_code': self._get_consensus_value([s.get('zip_code') for s in sources]),
-            
+            'address': consensus['address'],
+            'city': consensus['city'],
+            'state': consensus['state'],
+            'zip_code': consensus['zip_code'],
+
+
             # Consensus pricing
-            'price_consensus': self._calculate_median(prices) if prices else None,
-            'price_low': min(prices) if prices else None,
-            'price_high': max(prices) if prices else None,
-            'price_average': sum(prices) // len(prices) if prices else None,
+            'price_consensus': price_median,
+            'price_low': price_low,
+            'price_high': price_high,
+            'price_average': price_average,
             
             # Property details (consensus or first available)
-            'bedrooms': self._get_consensus_value([s.get('bedrooms') for s in sources]),
-            'bathrooms': self._get_consensus_value([s.get('bathrooms') for s in sources]),
+            'bedrooms': consensus['bedrooms'],
+            'bathrooms': consensus['bathrooms'],
             'square_feet': self._calculate_median(sqfts) if sqfts else None,
-            'property_type': self._get_consensus_value([s.get('property_type') for s in sources]),
-            'year_built': self._get_consensus_value([s.get('year_built') for s in sources]),
+            'property_type': consensus['property_type'],
+            'year_built': consensus['year_built'],
             
             # Source data
             'sources': {
@@ -259,8 +584,8 @@ class MultiSourceScraper:
             'sources_available': [s.get('source') for s in sources],
             
             # Metadata
-            'scraped_at': datetime.utcnow().isoformat(),
-            'data_quality_score': self._calculate_quality_score(sources)
+            'scraped_at': _now_iso(),
+            'data_quality_score': self._quality_score_from_counts(len(sources), complete_fields)
         }
         
         return aggregated
@@ -277,25 +602,19 @@ class MultiSourceScraper:
         """
         # Filter out None values
         valid_values = [v for v in values if v is not None]
-        
+
         if not valid_values:
             return None
-        
-        # Return most common value
-        return max(set(valid_values), key=valid_values.count)
+
+        # Most common value in one O(n) counting pass
+        return Counter(valid_values).most_common(1)[0][0]
     
     def _calculate_median(self, values: List[float]) -> Optional[float]:
         """Calculate median of values"""
         if not values:
             return None
-        
-        sorted_values = sorted(values)
-        n = len(sorted_values)
-        
-        if n % 2 == 0:
-            return (sorted_values[n//2 - 1] + sorted_values[n//2]) / 2
-        else:
-            return sorted_values[n//2]
+
+        return statistics.median(values)
     
     def _calculate_quality_score(self, sources: List[Dict]) -> int:
         """
@@ -307,17 +626,22 @@ class MultiSourceScraper:
         Returns:
             Quality score
         """
-        score = 0
-        
-        # Base score for number of sources
-        score += len(sources) * 20  # 20 points per source (max 60)
-        
-        # Points for data completeness
-        required_fields = ['price', 'bedrooms', 'bathrooms', 'square_feet']
-        for source in sources:
-            complete_fields = sum(1 for field in required_fields if source.get(field))
-            score += (complete_fields / len(required_fields)) * (40 / len(sources))
-        
+        if not sources:
+            return 0
+
+        complete_fields = sum(1 for s in sources for f in _QUALITY_FIELDS if s.get(f))
+        return self._quality_score_from_counts(len(sources), complete_fields)
+
+    def _quality_score_from_counts(self, n_sources: int, complete_fields: int) -> int:
+        """
+        Quality score from pre-tallied counts
+
+        20 points per source (max 60) plus up to 40 points for field
+        completeness — same formula as before, but callable from the
+        aggregation pass that already counted the fields.
+        """
+        score = n_sources * 20
+        score += (complete_fields / len(_QUALITY_FIELDS)) * (40 / n_sources)
         return min(int(score), 100)
     
     def _empty_aggregated_data(self) -> Dict[str, Any]:
@@ -328,5 +652,5 @@ class MultiSourceScraper:
             'sources_count': 0,
             'sources_available': [],
             'data_quality_score': 0,
-            'scraped_at': datetime.utcnow().isoformat()
+            'scraped_at': _now_iso()
         }
@@ -4,10 +4,12 @@ Scrapes property data from Redfin.com using ScrapingBee (via shared client)
 """
 
 import logging
-import json
+import orjson
 from urllib.parse import quote
 from typing import Dict, Any, Optional
 from .base_scraper import BaseScraper
+from .fetch_cache import (AUTOCOMPLETE_TTL_SEC, LISTING_TTL_SEC, cached_fetch,
+                          cached_fetch_html, cached_scrape_page)
 from app.utils.geocoding import NYC_BOROUGHS
 
 logger = logging.getLogger(__name__)
@@ -33,7 +35,8 @@ class RedfinScraper(BaseScraper):
         city: str,
         state: str,
         zip_code: Optional[str] = None,
-        borough: Optional[str] = None
+        borough: Optional[str] = None,
+        force_refresh: bool = False
     ) -> Dict[str, Any]:
         """Search for a property on Redfin"""
         # Attempt 1: Use Redfin autocomplete to resolve an exact property URL
@@ -66,8 +69,12 @@ class RedfinScraper(BaseScraper):
             try:
                 # For JSON endpoints, avoid JS and allow non-2xx to pass through
                 # Mobile device header reduces bot detection on Redfin
-                resp = await self.client.fetch(
+                # Long-TTL cache: an address's canonical listing URL rarely changes
+                resp = await cached_fetch(
+                    self.client,
                     ac_url,
+                    ttl=AUTOCOMPLETE_TTL_SEC,
+                    force_refresh=force_refresh,
                     wait_for=None,
                     wait_timeout=8000,
                     extra_params={
@@ -79,40 +86,42 @@ class RedfinScraper(BaseScraper):
                     },
                     allow_failure=True
                 )
-                s = (resp.text or '').strip()
-                # Redfin stingray JSON responses may be prefixed with XSSI protection
-                if s.startswith(")]}'"):
-                    s = s.split("\n", 1)[1] if "\n" in s else s[4:]
-                data = json.loads(s)
-
-                def find_url(obj):
-                    if isinstance(obj, dict):
-                        u = obj.get('url')
-                        if isinstance(u, str) and '/home/' in u:
-                            return u
-                        u2 = obj.get('pagePath')
-                        if isinstance(u2, str) and '/home/' in u2:
-                            return u2
-                        for v in obj.values():
-                            res = find_url(v)
-                            if res:
-                                return res
-                    elif isinstance(obj, list):
-                        for v in obj:
-                            res = find_url(v)
-                            if res:
-                                return res
+                # Work on raw bytes: no .text decode of the full payload, and
+                # the XSSI protection prefix is sliced off without copies
+                raw = resp.content or b''
+                if raw.startswith(b")]}'"):
+                    nl = raw.find(b'\n')
+                    raw = raw[nl + 1:] if nl >= 0 else raw[4:]
+                data = orjson.loads(raw)
+
+                def find_url(root):
+                    # Iterative DFS: no recursion frame per node, early exit
+                    # on the first /home/ listing URL
+                    stack = [root]
+                    while stack:
+                        obj = stack.pop()
+                        if isinstance(obj, dict):
+                            for key in ('url', 'pagePath'):
+                                u = obj.get(key)
+                                if isinstance(u, str) and '/home/' in u:
+                                    return u
+                            stack.extend(obj.values())
+                        elif isinstance(obj, list):
+                            stack.extend(obj)
                     return None
 
                 path = find_url(data)
                 if path:
                     property_url = path if path.startswith('http') else f"{self.BASE_URL}{path}"
-                    html = await self.client.scrape_page(
+                    html = await cached_scrape_page(
+                        self.client,
                         property_url,
+                        ttl=LISTING_TTL_SEC,
+                        force_refresh=force_refresh,
                         wait_for='div[class*="propertyDetails"]',
                         wait_timeout=15000
                     )
-                    soup = self.parse_html(html)
+                    soup = await self.parse_html_async(html)
                     property_data = self._parse_property_details(soup)
                     property_data['listing_url'] = property_url
                     if property_data:
@@ -131,8 +140,13 @@ class RedfinScraper(BaseScraper):
                 legacy_parts.append(zip_hint)
             search_address = ' '.join(filter(None, legacy_parts)).strip().replace(' ', '-')
             search_url = f"{self.BASE_URL}/search/{search_address}"
-            resp = await self.client.fetch(
+            # Stream and stop shortly after the first HomeCard: the parser
+            # only reads that card, not the rest of the results page
+            html = await cached_fetch_html(
+                self.client,
                 search_url,
+                ttl=LISTING_TTL_SEC,
+                force_refresh=force_refresh,
                 wait_for='div[class*="HomeCard"]',
                 wait_timeout=15000,
                 extra_params={
@@ -142,9 +156,9 @@ class RedfinScraper(BaseScraper):
                     'block_resources': 'false',
                     'device': 'mobile'
                 },
-                allow_failure=True
+                sentinel=b'HomeCard'
             )
-            soup = self.parse_html(resp.text or '')
+            soup = await self.parse_html_async(html or '')
             property_data = self._parse_search_results(soup)
             if property_data:
                 self.log_scraping_result(True, "Found property on Redfin")
@@ -156,16 +170,19 @@ class RedfinScraper(BaseScraper):
             self.log_scraping_result(False, f"Search failed: {str(e)}")
             return self._empty_property_data()
     
-    async def get_property_details(self, property_url: str) -> Dict[str, Any]:
+    async def get_property_details(self, property_url: str, force_refresh: bool = False) -> Dict[str, Any]:
         """Get detailed property information from Redfin listing page"""
         try:
             self.log_scraping_result(True, f"Fetching details from {property_url}")
-            
+
             if not self.client:
                 raise Exception("Bright Data client not initialized")
-            
-            resp = await self.client.fetch(
+
+            resp = await cached_fetch(
+                self.client,
                 property_url,
+                ttl=LISTING_TTL_SEC,
+                force_refresh=force_refresh,
                 wait_for='div[class*="propertyDetails"]',
                 wait_timeout=30000,
                 extra_params={
@@ -177,7 +194,7 @@ class RedfinScraper(BaseScraper):
                 allow_failure=True
             )
             
-            soup = self.parse_html(resp.text or '')
+            soup = await self.parse_html_async(resp.text or '')
             property_data = self._parse_property_details(soup)
             property_data['listing_url'] = property_url
             
@@ -191,14 +208,15 @@ class RedfinScraper(BaseScraper):
     def _parse_search_results(self, soup) -> Dict[str, Any]:
         """Parse property data from Redfin search results"""
         try:
-            # Find property card
-            home_card = soup.find('div', class_=lambda x: x and 'HomeCard' in x)
+            # CSS selectors run in soupsieve's compiled matcher; the old
+            # class_=lambda filters invoked a Python callback per element
+            home_card = soup.select_one('div[class*="HomeCard"]')
             if not home_card:
                 return {}
-            
+
             # Extract basic info
-            price = home_card.find('span', class_=lambda x: x and 'price' in x.lower())
-            address = home_card.find('div', class_=lambda x: x and 'address' in x.lower())
+            price = home_card.select_one('span[class*="price" i]')
+            address = home_card.select_one('div[class*="address" i]')
             
             return {
                 'price': price.text if price else None,
@@ -215,12 +233,12 @@ class RedfinScraper(BaseScraper):
             data = {}
             
             # Redfin Estimate
-            estimate = soup.find('span', class_=lambda x: x and 'estimate' in x.lower())
+            estimate = soup.select_one('span[class*="estimate" i]')
             if estimate:
                 data['redfin_estimate'] = estimate.text
-            
+
             # Walk Score
-            walk_score = soup.find('div', {'data-rf-test-id': 'walk-score'})
+            walk_score = soup.select_one('div[data-rf-test-id="walk-score"]')
             if walk_score:
                 data['walk_score'] = walk_score.text
             
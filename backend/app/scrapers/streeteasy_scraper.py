@@ -6,6 +6,7 @@ Scrapes property data from StreetEasy.com using Bright Data
 import logging
 from typing import Dict, Any, Optional
 from .base_scraper import BaseScraper
+from .fetch_cache import LISTING_TTL_SEC, cached_fetch, cached_fetch_html
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +33,8 @@ class StreetEasyScraper(BaseScraper):
         state: str,
         zip_code: Optional[str] = None,
         neighborhood: Optional[str] = None,
-        borough: Optional[str] = None
+        borough: Optional[str] = None,
+        force_refresh: bool = False
     ) -> Dict[str, Any]:
         """Search for a property on StreetEasy"""
         # Build search URL (StreetEasy is NYC-focused)
@@ -64,9 +66,14 @@ class StreetEasyScraper(BaseScraper):
             if not self.client:
                 raise Exception("Scraping client not initialized")
             
-            # Tolerant fetch to handle non-2xx with body; transparent to pass target status
-            resp = await self.client.fetch(
+            # Tolerant fetch to handle non-2xx with body; transparent to pass
+            # target status. Streamed with early abort: the parser only reads
+            # the first listingCard, not the rest of the results page
+            html = await cached_fetch_html(
+                self.client,
                 search_url,
+                ttl=LISTING_TTL_SEC,
+                force_refresh=force_refresh,
                 wait_for='div[class*="listingCard"]',
                 wait_timeout=30000,
                 extra_params={
@@ -75,10 +82,9 @@ class StreetEasyScraper(BaseScraper):
                     'premium_proxy': None,
                     'block_resources': 'false'
                 },
-                allow_failure=True
+                sentinel=b'listingCard'
             )
-            html = (resp.text or '')
-            soup = self.parse_html(html)
+            soup = await self.parse_html_async(html or '')
             property_data = self._parse_search_results(soup)
             
             if property_data:
@@ -91,16 +97,19 @@ class StreetEasyScraper(BaseScraper):
             self.log_scraping_result(False, f"Search failed: {str(e)}")
             return self._empty_property_data()
     
-    async def get_property_details(self, property_url: str) -> Dict[str, Any]:
+    async def get_property_details(self, property_url: str, force_refresh: bool = False) -> Dict[str, Any]:
         """Get detailed property information from StreetEasy listing page"""
         try:
             self.log_scraping_result(True, f"Fetching details from {property_url}")
-            
+
             if not self.client:
                 raise Exception("Scraping client not initialized")
-            
-            resp = await self.client.fetch(
+
+            resp = await cached_fetch(
+                self.client,
                 property_url,
+                ttl=LISTING_TTL_SEC,
+                force_refresh=force_refresh,
                 wait_for='div[class*="DetailsPage"]',
                 wait_timeout=30000,
                 extra_params={
@@ -112,7 +121,7 @@ class StreetEasyScraper(BaseScraper):
                 allow_failure=True
             )
             html = (resp.text or '')
-            soup = self.parse_html(html)
+            soup = await self.parse_html_async(html)
             property_data = self._parse_property_details(soup)
             property_data['listing_url'] = property_url
             
@@ -126,17 +135,18 @@ class StreetEasyScraper(BaseScraper):
     def _parse_search_results(self, soup) -> Dict[str, Any]:
         """Parse property data from StreetEasy search results"""
         try:
-            # Find listing card
-            listing_card = soup.find('div', class_=lambda x: x and 'listingCard' in x)
+            # CSS selectors run in soupsieve's compiled matcher; the old
+            # class_=lambda filters invoked a Python callback per element
+            listing_card = soup.select_one('div[class*="listingCard"]')
             if not listing_card:
                 return {}
-            
+
             # Extract basic info
-            price = listing_card.find('span', class_=lambda x: x and 'price' in x.lower())
-            address = listing_card.find('a', class_=lambda x: x and 'address' in x.lower())
-            
+            price = listing_card.select_one('span[class*="price" i]')
+            address = listing_card.select_one('a[class*="address" i]')
+
             # Extract beds/baths
-            details = listing_card.find_all('span', class_=lambda x: x and 'detail' in x.lower())
+            details = listing_card.select('span[class*="detail" i]')
             beds, baths = None, None
             for detail in details:
                 text = detail.text.lower()
@@ -162,7 +172,7 @@ class StreetEasyScraper(BaseScraper):
             data = {}
             
             # Building amenities
-            amenities_section = soup.find('div', class_=lambda x: x and 'amenities' in x.lower())
+            amenities_section = soup.select_one('div[class*="amenities" i]')
             if amenities_section:
                 amenities = [
                     a.text.strip()
@@ -171,7 +181,7 @@ class StreetEasyScraper(BaseScraper):
                 data['amenities'] = amenities
             
             # Neighborhood
-            neighborhood = soup.find('a', class_=lambda x: x and 'neighborhood' in x.lower())
+            neighborhood = soup.select_one('a[class*="neighborhood" i]')
             if neighborhood:
                 data['neighborhood'] = neighborhood.text
             
@@ -3,14 +3,147 @@ Zillow Property Scraper
 Scrapes property data from Zillow.com using Bright Data
 """
 
+import asyncio
+import io
 import re
 import logging
-import json
-from typing import Dict, Any, List, Optional
+import orjson
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+from bs4 import SoupStrainer
 from .base_scraper import BaseScraper
+from .fetch_cache import LISTING_TTL_SEC, cached_fetch
 
 logger = logging.getLogger(__name__)
 
+# Optional: SAX-style streaming for very large __NEXT_DATA__ blobs, so the
+# full dict-tree (10-30MB of Python objects per MB of JSON) is never built
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Search results pages run to hundreds of KB, but _parse_search_results only
+# reads the first property card; straining to those articles keeps tree
+# construction proportional to the cards instead of the whole page. Detail
+# pages still get a full parse — their text-regex fallbacks need every node.
+_SEARCH_CARD_STRAINER = SoupStrainer('article', attrs={'data-test': 'property-card'})
+
+# Compiled once at import. The combined alternation lets one finditer pass
+# over the page text fill every still-missing field, instead of a separate
+# full-text scan per field.
+_PRICE_RE = re.compile(r"\$\s*([\d,]+)")
+
+# Queens-style 'xx-yy <num> <type>' address shape, compiled once
+_QUEENS_RE = re.compile(r"^(\d+)-(\d+)\s+(\d+)\s+([A-Za-z]+)")
+_NON_DIGIT_RE = re.compile(r"[^0-9]")
+
+# Slug normalization as a single C-level translate pass (spaces -> dashes)
+# instead of a fresh string per .replace call
+_SLUG_TABLE = str.maketrans({' ': '-'})
+
+# Street-type abbreviations, keys pre-lowercased so candidate generation
+# is a single hash probe
+_STREET_ABBR = {
+    'street': 'St', 'st': 'St',
+    'avenue': 'Ave', 'ave': 'Ave',
+    'road': 'Rd', 'rd': 'Rd',
+    'drive': 'Dr', 'dr': 'Dr',
+    'court': 'Ct', 'ct': 'Ct',
+    'boulevard': 'Blvd', 'blvd': 'Blvd',
+    'place': 'Pl', 'pl': 'Pl',
+    'lane': 'Ln', 'ln': 'Ln',
+    'terrace': 'Ter', 'ter': 'Ter',
+    'parkway': 'Pkwy', 'pkwy': 'Pkwy'
+}
+
+# Embedded-JSON script blocks sliced straight out of the raw HTML, so the
+# common detail-page case never builds a DOM at all
+_NEXT_DATA_SCRIPT_RE = re.compile(
+    r'<script[^>]*\bid=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.DOTALL)
+_JSON_LD_SCRIPT_RE = re.compile(
+    r'<script[^>]*\btype=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.DOTALL)
+_CANONICAL_RE = re.compile(
+    r'<link[^>]*\brel=["\']canonical["\'][^>]*\bhref=["\']([^"\']+)["\']', re.IGNORECASE)
+
+# Field aliases in Zillow's __NEXT_DATA__ blob, flattened into one
+# key -> field map so a single traversal can collect every target
+_NEXT_DATA_TARGETS = {
+    'price': ('price', 'priceRaw', 'unformattedPrice', 'zestimate', 'homePrice', 'priceValue'),
+    'beds': ('bedrooms', 'beds', 'bedroomsMax', 'bedroomsMin'),
+    'baths': ('bathrooms', 'baths', 'numberOfBathroomsTotal', 'bathroomsMax', 'bathroomsMin'),
+    'sqft': ('livingArea', 'livingAreaValue', 'sqft', 'homeSize', 'area', 'universalsize'),
+    'street': ('streetAddress', 'street'),
+    'city': ('city', 'addressLocality'),
+    'state': ('state', 'addressRegion'),
+    'zip': ('zipcode', 'postalCode', 'zip'),
+}
+_NEXT_DATA_KEYMAP = {k: field for field, keys in _NEXT_DATA_TARGETS.items() for k in keys}
+
+
+def _extract_next_data_fields(obj) -> Dict[str, Any]:
+    """
+    Collect all target fields from a __NEXT_DATA__ tree in one pass
+
+    The blob can run to several MB; one iterative walk that checks each
+    dict key against the flattened alias map replaces a full recursive
+    traversal per field, and only containers are pushed onto the stack.
+    """
+    found: Dict[str, Any] = {}
+    n_targets = len(_NEXT_DATA_TARGETS)
+    stack = [obj]
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, dict):
+            for k, v in cur.items():
+                field = _NEXT_DATA_KEYMAP.get(k)
+                if field is not None and field not in found and v not in (None, ''):
+                    found[field] = v
+                    if len(found) == n_targets:
+                        return found
+                if isinstance(v, (dict, list)):
+                    stack.append(v)
+        elif isinstance(cur, list):
+            stack.extend(cur)
+    return found
+
+
+# Blobs past this size go through the streaming parser when ijson is
+# available; below it, one orjson parse is both faster and small enough
+_NEXT_DATA_STREAM_MIN_BYTES = 1 << 20
+
+
+def _stream_next_data_fields(raw: str) -> Dict[str, Any]:
+    """Stream target fields out of a __NEXT_DATA__ blob without a tree"""
+    found: Dict[str, Any] = {}
+    n_targets = len(_NEXT_DATA_TARGETS)
+    for prefix, event, value in ijson.parse(io.BytesIO(raw.encode())):
+        if event not in ('string', 'number'):
+            continue
+        field = _NEXT_DATA_KEYMAP.get(prefix.rsplit('.', 1)[-1])
+        if field is not None and field not in found and value not in (None, ''):
+            found[field] = value
+            if len(found) == n_targets:
+                break
+    return found
+
+
+def _next_data_fields(raw: str) -> Dict[str, Any]:
+    """Extract target fields from a raw __NEXT_DATA__ script body"""
+    if ijson is not None and len(raw) >= _NEXT_DATA_STREAM_MIN_BYTES:
+        try:
+            return _stream_next_data_fields(raw)
+        except Exception:
+            pass
+    return _extract_next_data_fields(orjson.loads(raw))
+_FIELDS_RE = re.compile(
+    r"\$\s*(?P<price>[\d,]+)"
+    r"|(?P<beds>\d+)\s*bd\b"
+    r"|(?P<baths>\d+\.?\d*)\s*ba\b"
+    r"|(?P<sqft>[\d,]+)\s*sq\s*ft\b",
+    re.IGNORECASE
+)
+
 
 class ZillowScraper(BaseScraper):
     """
@@ -26,22 +159,14 @@ class ZillowScraper(BaseScraper):
     """
     
     BASE_URL = "https://www.zillow.com"
-    STREET_ABBR = {
-        'street': 'St', 'st': 'St',
-        'avenue': 'Ave', 'ave': 'Ave',
-        'road': 'Rd', 'rd': 'Rd',
-        'drive': 'Dr', 'dr': 'Dr',
-        'court': 'Ct', 'ct': 'Ct',
-        'boulevard': 'Blvd', 'blvd': 'Blvd',
-        'place': 'Pl', 'pl': 'Pl',
-        'lane': 'Ln', 'ln': 'Ln',
-        'terrace': 'Ter', 'ter': 'Ter',
-        'parkway': 'Pkwy', 'pkwy': 'Pkwy'
-    }
-
-    def _to_ordinal(self, n_str: str) -> str:
+    # Kept as a class alias; the lookup table lives at module level
+    STREET_ABBR = _STREET_ABBR
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _to_ordinal(n_str: str) -> str:
         try:
-            n = int(re.sub(r"[^0-9]", "", n_str))
+            n = int(_NON_DIGIT_RE.sub("", n_str))
         except Exception:
             return n_str
         if 10 <= (n % 100) <= 20:
@@ -50,36 +175,128 @@ class ZillowScraper(BaseScraper):
             suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')
         return f"{n}{suffix}"
 
-    def _queens_detail_candidates(self, address: str, city: str, state: str, zip_code: str | None = None) -> list[str]:
+    @classmethod
+    @lru_cache(maxsize=2048)
+    def _queens_detail_candidates(cls, address: str, city: str, state: str, zip_code: str | None = None) -> Tuple[str, ...]:
         """Build likely Zillow homedetails paths for Queens-style addresses.
         Example: '43-52 169 Street' -> '4352-169th-St'
+
+        Pure function of its arguments, so it's memoized — retries and
+        batch runs re-resolve the same addresses.
         """
         addr = address.strip()
         # Match 'xx-yy <num> <type>'
-        m = re.match(r"^(\d+)-(\d+)\s+(\d+)\s+([A-Za-z]+)", addr)
+        m = _QUEENS_RE.match(addr)
         candidates = []
         if m:
             part1, part2, street_num, street_type = m.groups()
             house = f"{part1}{part2}"  # 43-52 -> 4352
-            ordinal = self._to_ordinal(street_num)  # 169 -> 169th
-            abbr = self.STREET_ABBR.get(street_type.lower(), street_type.title())
-            city_slug = city.replace(' ', '-')
+            ordinal = cls._to_ordinal(street_num)  # 169 -> 169th
+            abbr = _STREET_ABBR.get(street_type.lower()) or street_type.title()
+            city_slug = city.translate(_SLUG_TABLE)
             core = f"{house}-{ordinal}-{abbr}-{city_slug}-{state}"
             if zip_code:
-                candidates.append(f"{self.BASE_URL}/homedetails/{core}-{zip_code}/")
-            candidates.append(f"{self.BASE_URL}/homedetails/{core}/")
-        return candidates
+                candidates.append(f"{cls.BASE_URL}/homedetails/{core}-{zip_code}/")
+            candidates.append(f"{cls.BASE_URL}/homedetails/{core}/")
+        return tuple(candidates)
+
+    # Cap on concurrent homedetails candidate fetches, so racing candidates
+    # doesn't burn through the ScrapingBee concurrency allowance
+    CANDIDATE_CONCURRENCY = 3
+
+    def __init__(self, brightdata_client=None):
+        super().__init__(brightdata_client)
+        # Parsed-tree memo keyed on the document hash: canonical URLs that
+        # resolve back to the candidate page would otherwise re-parse the
+        # same HTML, and tree construction dominates this module's CPU
+        self._soup_cache: Dict[int, Any] = {}
+        self._candidate_sem = asyncio.Semaphore(self.CANDIDATE_CONCURRENCY)
+        # Failure-path template: the empty record is normalized once here
+        # instead of once per failed URL
+        self._empty_template = self.normalize_property_data({
+            'source': 'Zillow',
+            'address': None,
+            'price': None,
+            'bedrooms': None,
+            'bathrooms': None,
+            'square_feet': None
+        })
+
+    async def _parse_cached(self, html: str):
+        """Parse a document once per instance, reusing the tree on repeats"""
+        key = hash(html)
+        soup = self._soup_cache.get(key)
+        if soup is None:
+            soup = await self.parse_html_async(html)
+            if len(self._soup_cache) >= 8:
+                self._soup_cache.clear()
+            self._soup_cache[key] = soup
+        return soup
+
+    async def _try_candidate(self, cand: str, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Fetch one homedetails candidate, follow its canonical URL, and
+        parse the page into normalized property data (None on failure)
+        """
+        # Light config first: the parsers feed on server-rendered JSON
+        # (__NEXT_DATA__/JSON-LD), so images/CSS/fonts are dead weight and
+        # there is no hydrated content to wait 30s for
+        light_kwargs = {
+            'wait_for': 'script#__NEXT_DATA__',
+            'wait_timeout': 10000,
+            'extra_params': {
+                'transparent_status_code': 'true',
+                'stealth_proxy': 'true',
+                'premium_proxy': None,
+                'block_resources': 'true',
+                'device': 'desktop'
+            },
+            'allow_failure': True
+        }
+        heavy_kwargs = {
+            'wait_for': 'div[data-test="home-details"]',
+            'wait_timeout': 30000,
+            'extra_params': {
+                'transparent_status_code': 'true',
+                'stealth_proxy': 'true',
+                'premium_proxy': None,
+                'block_resources': 'false',
+                'device': 'desktop'
+            },
+            'allow_failure': True
+        }
+
+        async def fetch_page(url: str) -> str:
+            resp = await cached_fetch(self.client, url, ttl=LISTING_TTL_SEC,
+                                      force_refresh=force_refresh, **light_kwargs)
+            html = (resp.text or '')
+            if '__NEXT_DATA__' in html:
+                return html
+            # No embedded JSON served: retry with the full hydrated-DOM
+            # config so the soup-based parser has something to read
+            resp = await cached_fetch(self.client, url, ttl=LISTING_TTL_SEC,
+                                      force_refresh=force_refresh, **heavy_kwargs)
+            return resp.text or ''
+
+        async with self._candidate_sem:
+            html = await fetch_page(cand)
+            # Canonical resolved by regex on the raw HTML — no DOM needed
+            canon = self._canonical_from_html(html, cand)
+            if canon != cand:
+                # Canonical follows that are already cached cost nothing;
+                # fresh ones are fetched and cached like any candidate
+                html = await fetch_page(canon)
+            # Embedded JSON usually carries every core field; only build a
+            # DOM when the fast path leaves gaps
+            property_data = self._parse_property_details_fast(html)
+            if not all(property_data.get(k) for k in self._CORE_FIELDS):
+                soup = await self._parse_cached(html)
+                property_data = self._parse_property_details(soup)
+            property_data['listing_url'] = canon
+            if property_data:
+                return self.normalize_property_data(property_data)
+            return None
 
-    def _get_canonical_or_self(self, html: str, page_url: str) -> str:
-        try:
-            soup = self.parse_html(html)
-            link = soup.find('link', rel='canonical')
-            href = (link and link.get('href')) or None
-            if href and href.startswith('http'):
-                return href
-        except Exception:
-            pass
-        return page_url
     
     async def search_property(
         self,
@@ -87,7 +304,8 @@ class ZillowScraper(BaseScraper):
         city: str,
         state: str,
         zip_code: Optional[str] = None,
-        borough: Optional[str] = None
+        borough: Optional[str] = None,
+        force_refresh: bool = False
     ) -> Dict[str, Any]:
         """
         Search for a property on Zillow
@@ -118,89 +336,45 @@ class ZillowScraper(BaseScraper):
             search_components.append(state_hint)
         if zip_hint:
             search_components.append(zip_hint)
-        search_address = ', '.join(filter(None, search_components)).replace(' ', '-')
+        search_address = ', '.join(filter(None, search_components)).translate(_SLUG_TABLE)
         search_url = f"{self.BASE_URL}/homes/{search_address}_rb/"
 
         try:
             self.log_scraping_result(True, f"Searching Zillow for {address}, {city_hint or borough_hint}, {state_hint}")
 
-            # 1) Try Queens/NYC homedetails candidates first (more reliable for these addresses)
+            # 1) Try Queens/NYC homedetails candidates first (more reliable
+            # for these addresses). Candidates race concurrently — each is a
+            # 15-30s ScrapingBee call, so awaiting them in sequence made
+            # wall time scale with the candidate count. First usable result
+            # wins and the rest are cancelled.
             candidates = self._queens_detail_candidates(address, slug_city or city_hint or borough_hint, state_hint, zip_code=zip_hint or zip_code)
-            for cand in candidates:
+            if candidates:
+                tasks = [asyncio.create_task(self._try_candidate(c, force_refresh)) for c in candidates]
                 try:
-                    resp = await self.client.fetch(
-                        cand,
-                        wait_for='div[data-test="home-details"]',
-                        wait_timeout=30000,
-                        extra_params={
-                            'transparent_status_code': 'true',
-                            'stealth_proxy': 'true',
-                            'premium_proxy': None,
-                            'block_resources': 'false',
-                            'device': 'desktop'
-                        },
-                        allow_failure=True
-                    )
-                    html = (resp.text or '')
-                    # Follow canonical if present
-                    canon = self._get_canonical_or_self(html, cand)
-                    if canon != cand:
-                        resp2 = await self.client.fetch(
-                            canon,
-                            wait_for='div[data-test="home-details"]',
-                            wait_timeout=30000,
-                            extra_params={
-                                'transparent_status_code': 'true',
-                                'stealth_proxy': 'true',
-                                'premium_proxy': None,
-                                'block_resources': 'false',
-                                'device': 'desktop'
-                            },
-                            allow_failure=True
-                        )
-                        html = (resp2.text or '')
-                    soup = self.parse_html(html)
-                    property_data = self._parse_property_details(soup)
-                    property_data['listing_url'] = canon
-                    if property_data:
-                        return self.normalize_property_data(property_data)
-                except Exception:
-                    continue
+                    for fut in asyncio.as_completed(tasks):
+                        try:
+                            result = await fut
+                        except Exception:
+                            continue
+                        if result:
+                            return result
+                finally:
+                    for t in tasks:
+                        t.cancel()
             
-            # 2) Try structured extraction on search page
+            # 2) Fetch the search page once and run the card selectors
+            # locally — the old extract_json roundtrip hit the same URL
+            # with the same selectors for a second ScrapingBee credit and
+            # another 30s worst case before this fetch ran anyway
             if not self.client:
                 raise Exception("Scraping client not initialized")
-            try:
-                data = await self.client.extract_json(
-                    search_url,
-                    extract_rules={
-                        'price': "span[data-test='property-card-price']",
-                        'address': "address[data-test='property-card-addr']",
-                        'listing_url': "a[data-test='property-card-link']::attr(href)"
-                    },
-                    wait_for='article[data-test="property-card"]',
-                    wait_timeout=15000
-                )
-                price = (data or {}).get('price')
-                addr = (data or {}).get('address')
-                link = (data or {}).get('listing_url')
-                if link and link.startswith('/'):
-                    link = f"{self.BASE_URL}{link}"
-                if price or addr or link:
-                    property_data = {
-                        'price': price,
-                        'address': addr,
-                        'listing_url': link
-                    }
-                    # If any field present, return normalized quickly
-                    return self.normalize_property_data(property_data)
-            except Exception:
-                # Fall through to tolerant HTML parsing
-                pass
 
-            # Use ScrapingBee tolerant fetch to retrieve body even on non-2xx as fallback
-            resp = await self.client.fetch(
+            # Tolerant fetch retrieves the body even on non-2xx
+            resp = await cached_fetch(
+                self.client,
                 search_url,
+                ttl=LISTING_TTL_SEC,
+                force_refresh=force_refresh,
                 wait_for='article[data-test="property-card"]',
                 wait_timeout=30000,
                 extra_params={
@@ -213,9 +387,9 @@ class ZillowScraper(BaseScraper):
                 allow_failure=True
             )
             html = (resp.text or '')
-            
-            soup = self.parse_html(html)
-            
+
+            soup = await self.parse_html_async(html, parse_only=_SEARCH_CARD_STRAINER)
+
             # Parse property data from search results
             property_data = self._parse_search_results(soup)
             
@@ -229,35 +403,63 @@ class ZillowScraper(BaseScraper):
             self.log_scraping_result(False, f"Search failed: {str(e)}")
             return self._empty_property_data()
     
-    async def get_property_details(self, property_url: str) -> Dict[str, Any]:
+    async def search_properties_bulk(self, addresses: List[Dict[str, Any]], concurrency: int = 20) -> List[Any]:
+        """
+        Search many addresses concurrently with bounded parallelism
+
+        One pool of overlapping searches replaces a sequential await per
+        address, so wall time stops scaling with the batch size; the
+        semaphore keeps the in-flight ScrapingBee connection count capped.
+
+        Args:
+            addresses: List of kwargs dicts for search_property
+            concurrency: Cap on concurrently running searches
+
+        Returns:
+            Results in input order; failed entries hold the exception
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(addr: Dict[str, Any]):
+            async with sem:
+                return await self.search_property(**addr)
+
+        return await asyncio.gather(*(one(a) for a in addresses), return_exceptions=True)
+
+    async def get_property_details(self, property_url: str, force_refresh: bool = False) -> Dict[str, Any]:
         """
         Get detailed property information from Zillow listing page
-        
+
         Args:
             property_url: Zillow property URL
-        
+
         Returns:
             Detailed property data
         """
         try:
             self.log_scraping_result(True, f"Fetching details from {property_url}")
-            
+
             if not self.client:
                 raise Exception("Scraping client not initialized")
-            
-            resp = await self.client.fetch(
+
+            resp = await cached_fetch(
+                self.client,
                 property_url,
+                ttl=LISTING_TTL_SEC,
+                force_refresh=force_refresh,
                 wait_for='div[data-test="home-details"]',
                 wait_timeout=15000,
                 extra_params={'transparent_status_code': 'true'},
                 allow_failure=True
             )
             html = (resp.text or '')
-            
-            soup = self.parse_html(html)
-            
-            # Parse detailed property data
-            property_data = self._parse_property_details(soup)
+
+            # DOM-free fast path over the embedded JSON; fall back to the
+            # full parse when it leaves core fields missing
+            property_data = self._parse_property_details_fast(html)
+            if not all(property_data.get(k) for k in self._CORE_FIELDS):
+                soup = await self.parse_html_async(html)
+                property_data = self._parse_property_details(soup)
             property_data['listing_url'] = property_url
             
             self.log_scraping_result(True, "Property details fetched successfully")
@@ -287,18 +489,22 @@ class ZillowScraper(BaseScraper):
             price_elem = property_card.find('span', {'data-test': 'property-card-price'})
             address_elem = property_card.find('address', {'data-test': 'property-card-addr'})
             
-            # Extract beds/baths/sqft
+            # Extract beds/baths/sqft: lowercase each item once, take the
+            # first match per field, and stop as soon as all three are set
             details = property_card.find_all('li')
             beds, baths, sqft = None, None, None
-            
+
             for detail in details:
-                text = detail.text.lower()
-                if 'bd' in text:
-                    beds = detail.text
-                elif 'ba' in text:
-                    baths = detail.text
-                elif 'sqft' in text:
-                    sqft = detail.text
+                text = detail.text
+                lowered = text.lower()
+                if beds is None and 'bd' in lowered:
+                    beds = text
+                elif baths is None and 'ba' in lowered:
+                    baths = text
+                elif sqft is None and 'sqft' in lowered:
+                    sqft = text
+                if beds and baths and sqft:
+                    break
             
             # Get property URL
             link_elem = property_card.find('a', {'data-test': 'property-card-link'})
@@ -317,13 +523,128 @@ class ZillowScraper(BaseScraper):
             logger.error(f"Failed to parse Zillow search results: {e}")
             return {}
     
+    # Fields the embedded-JSON fast path must fill before the DOM parse
+    # can be skipped
+    _CORE_FIELDS = ('price', 'bedrooms', 'bathrooms', 'square_feet')
+
+    @staticmethod
+    def _absorb_json_ld(obj, data: Dict[str, Any]) -> None:
+        """
+        Merge fields from one JSON-LD object into data (first hit wins)
+
+        setdefault keeps each fill a single dict operation instead of the
+        old get-then-assign pair, which adds up across the many JSON-LD
+        objects a page can carry.
+        """
+        if not isinstance(obj, dict):
+            return
+        # Address
+        addr = obj.get('address')
+        if isinstance(addr, dict) and 'address' not in data:
+            parts = [addr.get('streetAddress'), addr.get('addressLocality'), addr.get('addressRegion'), addr.get('postalCode')]
+            joined = ' '.join([p for p in parts if p])
+            if joined:
+                data['address'] = joined
+        # Offers/price
+        offers = obj.get('offers')
+        if isinstance(offers, dict):
+            price = offers.get('price') or offers.get('lowPrice') or offers.get('highPrice')
+            if price:
+                data.setdefault('price', str(price))
+        # Beds/Baths/Sqft if available
+        if isinstance(obj.get('numberOfRooms'), (int, float)):
+            data.setdefault('bedrooms', str(int(obj['numberOfRooms'])))
+        if isinstance(obj.get('numberOfBathroomsTotal'), (int, float)):
+            data.setdefault('bathrooms', str(obj['numberOfBathroomsTotal']))
+        sqft = obj.get('floorSize')
+        if isinstance(sqft, dict):
+            val = sqft.get('value')
+            if val:
+                data.setdefault('square_feet', str(val))
+
+    @staticmethod
+    def _apply_next_data(found: Dict[str, Any], data: Dict[str, Any]) -> None:
+        """Merge extracted __NEXT_DATA__ fields into data (first hit wins)"""
+        # Price-related
+        price_val = found.get('price')
+        if price_val:
+            data.setdefault('price', str(price_val))
+        # Beds
+        beds_val = found.get('beds')
+        if beds_val and not data.get('bedrooms'):
+            try:
+                data['bedrooms'] = str(int(float(beds_val)))
+            except Exception:
+                data['bedrooms'] = str(beds_val)
+        # Baths
+        baths_val = found.get('baths')
+        if baths_val:
+            data.setdefault('bathrooms', str(baths_val))
+        # Sqft
+        sqft_val = found.get('sqft')
+        if sqft_val:
+            data.setdefault('square_feet', str(sqft_val))
+        # Address
+        if not data.get('address'):
+            parts = [p for p in (found.get('street'), found.get('city'),
+                                 found.get('state'), found.get('zip')) if p]
+            if parts:
+                data['address'] = ' '.join(str(p) for p in parts)
+
+    @staticmethod
+    def _canonical_from_html(html: str, page_url: str) -> str:
+        """Resolve the canonical URL via regex on the raw HTML"""
+        try:
+            m = _CANONICAL_RE.search(html or '')
+            href = m.group(1) if m else None
+            if href and href.startswith('http'):
+                return href
+        except Exception:
+            pass
+        return page_url
+
+    def _parse_property_details_fast(self, html: str) -> Dict[str, Any]:
+        """
+        Extract detail fields from raw HTML's embedded JSON, with no DOM
+
+        The JSON-LD and __NEXT_DATA__ script bodies are sliced out with
+        compiled regexes and decoded with orjson. On typical detail pages
+        this fills every core field, letting callers skip the full
+        BeautifulSoup parse entirely.
+        """
+        data: Dict[str, Any] = {}
+        try:
+            for m in _JSON_LD_SCRIPT_RE.finditer(html):
+                raw = m.group(1).strip()
+                if not raw:
+                    continue
+                try:
+                    obj = orjson.loads(raw)
+                except Exception:
+                    continue
+                if isinstance(obj, list):
+                    for o in obj:
+                        self._absorb_json_ld(o, data)
+                elif isinstance(obj, dict):
+                    self._absorb_json_ld(obj, data)
+
+            m = _NEXT_DATA_SCRIPT_RE.search(html)
+            if m:
+                try:
+                    self._apply_next_data(_next_data_fields(m.group(1)), data)
+                except Exception:
+                    pass
+        except Exception as e:
+            logger.debug(f"Embedded-JSON fast parse failed: {e}")
+        return data
+
     def _parse_property_details(self, soup) -> Dict[str, Any]:
         """
         Parse detailed property data from Zillow listing page
-        
+
         Args:
             soup: BeautifulSoup object
-        
+
         Returns:
             Detailed property data
         """
@@ -352,124 +673,65 @@ class ZillowScraper(BaseScraper):
             
             # Try parsing JSON-LD structured data for robust fields
             try:
-                scripts = soup.find_all('script', type='application/ld+json')
-                def absorb(obj):
-                    if not isinstance(obj, dict):
-                        return
-                    # Address
-                    addr = obj.get('address')
-                    if isinstance(addr, dict) and not data.get('address'):
-                        parts = [addr.get('streetAddress'), addr.get('addressLocality'), addr.get('addressRegion'), addr.get('postalCode')]
-                        data['address'] = ' '.join([p for p in parts if p])
-                    # Offers/price
-                    offers = obj.get('offers')
-                    if isinstance(offers, dict) and not data.get('price'):
-                        price = offers.get('price') or offers.get('lowPrice') or offers.get('highPrice')
-                        if price:
-                            data['price'] = str(price)
-                    # Beds/Baths/Sqft if available
-                    if not data.get('bedrooms') and isinstance(obj.get('numberOfRooms'), (int, float)):
-                        data['bedrooms'] = str(int(obj['numberOfRooms']))
-                    if not data.get('bathrooms') and isinstance(obj.get('numberOfBathroomsTotal'), (int, float)):
-                        data['bathrooms'] = str(obj['numberOfBathroomsTotal'])
-                    if not data.get('square_feet'):
-                        sqft = obj.get('floorSize')
-                        if isinstance(sqft, dict):
-                            val = sqft.get('value')
-                            if val:
-                                data['square_feet'] = str(val)
-                for s in scripts:
+                for s in soup.find_all('script', type='application/ld+json'):
                     try:
                         raw = s.string or s.text or ''
                         if not raw:
                             continue
-                        obj = json.loads(raw)
+                        obj = orjson.loads(raw)
                         if isinstance(obj, list):
                             for o in obj:
-                                absorb(o)
+                                self._absorb_json_ld(o, data)
                         elif isinstance(obj, dict):
-                            absorb(obj)
+                            self._absorb_json_ld(obj, data)
                     except Exception:
                         continue
             except Exception:
                 pass
-            
+
             # Fallback: Parse __NEXT_DATA__ (Zillow Next.js embedded JSON)
             try:
-                def deep_get_any(o, keys):
-                    if isinstance(o, dict):
-                        for k in keys:
-                            if k in o and o.get(k) not in (None, ''):
-                                return o.get(k)
-                        for v in o.values():
-                            r = deep_get_any(v, keys)
-                            if r is not None:
-                                return r
-                    elif isinstance(o, list):
-                        for v in o:
-                            r = deep_get_any(v, keys)
-                            if r is not None:
-                                return r
-                    return None
                 next_script = soup.find('script', id='__NEXT_DATA__')
                 if next_script and (next_script.string or next_script.text):
-                    obj = json.loads(next_script.string or next_script.text)
-                    # Price-related
-                    price_val = deep_get_any(obj, ['price', 'priceRaw', 'unformattedPrice', 'zestimate', 'homePrice', 'priceValue'])
-                    if price_val and not data.get('price'):
-                        data['price'] = str(price_val)
-                    # Beds
-                    beds_val = deep_get_any(obj, ['bedrooms', 'beds', 'bedroomsMax', 'bedroomsMin'])
-                    if beds_val and not data.get('bedrooms'):
-                        try:
-                            data['bedrooms'] = str(int(float(beds_val)))
-                        except Exception:
-                            data['bedrooms'] = str(beds_val)
-                    # Baths
-                    baths_val = deep_get_any(obj, ['bathrooms', 'baths', 'numberOfBathroomsTotal', 'bathroomsMax', 'bathroomsMin'])
-                    if baths_val and not data.get('bathrooms'):
-                        data['bathrooms'] = str(baths_val)
-                    # Sqft
-                    sqft_val = deep_get_any(obj, ['livingArea', 'livingAreaValue', 'sqft', 'homeSize', 'area', 'universalsize'])
-                    if sqft_val and not data.get('square_feet'):
-                        data['square_feet'] = str(sqft_val)
-                    # Address
-                    street = deep_get_any(obj, ['streetAddress', 'street'])
-                    city = deep_get_any(obj, ['city', 'addressLocality'])
-                    state = deep_get_any(obj, ['state', 'addressRegion'])
-                    zipcode = deep_get_any(obj, ['zipcode', 'postalCode', 'zip'])
-                    if not data.get('address') and (street or city or state or zipcode):
-                        parts = [street, city, state, zipcode]
-                        data['address'] = ' '.join([str(p) for p in parts if p])
+                    self._apply_next_data(_next_data_fields(next_script.string or next_script.text), data)
             except Exception:
                 pass
 
-            try:
-                full_text = soup.get_text(" ", strip=True)
-            except Exception:
-                full_text = ""
             if data.get('zestimate') and not data.get('price'):
                 # Extract numeric from zestimate like 'Zestimate: $354,200'
-                m = re.search(r"\$\s*([\d,]+)", str(data.get('zestimate')))
+                m = _PRICE_RE.search(str(data.get('zestimate')))
                 if m:
                     data['price'] = m.group(1)
-                else:
-                    # Fallback to any $number in page text
-                    m2 = re.search(r"\$\s*([\d,]+)", full_text)
-                    if m2:
-                        data['price'] = m2.group(1)
-            if not data.get('bedrooms'):
-                m = re.search(r"(\d+)\s*bd\b", full_text, re.IGNORECASE)
-                if m:
-                    data['bedrooms'] = m.group(1)
-            if not data.get('bathrooms'):
-                m = re.search(r"(\d+\.?\d*)\s*ba\b", full_text, re.IGNORECASE)
-                if m:
-                    data['bathrooms'] = m.group(1)
-            if not data.get('square_feet'):
-                m = re.search(r"([\d,]+)\s*sq\s*ft\b", full_text, re.IGNORECASE)
-                if m:
-                    data['square_feet'] = m.group(1)
+
+            # Page-text fallbacks: one combined finditer pass fills whichever
+            # fields are still missing, breaking early once all are found.
+            # Price only falls back to page text when a zestimate was shown
+            # (same behavior as the old per-field searches).
+            want_price = bool(data.get('zestimate')) and not data.get('price')
+            want_beds = not data.get('bedrooms')
+            want_baths = not data.get('bathrooms')
+            want_sqft = not data.get('square_feet')
+            if want_price or want_beds or want_baths or want_sqft:
+                try:
+                    full_text = soup.get_text(" ", strip=True)
+                except Exception:
+                    full_text = ""
+                for m in _FIELDS_RE.finditer(full_text):
+                    kind = m.lastgroup
+                    if kind == 'price' and want_price:
+                        data['price'] = m.group('price')
+                        want_price = False
+                    elif kind == 'beds' and want_beds:
+                        data['bedrooms'] = m.group('beds')
+                        want_beds = False
+                    elif kind == 'baths' and want_baths:
+                        data['bathrooms'] = m.group('baths')
+                        want_baths = False
+                    elif kind == 'sqft' and want_sqft:
+                        data['square_feet'] = m.group('sqft')
+                        want_sqft = False
+                    if not (want_price or want_beds or want_baths or want_sqft):
+                        break
             return data
         
         except Exception as e:
@@ -480,9 +742,11 @@ class ZillowScraper(BaseScraper):
         """Parse price history from Zillow"""
         history = []
         try:
-            rows = price_history_section.find_all('tr')
+            # CSS selects run in soupsieve's compiled matcher instead of a
+            # Python-level recursive find_all walk per row
+            rows = price_history_section.select('tr')
             for row in rows[1:]:  # Skip header
-                cols = row.find_all('td')
+                cols = row.select('td')
                 if len(cols) >= 3:
                     history.append({
                         'date': cols[0].text.strip(),
@@ -513,11 +777,11 @@ class ZillowScraper(BaseScraper):
     
     def _empty_property_data(self) -> Dict[str, Any]:
         """Return empty property data structure"""
-        return self.normalize_property_data({
-            'source': 'Zillow',
-            'address': None,
-            'price': None,
-            'bedrooms': None,
-            'bathrooms': None,
-            'square_feet': None
-        })
+        # Shallow copy with fresh containers so callers can't mutate the
+        # shared template through the nested values
+        data = dict(self._empty_template)
+        data['amenities'] = []
+        data['price_history'] = []
+        data['comparable_properties'] = []
+        data['raw_data'] = dict(self._empty_template['raw_data'])
+        return data
@@ -31,7 +31,10 @@ logger = logging.getLogger(__name__)
 # DATA STRUCTURES
 # ============================================================================
 
-@dataclass
+# slots=True drops the per-instance __dict__ (~300B each), which adds up
+# when thousands of rows are extracted for training; not frozen because
+# callers (and tests) adjust sale_price in place
+@dataclass(slots=True)
 class PropertyFeatures:
     """Property features for regression model"""
     property_id: str
@@ -122,6 +125,99 @@ class ComparisonResult:
     recommendation: str
 
 
+# ============================================================================
+# FEATURE DERIVATION
+# ============================================================================
+
+def derive_property_features(property_id: str, extracted_data: Dict,
+                             measurements: Dict) -> PropertyFeatures:
+    """
+    Derive PropertyFeatures from a property's extracted data and measurements
+
+    Called at measurement-ingest time to precompute the features persisted in
+    properties.derived_features, and by the analytics read path as a fallback
+    for rows written before that column existed.
+
+    Args:
+        property_id: Property UUID
+        extracted_data: properties.extracted_data payload
+        measurements: floor_plan_measurements row / payload
+
+    Returns:
+        PropertyFeatures object
+    """
+    extracted_data = extracted_data or {}
+    measurements = measurements or {}
+    rooms = measurements.get('rooms', []) or []
+    detected_features = measurements.get('detected_features', {}) or {}
+
+    # Room statistics: count, sum, max, and min in a single traversal
+    room_count = 0
+    room_sqft_total = 0.0
+    largest_room_sqft = 0
+    smallest_room_sqft = 0
+    for r in rooms:
+        if not isinstance(r, dict):
+            continue
+        sqft = r.get('sqft')
+        if not sqft:
+            continue
+        room_count += 1
+        room_sqft_total += sqft
+        if sqft > largest_room_sqft:
+            largest_room_sqft = sqft
+        if smallest_room_sqft == 0 or sqft < smallest_room_sqft:
+            smallest_room_sqft = sqft
+    avg_room_sqft = room_sqft_total / room_count if room_count > 0 else 0.0
+
+    # Amenities
+    totals = detected_features.get('totals', {}) if isinstance(detected_features, dict) else {}
+    num_doors = totals.get('doors', 0)
+    num_windows = totals.get('windows', 0)
+    closets = totals.get('closets', 0)
+
+    # Check for specific amenities in one pass, bailing out early
+    room_list = extracted_data.get('rooms', []) or []
+    has_garage = has_fireplace = has_balcony = False
+    for r in room_list:
+        if not isinstance(r, dict):
+            continue
+        if not has_garage and 'garage' in str(r.get('type', '')).lower():
+            has_garage = True
+        if not (has_fireplace and has_balcony):
+            # Lower each feature once and test set membership instead of
+            # substring-scanning the repr of the whole list per amenity
+            feats = r.get('features') or []
+            if not isinstance(feats, (list, tuple)):
+                feats = [feats]
+            feats_lower = {str(x).lower() for x in feats}
+            if not has_fireplace and 'fireplace' in feats_lower:
+                has_fireplace = True
+            if not has_balcony and 'balcony' in feats_lower:
+                has_balcony = True
+        if has_garage and has_fireplace and has_balcony:
+            break
+
+    return PropertyFeatures(
+        property_id=property_id,
+        bedrooms=extracted_data.get('bedrooms', 0),
+        bathrooms=extracted_data.get('bathrooms', 0.0),
+        total_sqft=measurements.get('total_square_feet', 0),
+        room_count=room_count,
+        avg_room_sqft=avg_room_sqft,
+        largest_room_sqft=largest_room_sqft,
+        smallest_room_sqft=smallest_room_sqft,
+        has_garage=1 if has_garage else 0,
+        has_fireplace=1 if has_fireplace else 0,
+        has_balcony=1 if has_balcony else 0,
+        has_closets=1 if closets > 0 else 0,
+        num_doors=num_doors,
+        num_windows=num_windows,
+        quality_score=measurements.get('quality_score', 0),
+        confidence=measurements.get('total_square_feet_confidence', 0.0) or 0.0
+    )
+
+
 # ============================================================================
 # REGRESSION MODEL SERVICE
 # ============================================================================
@@ -131,7 +227,24 @@ class PropertyRegressionModel:
     Statistical regression model for property valuation
     Builds models based on room dimensions, amenities, and location
     """
-    
+
+    # Column order of the training matrix; shared by the object path and
+    # the matrix path so coefficients always line up
+    FEATURE_NAMES = [
+        'total_sqft',
+        'bedrooms',
+        'bathrooms',
+        'room_count',
+        'avg_room_sqft',
+        'largest_room_sqft',
+        'has_garage',
+        'has_fireplace',
+        'has_balcony',
+        'has_closets',
+        'num_doors',
+        'num_windows'
+    ]
+
     def __init__(self, db_client=None):
         """
         Initialize regression model service
@@ -150,7 +263,10 @@ class PropertyRegressionModel:
         self.trained_model = None
         self.trained_model_type = None
         self.feature_names = []
-        
+
+        # Memoized derived value; recomputed only after (re)training
+        self._sqft_impact_cache = None
+
         logger.info("PropertyRegressionModel initialized")
     
     # ========================================================================
@@ -378,98 +494,118 @@ class PropertyRegressionModel:
         
         # Prepare feature matrix
         X, y, feature_names = self._prepare_feature_matrix(data_with_prices)
-        
+
+        results = self._fit_matrix(X, y, feature_names, model_type)
+
+        # Generate predictions for all properties
+        for prop in data_with_prices:
+            try:
+                pred_price = self.predict_price(prop)
+                if pred_price:
+                    results.predictions[prop.property_id] = pred_price
+            except:
+                pass
+
+        return results
+
+    def build_from_matrix(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        model_type: str = 'ridge',
+        feature_names: Optional[List[str]] = None
+    ) -> Optional[RegressionResults]:
+        """
+        Train directly from a prepared feature matrix
+
+        Structure-of-arrays entry point for callers that already hold
+        training data as contiguous float64 arrays (bulk fixtures,
+        notebook experiments) — skips the per-object attribute walk.
+        Columns must follow FEATURE_NAMES order unless feature_names is
+        given. Per-property predictions stay empty since no
+        PropertyFeatures objects are involved.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if len(X) < 3:
+            logger.warning(f"Insufficient rows for training: {len(X)}, need at least 3")
+            return None
+        return self._fit_matrix(X, y, feature_names or list(self.FEATURE_NAMES), model_type)
+
+    def _fit_matrix(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        feature_names: List[str],
+        model_type: str
+    ) -> RegressionResults:
+        """Split, scale, fit, and score a prepared matrix"""
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=0.2, random_state=42
         )
-        
+
         # Scale features
         X_train_scaled = self.scaler.fit_transform(X_train)
         X_test_scaled = self.scaler.transform(X_test)
-        
+
         # Train model
         model = self.models[model_type]
         model.fit(X_train_scaled, y_train)
-        
+
         # Make predictions
         y_pred = model.predict(X_test_scaled)
-        
+
         # Calculate metrics
         r2 = r2_score(y_test, y_pred)
         mae = mean_absolute_error(y_test, y_pred)
         rmse = np.sqrt(mean_squared_error(y_test, y_pred))
-        
+
         # Cross-validation scores
         cv_scores = cross_val_score(model, X_train_scaled, y_train, cv=min(5, len(X_train)), scoring='r2')
-        
+
         # Feature importance
         feature_importance = self._get_feature_importance(model, feature_names)
-        
+
         # Coefficients (for linear models)
         coefficients = {}
         if hasattr(model, 'coef_'):
             coefficients = dict(zip(feature_names, model.coef_))
-        
+
         intercept = model.intercept_ if hasattr(model, 'intercept_') else 0.0
-        
-        # Store trained model
+
+        # Store trained model (and drop any impact memoized from a prior fit)
         self.trained_model = model
         self.trained_model_type = model_type
         self.feature_names = feature_names
-        
+        self._sqft_impact_cache = None
+
         logger.info(f"Model trained: R²={r2:.3f}, MAE=${mae:,.0f}, RMSE=${rmse:,.0f}")
-        
-        # Generate predictions for all properties
-        predictions = {}
-        for prop in data_with_prices:
-            try:
-                pred_price = self.predict_price(prop)
-                if pred_price:
-                    predictions[prop.property_id] = pred_price
-            except:
-                pass
-        
-        results = RegressionResults(
+
+        return RegressionResults(
             model_type=model_type,
             r2_score=r2,
             mae=mae,
             rmse=rmse,
             cross_val_scores=cv_scores.tolist(),
             feature_importance=feature_importance,
-            predictions=predictions,
+            predictions={},
             coefficients=coefficients,
             intercept=intercept
         )
-        
-        return results
     
     def _prepare_feature_matrix(
         self,
         features_list: List[PropertyFeatures]
     ) -> Tuple[np.ndarray, np.ndarray, List[str]]:
-        """Prepare feature matrix X and target vector y"""
-        
-        feature_names = [
-            'total_sqft',
-            'bedrooms',
-            'bathrooms',
-            'room_count',
-            'avg_room_sqft',
-            'largest_room_sqft',
-            'has_garage',
-            'has_fireplace',
-            'has_balcony',
-            'has_closets',
-            'num_doors',
-            'num_windows'
-        ]
-        
-        X = []
-        y = []
-        
-        for prop in features_list:
-            features = [
+        """Prepare feature matrix X and target vector y
+
+        Builds contiguous float64 arrays in one pass so downstream
+        scaling/fitting runs vectorized instead of boxing per-attribute
+        Python objects row by row.
+        """
+        X = np.array([
+            [
                 prop.total_sqft,
                 prop.bedrooms,
                 prop.bathrooms,
@@ -483,10 +619,11 @@ class PropertyRegressionModel:
                 prop.num_doors,
                 prop.num_windows
             ]
-            X.append(features)
-            y.append(prop.sale_price)
-        
-        return np.array(X), np.array(y), feature_names
+            for prop in features_list
+        ], dtype=np.float64)
+        y = np.array([prop.sale_price for prop in features_list], dtype=np.float64)
+
+        return X, y, list(self.FEATURE_NAMES)
     
     def _get_feature_importance(
         self,
@@ -570,7 +707,11 @@ class PropertyRegressionModel:
         """
         if not self.trained_model or 'total_sqft' not in self.feature_names:
             return None
-        
+
+        # Derived from immutable fitted state, so compute once per fit
+        if self._sqft_impact_cache is not None:
+            return self._sqft_impact_cache
+
         try:
             if hasattr(self.trained_model, 'coef_'):
                 sqft_idx = self.feature_names.index('total_sqft')
@@ -582,6 +723,7 @@ class PropertyRegressionModel:
                 price_per_sqft = sqft_coefficient / scaler_std
                 
                 logger.info(f"Each additional sqft adds ${price_per_sqft:.2f} to property value")
+                self._sqft_impact_cache = price_per_sqft
                 return price_per_sqft
             
             return None
@@ -4,21 +4,154 @@ Handles asynchronous floor plan analysis and enrichment
 """
 
 from app import celery
-from app.utils.supabase_client import get_admin_db
+from app.utils.supabase_client import get_admin_db, FLOOR_PLAN_BUCKET
 from app.agents.floor_plan_analyst import FloorPlanAnalyst
+from app.agents.listing_copywriter import ListingCopywriter
+from app.agents.market_insights_analyst import MarketInsightsAnalyst
 import requests
 from app.clients.attom_client import AttomAPIClient
+from app.scrapers.multi_source_scraper import MultiSourceScraper
 from app.utils.geocoding import normalize_address, NYC_BOROUGHS
+from app.utils.lookup_cache import (
+    ADDRESS_TTL_SEC, MARKET_TTL_SEC, get_or_set, lookup_cache_key
+)
 import re
 import os
 import asyncio
+import random
+import threading
+
+import orjson
+from celery.signals import worker_process_init
+from celery.utils.log import get_task_logger
+
+# Task logger: records pick up the task name/id from Celery's formatter,
+# and nothing routes through the worker's stdout redirection
+logger = get_task_logger(__name__)
+
+@worker_process_init.connect
+def _warm_admin_db(**_):
+    """Build the memoized Supabase admin client at worker start
+
+    The client (and its pooled httpx transport) is a per-process
+    singleton; constructing it here means the first task of each prefork
+    child skips the client setup and TLS handshake.
+    """
+    try:
+        get_admin_db()
+    except Exception as e:
+        # Missing env etc. — the first task will surface the real error
+        logger.warning("Supabase client warmup skipped: %s", e)
+
+
+# Per-worker event loop in a daemon thread. Building and tearing down a
+# loop per task threw away the scrapers' per-loop shared ScrapingBee
+# client (and its keep-alive pool) between tasks; a persistent loop keeps
+# those connections warm and skips the selector/thread-state setup cost.
+# Created lazily so each prefork worker process gets its own after fork.
+_worker_loop: asyncio.AbstractEventLoop = None
+_worker_loop_lock = threading.Lock()
+
+
+def _get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Return this worker's persistent event loop, starting it on first use"""
+    global _worker_loop
+    with _worker_loop_lock:
+        if _worker_loop is None or _worker_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name='task-async-loop', daemon=True
+            ).start()
+            _worker_loop = loop
+    return _worker_loop
+
+
+def _run_async(coro):
+    """Run a coroutine on the worker loop from synchronous task code"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_worker_loop()).result()
+
+
+# Table-driven projection of the ATTOM detail record into the persisted
+# parcel summary. Fields needing a fallback (apn/fips from prop_core,
+# county_use, geo) are filled in after the map is applied.
+_PARCEL_FIELD_MAP = (
+    ('apn', ('identifier', 'apn')),
+    ('fips', ('identifier', 'fips')),
+    ('lot_number', ('lot', 'lotnum')),
+    ('lot_depth', ('lot', 'depth')),
+    ('lot_frontage', ('lot', 'frontage')),
+    ('lot_size_acres', ('lot', 'lotsize1')),
+    ('lot_size_sqft', ('lot', 'lotsize2')),
+    ('zoning', ('area', 'zoning')),
+    ('muncode', ('area', 'muncode')),
+)
+
+
+def _dig(d, path):
+    """Walk a tuple path through nested dicts; None on any missing hop"""
+    for key in path:
+        if not isinstance(d, dict):
+            return None
+        d = d.get(key)
+    return d
+
+
+def _retry_countdown(retries: int) -> float:
+    """Capped exponential backoff with jitter
+
+    Pure 2**n delays synchronize retries from tasks that failed together
+    against the same flapping downstream (ATTOM, Gemini); the jitter
+    spreads the re-storm out.
+    """
+    return min(60, 2 ** retries) + random.uniform(0, 2 ** min(retries, 5))
+
+
+def _is_auth_error(exc) -> bool:
+    """True for HTTP 401 — a credential problem that retrying cannot fix"""
+    response = getattr(exc, 'response', None)
+    return getattr(response, 'status_code', None) == 401
+
+
+def _jsonb_arg(patch):
+    """Pre-encode a jsonb RPC argument with orjson
+
+    Post-enrichment patches run to 100-300KB of nested JSON. Encoding them
+    here and shipping the text (PostgREST casts it back to jsonb against
+    the function signature) keeps the heavy dict walk in orjson instead of
+    the stdlib encoder inside httpx, which matters under GIL contention
+    when several worker threads serialize at once.
+    """
+    return orjson.dumps(patch).decode()
+
+
+async def _scrape_multi_source(street, city, state, zip_code, borough, neighborhood):
+    """Run the Zillow/Redfin/StreetEasy scrape and return the aggregate
+
+    The loop-scoped shared ScrapingBee client survives this context
+    manager, so later scrapes reuse its warm pool.
+    """
+    async with MultiSourceScraper() as ms:
+        return await ms.scrape_property(
+            street, city, state,
+            zip_code=zip_code, borough=borough, neighborhood=neighborhood
+        )
+
+
+# Strips unit/suite designators when preparing addresses for ATTOM
+# matching; compiled once so hot task paths skip the re-cache lookup
+_UNIT_STRIP_RE = re.compile(r"\s+(apt|unit|ste|suite|bldg|fl|floor|#)\b.*$", re.IGNORECASE)
 
 
 @celery.task(name='process_floor_plan', bind=True, max_retries=3)
 def process_floor_plan_task(self, property_id: str):
+    """Standalone task wrapper around the floor-plan analysis stage"""
+    return _process_floor_plan(self, property_id)
+
+
+def _process_floor_plan(task, property_id: str):
     """
-    Asynchronous task to analyze a floor plan image
-    
+    Analyze a floor plan image
+
     Steps:
     1. Fetch property from database
     2. Download floor plan image from Supabase Storage
@@ -33,50 +166,50 @@ def process_floor_plan_task(self, property_id: str):
         dict: Processing result with status and data
     """
     try:
-        print(f"Starting floor plan analysis for property {property_id}")
+        logger.info("Starting floor plan analysis for property %s", property_id)
         
         # Get database client
         db = get_admin_db()
         
-        # Fetch property
-        result = db.table('properties').select('*').eq('id', property_id).execute()
-        
+        # Fetch only the fields this task reads - the full row carries the
+        # market_insights/listing JSON blobs and can run to 100s of KB
+        result = db.table('properties').select(
+            'id,image_url,image_storage_path,extracted_data'
+        ).eq('id', property_id).execute()
+
         if not result.data:
             raise ValueError(f"Property {property_id} not found")
-        
+
         property_record = result.data[0]
-        
+
         # Check if image exists
         if not property_record.get('image_url'):
             raise ValueError(f"Property {property_id} has no floor plan image")
         
-        # Update status to indicate processing has started
-        try:
-            db.table('properties').update({
-                'status': 'processing'
-            }).eq('id', property_id).execute()
-        except Exception:
-            pass
-        
+        # No intermediate 'processing' status write: every PostgREST call
+        # is a full HTTPS round-trip, and the terminal update below lands
+        # the status change together with the extracted data
+
         # Download floor plan image from Storage
         image_path = property_record['image_storage_path']
-        print(f"Downloading floor plan from storage: {image_path}")
+        logger.info("Downloading floor plan from storage: %s", image_path)
         
         # Use Supabase client to download from private bucket
-        from app.utils.supabase_client import FLOOR_PLAN_BUCKET
         storage = db.storage
-        image_bytes = storage.from_(FLOOR_PLAN_BUCKET).download(image_path)
-        
-        print(f"Downloaded {len(image_bytes)} bytes")
-        
+
         # Initialize Floor Plan Analyst
         analyst = FloorPlanAnalyst()
+
+        # Analyze floor plan. The download is handed straight to the
+        # analyst without a task-level reference so the analyst can drop
+        # the raw buffer once OCR and base64 encoding have consumed it,
+        # instead of the worker pinning the full image through the call.
+        logger.info("Analyzing floor plan with AI Agent #1...")
+        extracted_data = analyst.analyze_floor_plan(
+            image_bytes=storage.from_(FLOOR_PLAN_BUCKET).download(image_path)
+        )
         
-        # Analyze floor plan
-        print(f"Analyzing floor plan with AI Agent #1...")
-        extracted_data = analyst.analyze_floor_plan(image_bytes=image_bytes)
-        
-        print(f"Extracted data: {extracted_data}")
+        logger.debug("Extracted data: %s", extracted_data)
         
         # Merge with existing extracted_data, preserving non-empty values from form
         current_data = property_record.get('extracted_data', {})
@@ -85,15 +218,24 @@ def process_floor_plan_task(self, property_id: str):
         if 'address' in current_data and current_data['address'] and not extracted_data.get('address'):
             extracted_data['address'] = current_data['address']
         
-        merged_data = {**current_data, **extracted_data}
-        
-        # Update property with extracted data
-        db.table('properties').update({
-            'extracted_data': merged_data,
-            'status': 'parsing_complete'
-        }).eq('id', property_id).execute()
+        # Server-side JSONB merge ships only the analyst's patch instead of
+        # round-tripping the merged blob; fall back to a classic full-row
+        # update where the migration 007 function is not deployed yet
+        try:
+            db.rpc('merge_extracted_data', {
+                'p_property_id': property_id,
+                'p_patch': _jsonb_arg(extracted_data),
+                'p_status': 'parsing_complete'
+            }).execute()
+        except Exception as rpc_error:
+            logger.warning("merge_extracted_data RPC unavailable (%s); using full update", rpc_error)
+            merged_data = {**current_data, **extracted_data}
+            db.table('properties').update({
+                'extracted_data': merged_data,
+                'status': 'parsing_complete'
+            }).eq('id', property_id).execute()
         
-        print(f"Floor plan analysis complete for property {property_id}")
+        logger.info("Floor plan analysis complete for property %s", property_id)
         
         return {
             'status': 'success',
@@ -102,7 +244,7 @@ def process_floor_plan_task(self, property_id: str):
         }
         
     except Exception as e:
-        print(f"Error processing floor plan for property {property_id}: {str(e)}")
+        logger.error("Error processing floor plan for property %s: %s", property_id, e)
         
         # Update property status to failed
         try:
@@ -111,21 +253,29 @@ def process_floor_plan_task(self, property_id: str):
                 'status': 'failed',
                 'extracted_data': {
                     'error': str(e),
-                    'task_id': self.request.id
+                    'task_id': task.request.id
                 }
             }).eq('id', property_id).execute()
         except Exception as update_error:
-            print(f"Failed to update error status: {update_error}")
+            logger.error("Failed to update error status: %s", update_error)
         
-        # Retry with exponential backoff
-        raise self.retry(exc=e, countdown=2 ** self.request.retries)
+        # Retry with jittered exponential backoff; auth failures are
+        # permanent until the credential is fixed, so fail fast instead
+        if _is_auth_error(e):
+            raise
+        raise task.retry(exc=e, countdown=_retry_countdown(task.request.retries))
 
 
 @celery.task(name='enrich_property_data', bind=True, max_retries=3)
 def enrich_property_data_task(self, property_id: str):
+    """Standalone task wrapper around the market-enrichment stage"""
+    return _enrich_property_data(self, property_id)
+
+
+def _enrich_property_data(task, property_id: str):
     """
-    Asynchronous task to enrich property with market insights
-    
+    Enrich property with market insights
+
     Uses AI Agent #2 (Market Insights Analyst) to:
     1. Fetch property data from database
     2. Query ATTOM API for property details, comparables, AVM, and trends
@@ -137,31 +287,37 @@ def enrich_property_data_task(self, property_id: str):
     Args:
         property_id: UUID of the property to enrich
     """
+    # Bound before the try so the error handler can reuse the already
+    # fetched record instead of re-selecting it mid-failure
+    property_record = None
     try:
-        print(f"Enriching property data for {property_id}")
+        logger.info("Enriching property data for %s", property_id)
         
         # Get database client
         db = get_admin_db()
         
-        # Fetch property
-        result = db.table('properties').select('*').eq('id', property_id).execute()
-        
+        # Targeted select: enrichment only reads extracted_data
+        result = db.table('properties').select('id,extracted_data').eq('id', property_id).execute()
+
         if not result.data:
             raise ValueError(f"Property {property_id} not found")
-        
+
         property_record = result.data[0]
-        
+
         # Get extracted data from Agent #1
         extracted_data = property_record.get('extracted_data', {})
+
+        # Shallow snapshot of the entry state: the terminal update sends
+        # only the keys this task changed, not the whole (growing) blob
+        baseline_extracted = dict(extracted_data or {})
         address = extracted_data.get('address', '')
         
         if not address:
             raise ValueError(f"Property {property_id} has no address for market analysis")
         
-        # Update status to indicate enrichment has started (use allowed status)
-        db.table('properties').update({
-            'status': 'processing'
-        }).eq('id', property_id).execute()
+        # Status and data changes accumulate in memory and land in one
+        # terminal update — the old per-step writes each cost a PostgREST
+        # HTTPS round-trip
 
         attom_bundle = {}
         try:
@@ -176,31 +332,68 @@ def enrich_property_data_task(self, property_id: str):
             city_for_attom = city_norm
             if borough_norm:
                 city_for_attom = borough_norm
-            print(f"[ATTOM] Normalized address => street='{street}', city='{city_norm}', borough='{borough_norm}', state='{state_norm}', zip='{zip_norm}'")
+            logger.debug("[ATTOM] Normalized address => street=%r, city=%r, borough=%r, state=%r, zip=%r", street, city_norm, borough_norm, state_norm, zip_norm)
 
-            # Use structured search when possible; fallback to unstructured
+            # Kick the multi-source scrape off now when normalization already
+            # pins down city/state - it shares no data with the ATTOM chain,
+            # so the two overlap for max() rather than sum() of their wall
+            # times. Addresses that need ATTOM's resolved city/state fall
+            # back to scraping after the bundle (see below).
+            ms_future = None
+            scrape_city = city_norm or borough_norm
+            if scrape_city and state_norm:
+                ms_future = asyncio.run_coroutine_threadsafe(
+                    _scrape_multi_source(
+                        street, scrape_city, state_norm, zip_norm,
+                        borough_norm, norm.get('neighborhood')
+                    ),
+                    _get_worker_loop()
+                )
+
+            # Use the bundled allevents profile when possible (one round trip
+            # for property + AVM + sales history); fallback to unstructured search
+            avm = None
+            bundled_sales_history = []
             try:
                 # Strip unit/suite designators from street for ATTOM matching
-                street_clean = re.sub(r"\s+(apt|unit|ste|suite|bldg|fl|floor|#)\b.*$", "", street, flags=re.IGNORECASE).strip()
+                street_clean = _UNIT_STRIP_RE.sub("", street).strip()
+                profile_key = lookup_cache_key(
+                    'attom_profile', street_clean, city_for_attom, state_norm, zip_norm
+                )
                 if city_for_attom and state_norm:
-                    prop_core = client.search_property(street_clean, city=city_for_attom, state=state_norm, zip_code=zip_norm)
+                    profile = get_or_set(
+                        profile_key,
+                        lambda: client.get_full_profile(street_clean, city=city_for_attom, state=state_norm, zip_code=zip_norm),
+                        ttl=ADDRESS_TTL_SEC
+                    )
                 else:
-                    prop_core = client.search_property(street_clean)
+                    profile = get_or_set(
+                        profile_key,
+                        lambda: client.get_full_profile(street_clean),
+                        ttl=ADDRESS_TTL_SEC
+                    )
+                prop_core = profile.get('property')
+                avm = profile.get('avm')
+                bundled_sales_history = profile.get('sales_history') or []
             except Exception as e:
-                print(f"[ATTOM] Structured search failed ({e}); retrying with raw address string")
+                logger.warning("[ATTOM] Bundled profile lookup failed (%s); retrying with raw address string", e)
                 prop_core = None
                 try:
-                    address_clean = re.sub(r"\s+(apt|unit|ste|suite|bldg|fl|floor|#)\b.*$", "", address, flags=re.IGNORECASE).strip()
-                    prop_core = client.search_property(address_clean)
+                    address_clean = _UNIT_STRIP_RE.sub("", address).strip()
+                    prop_core = get_or_set(
+                        lookup_cache_key('attom_search', address_clean),
+                        lambda: client.search_property(address_clean),
+                        ttl=ADDRESS_TTL_SEC
+                    )
                 except Exception as e2:
-                    print(f"[ATTOM] Raw address search failed: {e2}")
+                    logger.warning("[ATTOM] Raw address search failed: %s", e2)
                     prop_core = None
 
             # Fallback: proximity search by lat/lng if no property found
             if not prop_core or not prop_core.get('attom_id'):
                 lat, lng = norm.get('lat'), norm.get('lng')
                 if lat and lng:
-                    print("[ATTOM] Attempting proximity fallback via expandedprofile (lat/lng)")
+                    logger.info("[ATTOM] Attempting proximity fallback via expandedprofile (lat/lng)")
                     nearby = client.get_nearby_properties_by_latlng(lat, lng, radius_miles=0.2, max_results=10)
                     # Prefer a candidate with matching ZIP, else take the closest
                     candidate = None
@@ -213,179 +406,173 @@ def enrich_property_data_task(self, property_id: str):
                         candidate = candidate or (nearby[0] if nearby else None)
                     if candidate:
                         prop_core = candidate
-                        print(f"[ATTOM] Proximity fallback matched: attom_id={prop_core.get('attom_id')} line1='{prop_core.get('address')}' zip='{prop_core.get('zip')}'")
+                        logger.info("[ATTOM] Proximity fallback matched: attom_id=%s line1=%r zip=%r", prop_core.get('attom_id'), prop_core.get('address'), prop_core.get('zip'))
                     else:
-                        print("[ATTOM] Proximity fallback found no candidates")
+                        logger.info("[ATTOM] Proximity fallback found no candidates")
 
             attom_id = prop_core.get('attom_id')
-            details = None
-            if attom_id:
-                details = client.get_property_details(attom_id)
-            avm = None
-            try:
-                city = city_for_attom or prop_core.get('city')
-                state = state_norm or prop_core.get('state')
-                zip_code = zip_norm or prop_core.get('zip')
-                if city and state:
-                    avm_street = street_clean if 'street_clean' in locals() else (street or prop_core.get('address') or address)
-                    avm = client.get_avm(avm_street, city, state, zip_code=zip_code)
-            except Exception:
-                avm = None
-            area_stats = None
-            try:
-                zip_for_area = prop_core.get('zip') or zip_norm
-                if zip_for_area:
-                    area_stats = client.get_area_stats(zip_for_area)
-            except Exception:
-                area_stats = None
-            # Comparables (deterministic) – fetch even if LLM omits
-            comps = None
-            try:
-                city_for_comps = city_for_attom or prop_core.get('city')
-                state_for_comps = state_norm or prop_core.get('state')
-                if city_for_comps and state_for_comps:
-                    comps_address = street_clean if 'street_clean' in locals() else (street or prop_core.get('address') or address)
-                    comps = client.get_comparables(comps_address, city_for_comps, state_for_comps, radius_miles=0.5, max_results=10)
-            except Exception:
-                comps = None
-            # ATTOM sales trends
-            # Prefer v4 via geoIdv4; resolve geoIdv4 from city/county when not explicitly provided
-            sales_trends_v4 = None
-            sales_trends_zip = None
-            geoid_v4 = os.getenv('ATTOM_GEOID_V4')
-            # Compute ZIP early so we can fallback even if v4 is configured
-            zip_for_trends = prop_core.get('zip') or zip_norm
-            # Resolve a regional geoIdV4 when not explicitly configured
-            city_for_geo = city_for_attom or prop_core.get('city')
-            state_for_geo = state_norm or prop_core.get('state')
-            county_for_geo = (prop_core or {}).get('county')
-            resolved_geo_v4 = None
-            # Prefer per-area resolution; if none found, use env override
-            if not resolved_geo_v4:
+
+            # After attom_id resolution the remaining lookups (details, AVM,
+            # area stats, comparables, sales trends) are independent and
+            # I/O-bound, so they run concurrently in worker threads: the
+            # ATTOM section costs roughly max-of-latencies instead of
+            # sum-of-latencies. The client's inter-request throttle still
+            # spaces the request starts, so the quota profile is unchanged.
+            street_for_lookups = street_clean if 'street_clean' in locals() else (street or prop_core.get('address') or address)
+
+            def _fetch_details():
+                return client.get_property_details(attom_id) if attom_id else None
+
+            def _fetch_avm():
                 try:
-                    resolved_geo_v4 = client.find_geo_id_v4_for_area(city_for_geo, state_for_geo, county_for_geo)
+                    city = city_for_attom or prop_core.get('city')
+                    state = state_norm or prop_core.get('state')
+                    zip_code = zip_norm or prop_core.get('zip')
+                    if avm is None and city and state:
+                        return client.get_avm(street_for_lookups, city, state, zip_code=zip_code)
                 except Exception:
-                    resolved_geo_v4 = None
-            if not resolved_geo_v4 and geoid_v4:
-                resolved_geo_v4 = geoid_v4
-            if resolved_geo_v4:
-                v4_has_trends = False
+                    return None
+                return avm
+
+            def _fetch_area_stats():
+                try:
+                    zip_for_area = prop_core.get('zip') or zip_norm
+                    if zip_for_area:
+                        return get_or_set(
+                            lookup_cache_key('attom_area', zip_for_area),
+                            lambda: client.get_area_stats(zip_for_area),
+                            ttl=MARKET_TTL_SEC
+                        )
+                except Exception:
+                    pass
+                return None
+
+            def _fetch_comps():
+                # Comparables (deterministic) – fetch even if LLM omits
                 try:
-                    sales_trends_v4 = client.get_sales_trends_v4(
-                        geo_id_v4=resolved_geo_v4,
-                        interval='monthly',
-                        property_type='all'
+                    city_for_comps = city_for_attom or prop_core.get('city')
+                    state_for_comps = state_norm or prop_core.get('state')
+                    if city_for_comps and state_for_comps:
+                        return client.get_comparables(street_for_lookups, city_for_comps, state_for_comps, radius_miles=0.5, max_results=10)
+                except Exception:
+                    pass
+                return None
+
+            def _fetch_trends():
+                # ATTOM sales trends: resolve a geoIdV4 (city, then the
+                # normalized-city retry, then env override), fetch v4 trends,
+                # and fall back county -> legacy ZIP when unusable. One chain
+                # replaces the two near-identical branches that used to
+                # diverge only on which city name seeded the resolution.
+                sales_trends_v4 = None
+                sales_trends_zip = None
+                zip_for_trends = prop_core.get('zip') or zip_norm
+                state_for_geo = state_norm or prop_core.get('state')
+                county_for_geo = (prop_core or {}).get('county')
+
+                def _has_trends(res):
+                    return bool(res) and bool(res.get('trends')) and isinstance(res.get('trends'), list)
+
+                def _resolve_geo(city):
+                    try:
+                        return get_or_set(
+                            lookup_cache_key('attom_geoid', city, state_for_geo, county_for_geo),
+                            lambda: client.find_geo_id_v4_for_area(city, state_for_geo, county_for_geo),
+                            ttl=ADDRESS_TTL_SEC
+                        )
+                    except Exception:
+                        return None
+
+                def _trends_for(geo_id):
+                    return get_or_set(
+                        lookup_cache_key('attom_trends_v4', geo_id),
+                        lambda: client.get_sales_trends_v4(
+                            geo_id_v4=geo_id, interval='monthly', property_type='all'
+                        ),
+                        ttl=MARKET_TTL_SEC
                     )
-                    v4_has_trends = bool(sales_trends_v4) and bool(sales_trends_v4.get('trends')) and isinstance(sales_trends_v4.get('trends'), list)
-                    print(f"[ATTOM] v4 SalesTrends fetched: {bool(sales_trends_v4)} (has_trends={v4_has_trends}) for geoIdv4={resolved_geo_v4}")
-                except Exception as e:
-                    print(f"[ATTOM] v4 salestrend error: {e}")
-                    sales_trends_v4 = None
-                    v4_has_trends = False
+
+                city_for_geo = city_for_attom or prop_core.get('city')
+                resolved_geo_v4 = _resolve_geo(city_for_geo)
+                if not resolved_geo_v4 and city_norm and city_norm != city_for_geo:
+                    resolved_geo_v4 = _resolve_geo(city_norm)
+                if not resolved_geo_v4:
+                    resolved_geo_v4 = os.getenv('ATTOM_GEOID_V4')
+
+                v4_has_trends = False
+                if resolved_geo_v4:
+                    try:
+                        sales_trends_v4 = _trends_for(resolved_geo_v4)
+                        v4_has_trends = _has_trends(sales_trends_v4)
+                        logger.debug("[ATTOM] v4 SalesTrends fetched: %s (has_trends=%s) for geoIdv4=%s", bool(sales_trends_v4), v4_has_trends, resolved_geo_v4)
+                    except Exception as e:
+                        logger.warning("[ATTOM] v4 salestrend error: %s", e)
+                        sales_trends_v4 = None
                 # Fallback to County if city-level v4 produced no usable trends
                 if not v4_has_trends and county_for_geo and state_for_geo:
                     try:
                         geos = client.lookup_geo_id_v4(f"{county_for_geo}, {state_for_geo}", geography_type_abbreviation='CO')
-                        if geos:
-                            alt_geo = geos[0].get('geoIdV4')
-                            if alt_geo:
-                                sales_trends_v4 = client.get_sales_trends_v4(
-                                    geo_id_v4=alt_geo,
-                                    interval='monthly', property_type='all'
-                                )
-                                v4_has_trends = bool(sales_trends_v4) and bool(sales_trends_v4.get('trends')) and isinstance(sales_trends_v4.get('trends'), list)
-                                print(f"[ATTOM] v4 County SalesTrends fetched: {bool(sales_trends_v4)} (has_trends={v4_has_trends}) for county={county_for_geo}")
+                        alt_geo = geos[0].get('geoIdV4') if geos else None
+                        if alt_geo:
+                            sales_trends_v4 = _trends_for(alt_geo)
+                            v4_has_trends = _has_trends(sales_trends_v4)
+                            logger.debug("[ATTOM] v4 County SalesTrends fetched: %s (has_trends=%s) for county=%s", bool(sales_trends_v4), v4_has_trends, county_for_geo)
                     except Exception as e:
-                        print(f"[ATTOM] v4 county salestrend error: {e}")
+                        logger.warning("[ATTOM] v4 county salestrend error: %s", e)
+                # Legacy ZIP fallback
                 if not v4_has_trends and zip_for_trends:
                     try:
-                        print(f"[ATTOM] v4 trends empty or unavailable; attempting legacy ZIP fallback for zip={zip_for_trends}")
                         sales_trends_zip = client.get_sales_trends(str(zip_for_trends), interval='monthly')
-                        print(f"[ATTOM] ZIP SalesTrends fetched (fallback): {bool(sales_trends_zip)} for zip={zip_for_trends}")
+                        logger.debug("[ATTOM] ZIP SalesTrends fetched: %s for zip=%s", bool(sales_trends_zip), zip_for_trends)
                     except Exception as e:
-                        print(f"[ATTOM] ZIP salestrend error (fallback): {e}")
-            else:
-                # Resolve geoIdV4 dynamically when no explicit v4 id configured
-                try:
-                    v4_has_trends = False
-                    city_for_geo = city_norm or prop_core.get('city')
-                    state_for_geo = state_norm or prop_core.get('state')
-                    county_for_geo = (prop_core or {}).get('county')
-                    resolved_geo_v4 = None
-                    try:
-                        resolved_geo_v4 = client.find_geo_id_v4_for_area(city_for_geo, state_for_geo, county_for_geo)
-                    except Exception:
-                        resolved_geo_v4 = None
-                    if resolved_geo_v4:
-                        sales_trends_v4 = client.get_sales_trends_v4(
-                            geo_id_v4=resolved_geo_v4,
-                            interval='monthly', property_type='all'
-                        )
-                        v4_has_trends = bool(sales_trends_v4) and bool(sales_trends_v4.get('trends')) and isinstance(sales_trends_v4.get('trends'), list)
-                        print(f"[ATTOM] v4 SalesTrends fetched: {bool(sales_trends_v4)} (has_trends={v4_has_trends}) for geoIdv4={resolved_geo_v4}")
-                    # County fallback
-                    if not v4_has_trends and county_for_geo and state_for_geo:
-                        try:
-                            geos = client.lookup_geo_id_v4(f"{county_for_geo}, {state_for_geo}", geography_type_abbreviation='CO')
-                            if geos:
-                                alt_geo = geos[0].get('geoIdV4')
-                                if alt_geo:
-                                    sales_trends_v4 = client.get_sales_trends_v4(
-                                        geo_id_v4=alt_geo,
-                                        interval='monthly', property_type='all'
-                                    )
-                                    v4_has_trends = bool(sales_trends_v4) and bool(sales_trends_v4.get('trends')) and isinstance(sales_trends_v4.get('trends'), list)
-                                    print(f"[ATTOM] v4 County SalesTrends fetched: {bool(sales_trends_v4)} (has_trends={v4_has_trends}) for county={county_for_geo}")
-                        except Exception as e:
-                            print(f"[ATTOM] v4 county salestrend error: {e}")
-                    # Legacy ZIP fallback
-                    if not v4_has_trends and zip_for_trends:
-                        try:
-                            sales_trends_zip = client.get_sales_trends(str(zip_for_trends), interval='monthly')
-                            print(f"[ATTOM] ZIP SalesTrends fetched: {bool(sales_trends_zip)} for zip={zip_for_trends}")
-                        except Exception as e:
-                            print(f"[ATTOM] ZIP salestrend error: {e}")
-                except Exception as e:
-                    print(f"[ATTOM] SalesTrends resolution error: {e}")
+                        logger.warning("[ATTOM] ZIP salestrend error: %s", e)
+                return sales_trends_v4, sales_trends_zip
+
+            async def _gather_lookups():
+                return await asyncio.gather(
+                    asyncio.to_thread(_fetch_details),
+                    asyncio.to_thread(_fetch_avm),
+                    asyncio.to_thread(_fetch_area_stats),
+                    asyncio.to_thread(_fetch_comps),
+                    asyncio.to_thread(_fetch_trends),
+                    return_exceptions=True,
+                )
+
+            lookups = _run_async(_gather_lookups())
+            details, avm, area_stats, comps, trends = [
+                None if isinstance(r, BaseException) else r for r in lookups
+            ]
+            sales_trends_v4, sales_trends_zip = trends if trends else (None, None)
             # Build parcel summary (non-geometry) from details when available
             parcel = None
             try:
                 if details:
-                    lot = (details or {}).get('lot', {}) or {}
-                    area = (details or {}).get('area', {}) or {}
-                    identifier = (details or {}).get('identifier', {}) or {}
-                    location = (details or {}).get('location', {}) or {}
-                    geo = (location.get('latitude'), location.get('longitude')) if location else (None, None)
-                    parcel = {
-                        'apn': identifier.get('apn') or prop_core.get('apn'),
-                        'fips': identifier.get('fips') or prop_core.get('fips'),
-                        'lot_number': lot.get('lotnum'),
-                        'lot_depth': lot.get('depth'),
-                        'lot_frontage': lot.get('frontage'),
-                        'lot_size_acres': lot.get('lotsize1'),
-                        'lot_size_sqft': lot.get('lotsize2'),
-                        'zoning': area.get('zoning'),
-                        'county_use': area.get('countyuse1') or area.get('countyuse2'),
-                        'muncode': area.get('muncode'),
-                        'geo': {
-                            'latitude': location.get('latitude'),
-                            'longitude': location.get('longitude')
-                        }
+                    parcel = {out: _dig(details, path) for out, path in _PARCEL_FIELD_MAP}
+                    parcel['apn'] = parcel['apn'] or prop_core.get('apn')
+                    parcel['fips'] = parcel['fips'] or prop_core.get('fips')
+                    parcel['county_use'] = (_dig(details, ('area', 'countyuse1'))
+                                            or _dig(details, ('area', 'countyuse2')))
+                    parcel['geo'] = {
+                        'latitude': _dig(details, ('location', 'latitude')),
+                        'longitude': _dig(details, ('location', 'longitude'))
                     }
             except Exception:
                 parcel = None
-            print(f"[ATTOM] Property found: {bool(prop_core)} attom_id={attom_id}")
-            print(f"[ATTOM] Details present: {bool(details)} | AVM present: {bool(avm)} | Area present: {bool(area_stats)}")
-            print(f"[ATTOM] SalesTrends v4 present: {bool(sales_trends_v4)} | ZIP present: {bool(sales_trends_zip)}")
+            logger.debug("[ATTOM] Property found: %s attom_id=%s", bool(prop_core), attom_id)
+            logger.debug("[ATTOM] Details present: %s | AVM present: %s | Area present: %s", bool(details), bool(avm), bool(area_stats))
+            logger.debug("[ATTOM] SalesTrends v4 present: %s | ZIP present: %s", bool(sales_trends_v4), bool(sales_trends_zip))
             attom_bundle = {
-                'property': prop_core,
+                # NormalizedProperty records must be converted before the
+                # bundle is persisted as JSON in extracted_data
+                'property': prop_core.to_dict() if prop_core else None,
                 'details': details,
                 'avm': avm,
                 'area_stats': area_stats,
                 'sales_trends_v4': sales_trends_v4,
                 'sales_trends': sales_trends_zip,
                 'parcel': parcel,
-                'comparables': comps
+                'comparables': [c.to_dict() for c in comps] if comps else comps,
+                'sales_history': bundled_sales_history
             }
             current_data = property_record.get('extracted_data', {}) or {}
             ed = current_data
@@ -406,48 +593,44 @@ def enrich_property_data_task(self, property_id: str):
                 ed['year_built'] = (prop_core or {}).get('year_built')
             ed['attom'] = attom_bundle
 
-            # Attempt Multi-Source web scraping (Zillow/Redfin/StreetEasy) and persist aggregated result
+            # Collect the Multi-Source web scraping result (Zillow/Redfin/
+            # StreetEasy) and persist the aggregate. Usually the scrape has
+            # been in flight since normalization; only addresses whose
+            # city/state came from ATTOM start it here.
             try:
-                from app.scrapers.multi_source_scraper import MultiSourceScraper
-                ms_result = None
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                async def run_ms():
-                    async with MultiSourceScraper() as ms:
-                        return await ms.scrape_property(
-                            street,
-                            city_norm or (prop_core or {}).get('city') or borough_norm or '',
-                            state_norm or (prop_core or {}).get('state') or '',
-                            zip_code=zip_norm or (prop_core or {}).get('zip'),
-                            borough=borough_norm or ((prop_core or {}).get('city') if (prop_core or {}).get('city') and str((prop_core or {}).get('city')).upper() in NYC_BOROUGHS else None),
-                            neighborhood=norm.get('neighborhood')
-                        )
-                ms_result = loop.run_until_complete(run_ms())
-                loop.close()
+                if ms_future is not None:
+                    ms_result = ms_future.result()
+                else:
+                    attom_city = (prop_core or {}).get('city')
+                    ms_result = _run_async(_scrape_multi_source(
+                        street,
+                        city_norm or attom_city or borough_norm or '',
+                        state_norm or (prop_core or {}).get('state') or '',
+                        zip_norm or (prop_core or {}).get('zip'),
+                        borough_norm or (attom_city if attom_city and str(attom_city).upper() in NYC_BOROUGHS else None),
+                        norm.get('neighborhood')
+                    ))
                 if ms_result:
                     ed['multi_source'] = ms_result
             except Exception as e:
-                print(f"[SCRAPE] MultiSource failed: {e}")
+                logger.warning("[SCRAPE] MultiSource failed: %s", e)
 
-            db.table('properties').update({
-                'extracted_data': ed
-            }).eq('id', property_id).execute()
-            # ensure local view reflects latest enriched extracted_data
+            # ensure local view reflects latest enriched extracted_data;
+            # the ATTOM bundle is persisted by the terminal update below
             extracted_data = ed
         except Exception:
             pass
 
-        from app.agents.market_insights_analyst import MarketInsightsAnalyst
         analyst = MarketInsightsAnalyst()
         
         # Run market analysis
-        print(f"Running market analysis with AI Agent #2...")
+        logger.info("Running market analysis with AI Agent #2...")
         market_insights = analyst.analyze_property(
             address=address,
             property_data=extracted_data
         )
         
-        print(f"Market insights generated: Price estimate ${market_insights.get('price_estimate', {}).get('estimated_value', 0):,}")
+        logger.info("Market insights generated: Price estimate $%s", market_insights.get('price_estimate', {}).get('estimated_value', 0))
 
         # Merge market insights into extracted_data
         current_data = property_record.get('extracted_data', {})
@@ -511,13 +694,28 @@ def enrich_property_data_task(self, property_id: str):
         except Exception:
             pass
         
-        # Update property with market insights
-        db.table('properties').update({
-            'extracted_data': current_data,
-            'status': 'enrichment_complete'
-        }).eq('id', property_id).execute()
+        # Update property with market insights. Ship only the changed keys
+        # through the server-side JSONB merge (migration 007/008); fall
+        # back to the classic full-blob update where the function is not
+        # deployed yet.
+        patch = {
+            k: v for k, v in current_data.items()
+            if k not in baseline_extracted or baseline_extracted[k] != v
+        }
+        try:
+            db.rpc('merge_extracted_data', {
+                'p_property_id': property_id,
+                'p_patch': _jsonb_arg(patch),
+                'p_status': 'enrichment_complete'
+            }).execute()
+        except Exception as rpc_error:
+            logger.warning("merge_extracted_data RPC unavailable (%s); using full update", rpc_error)
+            db.table('properties').update({
+                'extracted_data': current_data,
+                'status': 'enrichment_complete'
+            }).eq('id', property_id).execute()
         
-        print(f"Property enrichment complete for {property_id}")
+        logger.info("Property enrichment complete for %s", property_id)
         
         return {
             'status': 'success',
@@ -526,29 +724,43 @@ def enrich_property_data_task(self, property_id: str):
         }
         
     except Exception as e:
-        print(f"Error enriching property {property_id}: {str(e)}")
+        logger.error("Error enriching property %s: %s", property_id, e)
         
         # Update property status to failed
         try:
             db = get_admin_db()
-            current_data = db.table('properties').select('extracted_data').eq('id', property_id).execute().data[0].get('extracted_data', {})
+            if property_record is not None:
+                # Reuse the record already in scope; this also preserves any
+                # enrichment that landed in memory before the failure
+                current_data = property_record.get('extracted_data', {}) or {}
+            else:
+                # Failed before the record was fetched — fall back to a read
+                current_data = db.table('properties').select('extracted_data').eq('id', property_id).execute().data[0].get('extracted_data', {})
             current_data['enrichment_error'] = str(e)
             db.table('properties').update({
                 'status': 'failed',
                 'extracted_data': current_data
             }).eq('id', property_id).execute()
         except Exception as update_error:
-            print(f"Failed to update error status: {update_error}")
+            logger.error("Failed to update error status: %s", update_error)
         
-        # Retry with exponential backoff
-        raise self.retry(exc=e, countdown=2 ** self.request.retries)
+        # Retry with jittered exponential backoff; auth failures are
+        # permanent until the credential is fixed, so fail fast instead
+        if _is_auth_error(e):
+            raise
+        raise task.retry(exc=e, countdown=_retry_countdown(task.request.retries))
 
 
 @celery.task(name='generate_listing_copy', bind=True, max_retries=3)
 def generate_listing_copy_task(self, property_id: str):
+    """Standalone task wrapper around the listing-copy stage"""
+    return _generate_listing_copy(self, property_id)
+
+
+def _generate_listing_copy(task, property_id: str):
     """
-    Asynchronous task to generate listing copy
-    
+    Generate listing copy
+
     Uses AI Agent #3 (Listing Copywriter) to:
     1. Fetch property data and market insights
     2. Run AI copywriting agent
@@ -560,30 +772,32 @@ def generate_listing_copy_task(self, property_id: str):
     Args:
         property_id: UUID of the property
     """
+    # Bound before the try so the error handler can reuse the already
+    # fetched record instead of re-selecting it mid-failure
+    property_record = None
     try:
-        print(f"Generating listing copy for {property_id}")
+        logger.info("Generating listing copy for %s", property_id)
         
         # Get database client
         db = get_admin_db()
         
-        # Fetch property
-        result = db.table('properties').select('*').eq('id', property_id).execute()
-        
+        # Targeted select: copywriting only reads extracted_data
+        result = db.table('properties').select('id,extracted_data').eq('id', property_id).execute()
+
         if not result.data:
             raise ValueError(f"Property {property_id} not found")
-        
+
         property_record = result.data[0]
-        
+
         # Get extracted data (from Agent #1 and #2)
         extracted_data = property_record.get('extracted_data', {})
         market_insights = extracted_data.get('market_insights', {})
         
         # Initialize Listing Copywriter (Agent #3)
-        from app.agents.listing_copywriter import ListingCopywriter
         writer = ListingCopywriter()
         
         # Generate listing copy
-        print(f"Generating listing copy with AI Agent #3...")
+        logger.info("Generating listing copy with AI Agent #3...")
         listing_copy = writer.generate_listing(
             property_data=extracted_data,
             market_insights=market_insights,
@@ -591,27 +805,37 @@ def generate_listing_copy_task(self, property_id: str):
             target_audience="home_buyers"
         )
         
-        print(f"Listing generated: {listing_copy.get('headline', '')}")
+        logger.info("Listing generated: %s", listing_copy.get('headline', ''))
         
         # Generate social media variants
         social_variants = writer.generate_social_variants(listing_copy)
         
-        # Store listing copy in database
-        db.table('properties').update({
-            'generated_listing_text': listing_copy.get('description', ''),
-            'status': 'complete'
-        }).eq('id', property_id).execute()
-        
-        # Also store full listing data in extracted_data for frontend access
-        current_data = property_record.get('extracted_data', {})
-        current_data['listing_copy'] = listing_copy
-        current_data['social_variants'] = social_variants
-        
-        db.table('properties').update({
-            'extracted_data': current_data
-        }).eq('id', property_id).execute()
+        # Store listing text, listing data (for frontend access), and the
+        # terminal status in one round-trip. The server-side merge ships
+        # just the two new keys; the fallback writes the full blob where
+        # the migration 007/008 function is not deployed yet.
+        try:
+            db.rpc('merge_extracted_data', {
+                'p_property_id': property_id,
+                'p_patch': _jsonb_arg({
+                    'listing_copy': listing_copy,
+                    'social_variants': social_variants
+                }),
+                'p_status': 'complete',
+                'p_listing_text': listing_copy.get('description', '')
+            }).execute()
+        except Exception as rpc_error:
+            logger.warning("merge_extracted_data RPC unavailable (%s); using full update", rpc_error)
+            current_data = property_record.get('extracted_data', {})
+            current_data['listing_copy'] = listing_copy
+            current_data['social_variants'] = social_variants
+            db.table('properties').update({
+                'generated_listing_text': listing_copy.get('description', ''),
+                'extracted_data': current_data,
+                'status': 'complete'
+            }).eq('id', property_id).execute()
         
-        print(f"Listing copy generation complete for {property_id}")
+        logger.info("Listing copy generation complete for %s", property_id)
         
         return {
             'status': 'success',
@@ -620,58 +844,64 @@ def generate_listing_copy_task(self, property_id: str):
         }
         
     except Exception as e:
-        print(f"Error generating listing copy for {property_id}: {str(e)}")
+        logger.error("Error generating listing copy for %s: %s", property_id, e)
         
         # Update property status to failed
         try:
             db = get_admin_db()
-            current_data = db.table('properties').select('extracted_data').eq('id', property_id).execute().data[0].get('extracted_data', {})
+            if property_record is not None:
+                # Reuse the record already in scope instead of re-selecting
+                current_data = property_record.get('extracted_data', {}) or {}
+            else:
+                # Failed before the record was fetched — fall back to a read
+                current_data = db.table('properties').select('extracted_data').eq('id', property_id).execute().data[0].get('extracted_data', {})
             current_data['listing_error'] = str(e)
             db.table('properties').update({
                 'status': 'failed',
                 'extracted_data': current_data
             }).eq('id', property_id).execute()
         except Exception as update_error:
-            print(f"Failed to update error status: {update_error}")
+            logger.error("Failed to update error status: %s", update_error)
         
-        # Retry with exponential backoff
-        raise self.retry(exc=e, countdown=2 ** self.request.retries)
+        # Retry with jittered exponential backoff; auth failures are
+        # permanent until the credential is fixed, so fail fast instead
+        if _is_auth_error(e):
+            raise
+        raise task.retry(exc=e, countdown=_retry_countdown(task.request.retries))
 
 
-@celery.task(name='process_property_workflow')
-def process_property_workflow(property_id: str):
+@celery.task(name='process_property_workflow', bind=True, max_retries=3)
+def process_property_workflow(self, property_id: str):
     """
-    Chain all property processing tasks in sequence
-    
+    Run all property processing stages in sequence, in one worker slot
+
     Complete 3-Agent Workflow:
     1. Floor plan analysis (Agent #1: Floor Plan Analyst)
        - Extracts rooms, dimensions, features, sq ft
        - Status: processing → parsing_complete
-    
+
     2. Market insights enrichment (Agent #2: Market Insights Analyst)
        - ATTOM API bundle for property, comps, AVM, and market stats
        - Price estimation and investment analysis
        - Status: parsing_complete → enrichment_complete
-    
+
     3. Listing copy generation (Agent #3: Listing Copywriter)
        - MLS-ready description
        - Social media variants
        - Status: enrichment_complete → complete
-    
+
+    The stages used to be a Celery chain, which paid broker publish,
+    routing, and queued-to-start latency three times per property.
+    Calling the stage functions in-process keeps the whole pipeline to
+    one broker message and one worker pickup; the per-stage tasks stay
+    registered for standalone re-runs (e.g. re-enrichment).
+
+    A retry re-runs the pipeline from the first stage; every stage
+    overwrites its own output, so the rerun is idempotent.
+
     Args:
         property_id: UUID of the property
-    
-    Returns:
-        AsyncResult: Celery chain result
     """
-    from celery import chain
-    
-    # Create complete 3-agent task chain
-    # Use .si() (immutable signature) to prevent passing previous task results
-    workflow = chain(
-        process_floor_plan_task.si(property_id),
-        enrich_property_data_task.si(property_id),
-        generate_listing_copy_task.si(property_id)
-    )
-    
-    return workflow.apply_async()
+    _process_floor_plan(self, property_id)
+    _enrich_property_data(self, property_id)
+    return _generate_listing_copy(self, property_id)
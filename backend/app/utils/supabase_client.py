@@ -4,6 +4,7 @@ Manages connections to Supabase for database operations, auth, and storage
 """
 
 import os
+from functools import lru_cache
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
@@ -55,16 +56,22 @@ class SupabaseClient:
         """Reset client instances (useful for testing)"""
         cls._instance = None
         cls._service_client = None
+        get_supabase_client.cache_clear()
 
 
 # Convenience functions for quick access
+@lru_cache(maxsize=2)
 def get_supabase_client(use_service_role: bool = False) -> Client:
     """
     Get Supabase client instance
-    
+
+    Memoized per worker so hot request paths skip the env-var lookups and
+    singleton dispatch on every call; the underlying HTTPX connection pool
+    is reused across requests.
+
     Args:
         use_service_role: Whether to use service role key (bypasses RLS)
-    
+
     Returns:
         Configured Supabase client
     """
@@ -6,9 +6,12 @@ This test uses actual data from the database including the 1,415 sqft test floor
 """
 
 import os
+import pickle
 import sys
+import time
 from pathlib import Path
 
+import numpy as np
 import pytest
 from dotenv import load_dotenv
 
@@ -27,214 +30,99 @@ from app.services.regression_models import (
 from app.utils.supabase_client import get_admin_db
 
 
+_MOCK_IDS = [
+    'test-floor-plan',
+    'prop-2br-1ba',
+    'prop-3br-2ba',
+    'prop-3br-2ba-similar',
+    'prop-1br-1ba',
+    'prop-4br-3ba',
+    'prop-2br-2ba',
+    'prop-3br-1.5ba',
+    'prop-2br-1ba-compact',
+    'prop-3br-2.5ba',
+]
+
+# Columns: bedrooms, bathrooms, total_sqft, room_count, avg_room_sqft,
+# largest_room_sqft, smallest_room_sqft, has_garage, has_fireplace,
+# has_balcony, has_closets, num_doors, num_windows, sale_price,
+# quality_score, confidence. Realistic values including our test floor
+# plan (1,415 sqft); kept in structure-of-arrays form so the mock branch
+# feeds the matrix path without re-boxing.
+_MOCK_ROWS = np.array([
+    [1, 1.5, 1415,  8, 177, 441, 52, 1, 0, 0, 1,  8, 12, 350000, 96, 0.95],  # test floor plan
+    [2, 1.0, 1000,  6, 167, 250, 80, 0, 0, 1, 1,  6,  8, 280000, 85, 0.80],  # typical 2BR/1BA
+    [3, 2.0, 1800,  9, 200, 320, 70, 1, 1, 0, 1,  9, 14, 480000, 92, 0.88],  # large 3BR/2BA
+    [3, 2.0, 1500,  8, 187, 450, 55, 1, 1, 0, 1,  8, 12, 420000, 94, 0.90],  # similar to test plan
+    [1, 1.0,  800,  4, 200, 250, 80, 0, 0, 1, 1,  5,  6, 240000, 80, 0.75],  # smaller 1BR/1BA
+    [4, 3.0, 2500, 11, 227, 400, 60, 1, 1, 1, 1, 12, 18, 650000, 98, 0.95],  # luxury 4BR/3BA
+    [2, 2.0, 1200,  7, 171, 280, 75, 0, 1, 0, 1,  7, 10, 340000, 88, 0.82],  # mid-size 2BR/2BA
+    [3, 1.5, 1400,  8, 175, 300, 65, 1, 0, 0, 1,  8, 11, 390000, 90, 0.85],  # standard 3BR/1.5BA
+    [2, 1.0,  900,  5, 180, 230, 85, 0, 0, 0, 1,  5,  7, 260000, 82, 0.78],  # compact 2BR/1BA
+    [3, 2.5, 2000, 10, 200, 350, 70, 1, 1, 1, 1, 10, 15, 520000, 95, 0.92],  # large 3BR/2.5BA
+], dtype=np.float64)
+
+
+def create_mock_properties_array():
+    """Mock training data in structure-of-arrays form: (rows, ids)."""
+    return _MOCK_ROWS, _MOCK_IDS
+
+
 def create_mock_properties_for_testing():
     """
     Create mock property data for testing when database doesn't have enough properties
-    Based on realistic values including our test floor plan (1,415 sqft)
+    Thin object wrapper over _MOCK_ROWS for paths that still need PropertyFeatures
     """
     return [
-        # Property 1: Our test floor plan (1,415 sqft, 1 BR, 1.5 BA)
-        PropertyFeatures(
-            property_id='test-floor-plan',
-            bedrooms=1,
-            bathrooms=1.5,
-            total_sqft=1415,
-            room_count=8,
-            avg_room_sqft=177,
-            largest_room_sqft=441,  # Garage
-            smallest_room_sqft=52,  # Ldry/Util
-            has_garage=1,
-            has_fireplace=0,
-            has_balcony=0,
-            has_closets=1,
-            num_doors=8,
-            num_windows=12,
-            sale_price=350000,  # Estimated
-            quality_score=96,
-            confidence=0.95
-        ),
-        # Property 2: Typical 2BR/1BA (1,000 sqft)
-        PropertyFeatures(
-            property_id='prop-2br-1ba',
-            bedrooms=2,
-            bathrooms=1.0,
-            total_sqft=1000,
-            room_count=6,
-            avg_room_sqft=167,
-            largest_room_sqft=250,
-            smallest_room_sqft=80,
-            has_garage=0,
-            has_fireplace=0,
-            has_balcony=1,
-            has_closets=1,
-            num_doors=6,
-            num_windows=8,
-            sale_price=280000,
-            quality_score=85,
-            confidence=0.8
-        ),
-        # Property 3: Large 3BR/2BA (1,800 sqft)
-        PropertyFeatures(
-            property_id='prop-3br-2ba',
-            bedrooms=3,
-            bathrooms=2.0,
-            total_sqft=1800,
-            room_count=9,
-            avg_room_sqft=200,
-            largest_room_sqft=320,
-            smallest_room_sqft=70,
-            has_garage=1,
-            has_fireplace=1,
-            has_balcony=0,
-            has_closets=1,
-            num_doors=9,
-            num_windows=14,
-            sale_price=480000,
-            quality_score=92,
-            confidence=0.88
-        ),
-        # Property 4: Similar to test plan but 3BR/2BA (1,500 sqft)
-        PropertyFeatures(
-            property_id='prop-3br-2ba-similar',
-            bedrooms=3,
-            bathrooms=2.0,
-            total_sqft=1500,
-            room_count=8,
-            avg_room_sqft=187,
-            largest_room_sqft=450,
-            smallest_room_sqft=55,
-            has_garage=1,
-            has_fireplace=1,
-            has_balcony=0,
-            has_closets=1,
-            num_doors=8,
-            num_windows=12,
-            sale_price=420000,
-            quality_score=94,
-            confidence=0.9
-        ),
-        # Property 5: Smaller 1BR/1BA (800 sqft)
-        PropertyFeatures(
-            property_id='prop-1br-1ba',
-            bedrooms=1,
-            bathrooms=1.0,
-            total_sqft=800,
-            room_count=4,
-            avg_room_sqft=200,
-            largest_room_sqft=250,
-            smallest_room_sqft=80,
-            has_garage=0,
-            has_fireplace=0,
-            has_balcony=1,
-            has_closets=1,
-            num_doors=5,
-            num_windows=6,
-            sale_price=240000,
-            quality_score=80,
-            confidence=0.75
-        ),
-        # Property 6: Luxury 4BR/3BA (2,500 sqft)
-        PropertyFeatures(
-            property_id='prop-4br-3ba',
-            bedrooms=4,
-            bathrooms=3.0,
-            total_sqft=2500,
-            room_count=11,
-            avg_room_sqft=227,
-            largest_room_sqft=400,
-            smallest_room_sqft=60,
-            has_garage=1,
-            has_fireplace=1,
-            has_balcony=1,
-            has_closets=1,
-            num_doors=12,
-            num_windows=18,
-            sale_price=650000,
-            quality_score=98,
-            confidence=0.95
-        ),
-        # Property 7: Mid-size 2BR/2BA (1,200 sqft)
-        PropertyFeatures(
-            property_id='prop-2br-2ba',
-            bedrooms=2,
-            bathrooms=2.0,
-            total_sqft=1200,
-            room_count=7,
-            avg_room_sqft=171,
-            largest_room_sqft=280,
-            smallest_room_sqft=75,
-            has_garage=0,
-            has_fireplace=1,
-            has_balcony=0,
-            has_closets=1,
-            num_doors=7,
-            num_windows=10,
-            sale_price=340000,
-            quality_score=88,
-            confidence=0.82
-        ),
-        # Property 8: Standard 3BR/1.5BA (1,400 sqft)
         PropertyFeatures(
-            property_id='prop-3br-1.5ba',
-            bedrooms=3,
-            bathrooms=1.5,
-            total_sqft=1400,
-            room_count=8,
-            avg_room_sqft=175,
-            largest_room_sqft=300,
-            smallest_room_sqft=65,
-            has_garage=1,
-            has_fireplace=0,
-            has_balcony=0,
-            has_closets=1,
-            num_doors=8,
-            num_windows=11,
-            sale_price=390000,
-            quality_score=90,
-            confidence=0.85
-        ),
-        # Property 9: Compact 2BR/1BA (900 sqft)
-        PropertyFeatures(
-            property_id='prop-2br-1ba-compact',
-            bedrooms=2,
-            bathrooms=1.0,
-            total_sqft=900,
-            room_count=5,
-            avg_room_sqft=180,
-            largest_room_sqft=230,
-            smallest_room_sqft=85,
-            has_garage=0,
-            has_fireplace=0,
-            has_balcony=0,
-            has_closets=1,
-            num_doors=5,
-            num_windows=7,
-            sale_price=260000,
-            quality_score=82,
-            confidence=0.78
-        ),
-        # Property 10: Large 3BR/2.5BA (2,000 sqft)
-        PropertyFeatures(
-            property_id='prop-3br-2.5ba',
-            bedrooms=3,
-            bathrooms=2.5,
-            total_sqft=2000,
-            room_count=10,
-            avg_room_sqft=200,
-            largest_room_sqft=350,
-            smallest_room_sqft=70,
-            has_garage=1,
-            has_fireplace=1,
-            has_balcony=1,
-            has_closets=1,
-            num_doors=10,
-            num_windows=15,
-            sale_price=520000,
-            quality_score=95,
-            confidence=0.92
-        ),
+            property_id=pid,
+            bedrooms=int(r[0]),
+            bathrooms=float(r[1]),
+            total_sqft=int(r[2]),
+            room_count=int(r[3]),
+            avg_room_sqft=float(r[4]),
+            largest_room_sqft=int(r[5]),
+            smallest_room_sqft=int(r[6]),
+            has_garage=int(r[7]),
+            has_fireplace=int(r[8]),
+            has_balcony=int(r[9]),
+            has_closets=int(r[10]),
+            num_doors=int(r[11]),
+            num_windows=int(r[12]),
+            sale_price=float(r[13]),
+            quality_score=int(r[14]),
+            confidence=float(r[15]),
+        )
+        for pid, r in zip(_MOCK_IDS, _MOCK_ROWS)
     ]
 
+# Features pickled between runs so suite iteration skips the Supabase
+# round-trip; set FLOORIQ_REFRESH_FIXTURES=1 to force a re-fetch
+_FEATURES_CACHE = Path(__file__).parents[2] / '.pytest_cache' / 'features.pkl'
+_FEATURES_CACHE_MAX_AGE_SEC = 24 * 3600
+
+
+def _load_cached_features():
+    if os.getenv('FLOORIQ_REFRESH_FIXTURES') == '1':
+        return None
+    try:
+        if time.time() - _FEATURES_CACHE.stat().st_mtime < _FEATURES_CACHE_MAX_AGE_SEC:
+            with open(_FEATURES_CACHE, 'rb') as f:
+                return pickle.load(f)
+    except Exception:
+        pass
+    return None
+
+
+def _store_cached_features(features):
+    try:
+        _FEATURES_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        with open(_FEATURES_CACHE, 'wb') as f:
+            pickle.dump(features, f, protocol=5)
+    except Exception:
+        pass
+
+
 def _extract_features_from_database():
     try:
         db = get_admin_db()
@@ -275,9 +163,16 @@ def features_list():
     print("TEST 1: Extract Property Features from Database")
     print("="*70)
 
+    features = _load_cached_features()
+    if features:
+        print(f"✅ Loaded {len(features)} properties from fixture cache")
+        return features
+
     features = _extract_features_from_database()
 
     if features:
+        # Only real extractions are cached; the mock fallback is free
+        _store_cached_features(features)
         print(f"✅ Extracted {len(features)} properties from database")
         sample = features[0]
         print(f"\n   Sample Property:")
@@ -333,6 +228,15 @@ def regression_context(features_list):
     }
 
 
+@pytest.fixture(scope="module")
+def feature_matrix(features_list):
+    """Structure-of-arrays view of the features: one contiguous float64 X/y pair."""
+    priced = [f for f in features_list if f.sale_price is not None and f.sale_price > 0]
+    X, y, _ = PropertyRegressionModel()._prepare_feature_matrix(priced)
+    print(f"\n   Built feature matrix: X={X.shape} ({X.dtype}), y={y.shape}")
+    return X, y, priced
+
+
 def test_extract_from_database(features_list):
     """Ensure we have property features to train on."""
     assert features_list
@@ -347,6 +251,19 @@ def test_build_regression_model(regression_context):
     assert len(results.cross_val_scores) > 0
 
 
+def test_build_from_matrix_matches_object_path(feature_matrix, regression_context):
+    """The SoA matrix path should reproduce the object path's metrics."""
+    X, y, _ = feature_matrix
+    results = PropertyRegressionModel().build_from_matrix(X, y, model_type='ridge')
+    assert results is not None
+    # Same data, same split seed, same estimator — metrics must agree
+    baseline = regression_context["results"]
+    assert abs(results.r2_score - baseline.r2_score) < 1e-9
+    assert abs(results.mae - baseline.mae) < 1e-6
+    # The matrix path carries no PropertyFeatures, so no per-id predictions
+    assert results.predictions == {}
+
+
 def test_price_prediction(regression_context):
     """Test price prediction for test floor plan"""
     print("\n" + "="*70)
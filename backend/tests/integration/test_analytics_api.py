@@ -26,6 +26,15 @@ def client(app):
     return app.test_client()
 
 
+@pytest.fixture(autouse=True)
+def clear_model_cache():
+    """Keep the process-local model cache from leaking between tests"""
+    from app.routes import analytics
+    analytics._MODEL_CACHE.clear()
+    yield
+    analytics._MODEL_CACHE.clear()
+
+
 @pytest.fixture
 def auth_headers(app):
     """Create JWT authentication headers with valid token"""
@@ -140,6 +149,60 @@ def test_train_model_insufficient_data(mock_model_class, mock_db, mock_jwt, clie
     assert data['error'] == 'Insufficient data'
 
 
+@patch('app.routes.analytics.get_jwt_identity')
+@patch('app.routes.analytics.get_admin_db')
+@patch('app.routes.analytics.PropertyRegressionModel')
+def test_train_model_async(mock_model_class, mock_db, mock_jwt, client, auth_headers, mock_regression_results):
+    """Test background training returns 202 and completes via status endpoint"""
+    mock_jwt.return_value = 'user-123'
+
+    mock_model = Mock()
+    mock_model.extract_property_features.return_value = [Mock() for _ in range(15)]
+    mock_model.build_room_dimension_model.return_value = mock_regression_results
+    mock_model_class.return_value = mock_model
+
+    response = client.post(
+        '/api/analytics/model/train',
+        json={'model_type': 'ridge', 'async': True},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 202
+    data = json.loads(response.data)
+    assert data['status'] == 'queued'
+    job_id = data['job_id']
+
+    # Wait for the background future before polling
+    from app.routes import analytics
+    analytics._TRAIN_JOBS[job_id][1].result(timeout=10)
+
+    status_response = client.get(
+        f'/api/analytics/model/train/status/{job_id}',
+        headers=auth_headers
+    )
+
+    assert status_response.status_code == 200
+    status_data = json.loads(status_response.data)
+    assert status_data['status'] == 'complete'
+    assert status_data['result']['performance']['r2_score'] == 0.85
+
+    # Terminal status is delivered once; the job entry is evicted
+    assert job_id not in analytics._TRAIN_JOBS
+
+
+@patch('app.routes.analytics.get_jwt_identity')
+def test_train_status_unknown_job(mock_jwt, client, auth_headers):
+    """Test polling an unknown training job returns 404"""
+    mock_jwt.return_value = 'user-123'
+
+    response = client.get(
+        '/api/analytics/model/train/status/nonexistent-job',
+        headers=auth_headers
+    )
+
+    assert response.status_code == 404
+
+
 @patch('app.routes.analytics.get_jwt_identity')
 def test_train_model_invalid_type(mock_jwt, client, auth_headers):
     """Test model training with invalid model type"""
@@ -243,7 +306,7 @@ def test_predict_price_property_not_found(mock_get_features, mock_jwt, client, a
 # ============================================================================
 
 @patch('app.routes.analytics.get_jwt_identity')
-@patch('app.routes.analytics.get_property_features_from_db')
+@patch('app.routes.analytics.get_property_features_batch')
 @patch('app.routes.analytics.get_admin_db')
 @patch('app.routes.analytics.PropertyRegressionModel')
 def test_compare_properties_success(mock_model_class, mock_db, mock_get_features, mock_jwt, client, auth_headers):
@@ -271,7 +334,8 @@ def test_compare_properties_success(mock_model_class, mock_db, mock_get_features
         largest_room_sqft=280
     )
     
-    mock_get_features.side_effect = [features_a, features_b]
+    # Single batched lookup returns both properties
+    mock_get_features.return_value = {'prop-a': features_a, 'prop-b': features_b}
     
     # Mock comparison result
     mock_comparison = ComparisonResult(
@@ -388,6 +452,45 @@ def test_get_sqft_impact_not_trained(mock_model_class, mock_db, mock_jwt, client
     assert 'Model not trained' in data['message']
 
 
+# ============================================================================
+# TEST CONDITIONAL REQUESTS (ETag)
+# ============================================================================
+
+@patch('app.routes.analytics.get_jwt_identity')
+@patch('app.routes.analytics._get_property_rows')
+@patch('app.routes.analytics.get_property_features_from_db')
+@patch('app.routes.analytics.get_admin_db')
+@patch('app.routes.analytics.PropertyRegressionModel')
+def test_predict_etag_returns_304(mock_model_class, mock_db, mock_get_features, mock_get_rows, mock_jwt, client, auth_headers, mock_property_features):
+    """Test that a matching If-None-Match short-circuits prediction"""
+    mock_jwt.return_value = 'user-123'
+    mock_get_rows.return_value = {'test-property-id': {'id': 'test-property-id', 'updated_at': '2026-01-01T00:00:00Z'}}
+    mock_get_features.return_value = mock_property_features
+
+    mock_model = Mock()
+    mock_model.predict_price.return_value = 450000.0
+    mock_model.calculate_sqft_impact.return_value = 37.54
+    mock_model_class.return_value = mock_model
+
+    # First request: full response carries an ETag
+    response = client.get(
+        '/api/analytics/predict/test-property-id',
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    etag = response.headers.get('ETag')
+    assert etag
+
+    # Replay with If-None-Match: 304 with no prediction work
+    mock_model.predict_price.reset_mock()
+    response = client.get(
+        '/api/analytics/predict/test-property-id',
+        headers={**auth_headers, 'If-None-Match': etag}
+    )
+    assert response.status_code == 304
+    mock_model.predict_price.assert_not_called()
+
+
 # ============================================================================
 # TEST AUTHENTICATION
 # ============================================================================
@@ -5,7 +5,7 @@ Tests property search, AVM, sales history, and area stats
 
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-from app.clients.attom_client import AttomAPIClient
+from app.clients.attom_client import AttomAPIClient, NormalizedProperty
 
 
 @pytest.fixture
@@ -185,14 +185,37 @@ class TestAttomAPIClient:
         # First request
         start = time.time()
         attom_client._make_request('property/test')
-        
-        # Second request (should wait at least 500ms)
-        attom_client._make_request('property/test')
+
+        # Second request to a different endpoint (should wait at least 500ms)
+        attom_client._make_request('property/other')
         elapsed = time.time() - start
-        
+
         # Should take at least 500ms total
         assert elapsed >= 0.5
-    
+
+    @patch('app.clients.attom_client.requests.Session.get')
+    def test_cached_response_skips_rate_limit(self, mock_get, attom_client):
+        """Test repeated identical requests are served from cache without throttling"""
+        import time
+
+        mock_get.return_value.json.return_value = {
+            'status': {'code': 0},
+            'property': [{'identifier': {'attomId': '123'}}]
+        }
+        mock_get.return_value.raise_for_status = Mock()
+
+        first = attom_client._make_request('property/test')
+
+        # Identical request should hit the cache: no sleep, no extra HTTP call
+        start = time.time()
+        second = attom_client._make_request('property/test')
+        elapsed = time.time() - start
+
+        assert second == first
+        assert elapsed < 0.5
+        assert mock_get.call_count == 1
+        assert attom_client.request_count == 1
+
     @patch('app.clients.attom_client.requests.Session.get')
     def test_http_error_handling(self, mock_get, attom_client):
         """Test HTTP error handling"""
@@ -318,6 +341,57 @@ class TestAttomAPIClient:
         result = attom_client.get_nearby_properties_by_latlng(40.0, -73.0)
         assert result == []
 
+    @patch('app.clients.attom_client.requests.Session.get')
+    def test_search_property_returns_normalized_record(self, mock_get, attom_client, mock_property_response):
+        """Test search result is a slots-based NormalizedProperty with dict compatibility"""
+        mock_get.return_value.json.return_value = mock_property_response
+        mock_get.return_value.raise_for_status = Mock()
+
+        result = attom_client.search_property('123 Main St', city='Los Angeles', state='CA')
+
+        assert isinstance(result, NormalizedProperty)
+        # Attribute, item, and .get() access all work
+        assert result.square_feet == 1500
+        assert result['square_feet'] == 1500
+        assert result.get('missing_key', 'fallback') == 'fallback'
+        # Slots: no per-instance __dict__
+        assert not hasattr(result, '__dict__')
+        # to_dict() round-trips to the plain-dict shape for JSON/DB
+        as_dict = result.to_dict()
+        assert as_dict['attom_id'] == '123456789'
+        assert set(as_dict) >= {'attom_id', 'address', 'bedrooms', 'square_feet'}
+
+    @patch('app.clients.attom_client.requests.Session.get')
+    def test_get_full_profile_single_round_trip(self, mock_get, attom_client, mock_property_response):
+        """Test bundled profile demultiplexes property + AVM + sales in one call"""
+        bundled = mock_property_response
+        bundled['property'][0]['avm'] = {
+            'amount': {'value': 425000, 'low': 400000, 'high': 450000},
+            'confidenceScore': {'score': 85.0},
+            'fsd': 0.05,
+            'eventDate': '2025-10-13'
+        }
+        bundled['property'][0]['sale']['saleshistory'] = [
+            {'saleTransDate': '2020-01-15', 'saleAmtStndUnit': 350000, 'saleType': 'Resale'}
+        ]
+        mock_get.return_value.json.return_value = bundled
+        mock_get.return_value.raise_for_status = Mock()
+
+        result = attom_client.get_full_profile(
+            address='123 Main St',
+            city='Los Angeles',
+            state='CA',
+            zip_code='90001'
+        )
+
+        assert result['property']['attom_id'] == '123456789'
+        assert result['avm']['estimated_value'] == 425000
+        assert result['sales_history'][0]['sale_price'] == 350000
+
+        # One bundled round trip, no fallback calls
+        mock_get.assert_called_once()
+        assert 'allevents/detail' in mock_get.call_args[0][0]
+
     @patch('app.clients.attom_client.requests.Session.get')
     def test_get_sales_trends_v4_params_and_url(self, mock_get, attom_client):
         """Ensure v4 salestrend uses the exact endpoint and parameters"""
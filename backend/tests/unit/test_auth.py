@@ -25,6 +25,17 @@ def mock_supabase():
         yield mock.return_value
 
 
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    """Keep the per-worker auth caches from leaking between tests"""
+    from app.routes import auth
+    auth._USER_CACHE.clear()
+    auth._resolve_admin.cache_clear()
+    yield
+    auth._USER_CACHE.clear()
+    auth._resolve_admin.cache_clear()
+
+
 class TestRegistration:
     """Test user registration endpoint"""
     
@@ -129,7 +140,7 @@ class TestLogin:
         }]
         
         mock_supabase.auth.sign_in_with_password.return_value = mock_auth_response
-        mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = mock_user_data
+        mock_supabase.table.return_value.select.return_value.eq.return_value.limit.return_value.execute.return_value = mock_user_data
         
         # Make request
         response = client.post('/auth/login', json={
@@ -185,7 +196,7 @@ class TestTokenVerification:
         }]
         
         mock_supabase.auth.sign_in_with_password.return_value = mock_auth_response
-        mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = mock_user_data
+        mock_supabase.table.return_value.select.return_value.eq.return_value.limit.return_value.execute.return_value = mock_user_data
         
         # Login to get token
         login_response = client.post('/auth/login', json={
@@ -33,10 +33,10 @@ def test_normalize_address_google_prefers_neighborhood_and_queens_fix():
         import app.utils.geocoding as geocoding
         reload(geocoding)
 
-        # Mock requests.get to return our fake geocode payload
-        with patch("app.utils.geocoding.requests.get") as mock_get:
+        # Mock the pooled session's get to return our fake geocode payload
+        with patch("app.utils.geocoding._SESSION.get") as mock_get:
             mock_resp = Mock()
-            mock_resp.json.return_value = _fake_geocode_response()
+            mock_resp.content = json.dumps(_fake_geocode_response()).encode()
             mock_resp.raise_for_status = Mock()
             mock_get.return_value = mock_resp
 
@@ -39,7 +39,7 @@ def auth_token(client):
         }]
         
         mock_supabase.return_value.auth.sign_in_with_password.return_value = mock_auth_response
-        mock_supabase.return_value.table.return_value.select.return_value.eq.return_value.execute.return_value = mock_user_data
+        mock_supabase.return_value.table.return_value.select.return_value.eq.return_value.limit.return_value.execute.return_value = mock_user_data
         
         response = client.post('/auth/login', json={
             'email': 'test@example.com',
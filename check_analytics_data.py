@@ -3,6 +3,7 @@
 
 import os
 import sys
+from collections import Counter
 from pathlib import Path
 
 # Add backend to path
@@ -10,25 +11,45 @@ sys.path.insert(0, str(Path(__file__).parent / 'backend'))
 
 from app.utils.supabase_client import get_supabase_client
 
+ANALYTICS_STATUSES = frozenset({'complete', 'enrichment_complete'})
+
 def main():
     client = get_supabase_client()
-    
-    # Check all properties
-    result = client.table('properties').select('*').execute()
-    properties = result.data
-    
+
+    # Aggregate in Postgres instead of pulling every row (and its large
+    # extracted_data blob) over the wire. status_histogram() is defined
+    # in migration 010.
+    hist = client.rpc('status_histogram').execute().data or []
+    statuses = Counter({(row['status'] or 'unknown'): row['n'] for row in hist})
+
+    # Only the columns the report actually reads, filtered server-side
+    # to the analytics statuses. count='exact' carries the total in the
+    # response headers while just the three sample rows cross the wire,
+    # so memory stays bounded however large the table grows.
+    match_result = client.table('properties').select(
+        'id,status,'
+        'bedrooms:extracted_data->bedrooms,'
+        'bathrooms:extracted_data->bathrooms,'
+        'square_footage:extracted_data->square_footage',
+        count='exact'
+    ).in_('status', sorted(ANALYTICS_STATUSES)).limit(3).execute()
+    matching_count = match_result.count or 0
+    samples = match_result.data or []
+
+    # Price-estimate presence is filtered in Postgres too; only the
+    # status column comes back
+    priced = client.table('properties').select('status') \
+        .not_.is_('extracted_data->market_insights->price_estimate->>estimated_value', 'null') \
+        .execute().data or []
+    status_with_prices = Counter(p.get('status', 'unknown') for p in priced)
+
     print(f"\n{'='*80}")
-    print(f"TOTAL PROPERTIES: {len(properties)}")
+    print(f"TOTAL PROPERTIES: {sum(statuses.values())}")
     print(f"{'='*80}\n")
-    
+
     # Status breakdown
     print("STATUS BREAKDOWN:")
-    statuses = {}
-    for p in properties:
-        status = p.get('status', 'unknown')
-        statuses[status] = statuses.get(status, 0) + 1
-    
-    for status, count in sorted(statuses.items(), key=lambda x: -x[1]):
+    for status, count in statuses.most_common():
         print(f"  {status:30s}: {count}")
     
     print(f"\n{'='*80}\n")
@@ -36,37 +57,26 @@ def main():
     # Check properties that would match analytics query
     print("ANALYTICS QUERY SIMULATION:")
     print("Looking for properties with status in ('complete', 'enrichment_complete')...\n")
-    
-    matching = [p for p in properties if p.get('status') in ('complete', 'enrichment_complete')]
-    print(f"Found {len(matching)} properties matching analytics criteria")
-    
-    if len(matching) > 0:
+
+    print(f"Found {matching_count} properties matching analytics criteria")
+
+    if samples:
         print("\nSample properties:")
-        for p in matching[:3]:
-            ed = p.get('extracted_data', {}) or {}
-            print(f"  - ID: {p['id'][:8]}... | Beds: {ed.get('bedrooms')} | Baths: {ed.get('bathrooms')} | SqFt: {ed.get('square_footage')}")
+        for p in samples:
+            print(f"  - ID: {p['id'][:8]}... | Beds: {p.get('bedrooms')} | Baths: {p.get('bathrooms')} | SqFt: {p.get('square_footage')}")
     
     print(f"\n{'='*80}\n")
     
     # Check what statuses have complete data
     print("PROPERTIES WITH PRICE ESTIMATES (by status):")
-    status_with_prices = {}
-    for p in properties:
-        ed = p.get('extracted_data', {}) or {}
-        mi = ed.get('market_insights', {}) or {}
-        pe = mi.get('price_estimate', {}) or {}
-        if pe.get('estimated_value'):
-            status = p.get('status', 'unknown')
-            status_with_prices[status] = status_with_prices.get(status, 0) + 1
-    
-    for status, count in sorted(status_with_prices.items(), key=lambda x: -x[1]):
+    for status, count in status_with_prices.most_common():
         print(f"  {status:30s}: {count} properties")
     
     print(f"\n{'='*80}\n")
     
     # Recommendations
     print("RECOMMENDATION:")
-    if len(matching) < 5:
+    if matching_count < 5:
         most_common_status = max(statuses.items(), key=lambda x: x[1])[0]
         print(f"  Your properties have status '{most_common_status}' ({statuses[most_common_status]} properties)")
         print(f"  But analytics is looking for status 'complete' or 'enrichment_complete'")
@@ -74,7 +84,7 @@ def main():
         print(f"     Change: WHERE p.status IN ('complete', 'enrichment_complete')")
         print(f"     To:     WHERE p.status IN ('{most_common_status}')")
     else:
-        print(f"  ✅ You have enough properties ({len(matching)}) with the correct status!")
+        print(f"  ✅ You have enough properties ({matching_count}) with the correct status!")
         print(f"  The issue might be with missing square footage or price data.")
 
 if __name__ == '__main__':
@@ -0,0 +1,13 @@
+-- Derived Property Features Column
+-- Date: August 30, 2026
+-- Description: Persist precomputed regression features (PropertyFeatures) on
+-- properties so analytics endpoints read them back instead of re-deriving
+-- from extracted_data + floor_plan_measurements on every request.
+-- Populated at floor plan analysis time; NULL rows fall back to on-the-fly
+-- derivation in the analytics layer.
+
+ALTER TABLE public.properties
+    ADD COLUMN IF NOT EXISTS derived_features JSONB;
+
+COMMENT ON COLUMN public.properties.derived_features IS
+    'Precomputed PropertyFeatures payload (see app/services/regression_models.py); written when floor plan measurements are stored';
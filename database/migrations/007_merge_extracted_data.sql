@@ -0,0 +1,21 @@
+-- Server-Side extracted_data Merge
+-- Date: August 30, 2026
+-- Description: JSONB merge function so Celery tasks can ship only the keys
+-- they changed instead of round-tripping the full extracted_data blob
+-- (100s of KB once market insights and listing copy accumulate). The
+-- optional status argument lets a task land its terminal status change in
+-- the same statement.
+
+CREATE OR REPLACE FUNCTION public.merge_extracted_data(
+    p_property_id UUID,
+    p_patch JSONB,
+    p_status TEXT DEFAULT NULL
+)
+RETURNS VOID AS $$
+BEGIN
+    UPDATE public.properties
+    SET extracted_data = COALESCE(extracted_data, '{}'::jsonb) || p_patch,
+        status = COALESCE(p_status, status)
+    WHERE id = p_property_id;
+END;
+$$ LANGUAGE plpgsql;
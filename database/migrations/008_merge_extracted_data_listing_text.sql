@@ -0,0 +1,24 @@
+-- Extend merge_extracted_data With Listing Text
+-- Date: August 30, 2026
+-- Description: Adds an optional generated_listing_text argument so the
+-- copywriting task can land its patch, terminal status, and listing text
+-- in one statement. The old three-argument signature is dropped first so
+-- PostgREST RPC dispatch does not see an ambiguous overload.
+
+DROP FUNCTION IF EXISTS public.merge_extracted_data(UUID, JSONB, TEXT);
+
+CREATE OR REPLACE FUNCTION public.merge_extracted_data(
+    p_property_id UUID,
+    p_patch JSONB,
+    p_status TEXT DEFAULT NULL,
+    p_listing_text TEXT DEFAULT NULL
+)
+RETURNS VOID AS $$
+BEGIN
+    UPDATE public.properties
+    SET extracted_data = COALESCE(extracted_data, '{}'::jsonb) || p_patch,
+        status = COALESCE(p_status, status),
+        generated_listing_text = COALESCE(p_listing_text, generated_listing_text)
+    WHERE id = p_property_id;
+END;
+$$ LANGUAGE plpgsql;
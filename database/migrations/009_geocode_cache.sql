@@ -0,0 +1,15 @@
+-- Geocode Cache Table
+-- Date: August 30, 2026
+-- Description: Persistent second tier for the in-process geocode memo.
+-- Worker restarts empty the in-memory cache; previously-seen addresses
+-- are answered from here instead of repeating the billable Google call.
+
+CREATE TABLE IF NOT EXISTS public.geocode_cache (
+    address_hash TEXT PRIMARY KEY,
+    raw_address TEXT NOT NULL,
+    result JSONB NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- Only backend workers (service role) touch this table
+ALTER TABLE public.geocode_cache ENABLE ROW LEVEL SECURITY;
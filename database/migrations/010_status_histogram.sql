@@ -0,0 +1,12 @@
+-- Status Histogram Function
+-- Date: August 30, 2026
+-- Description: Server-side status counts for diagnostics. Grouping in
+-- Postgres means callers stop pulling every row (with its large
+-- extracted_data blob) over the wire just to count statuses.
+
+CREATE OR REPLACE FUNCTION public.status_histogram()
+RETURNS TABLE(status TEXT, n BIGINT) AS $$
+    SELECT status, count(*)
+    FROM public.properties
+    GROUP BY 1
+$$ LANGUAGE sql STABLE;
@@ -5,6 +5,9 @@ Tests the complete workflow: upload → analyze → enrich → generate listing
 """
 
 import requests
+import base64
+import os
+import random
 import time
 import json
 import sys
@@ -16,16 +19,61 @@ LOGIN_EMAIL = "jane.smith@realestate.com"
 LOGIN_PASSWORD = "Agent2025!"
 TEST_ADDRESS = "888 Lexington Avenue, New York, NY 10065"
 
+# Fallback 1x1 pixel PNG when no sample floor plan is on disk
+FALLBACK_PNG = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\nIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\r\n-\xb4\x00\x00\x00\x00IEND\xaeB`\x82'
+
+# JWT cached between runs so repeat invocations skip the login
+# round-trip (and the server-side password hash) entirely
+TOKEN_CACHE = Path.home() / '.floor_iq_e2e_token.json'
+
+def _jwt_expiry(token):
+    """Decode the exp claim from a JWT; 0 if it can't be read"""
+    try:
+        payload = token.split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=='))
+        return claims.get('exp', 0)
+    except Exception:
+        return 0
+
+def _load_cached_token():
+    """Return a cached token with >60s of life left, else None"""
+    try:
+        # Don't trust a cache file other users can read or write
+        if TOKEN_CACHE.stat().st_mode & 0o077:
+            return None
+        token = json.loads(TOKEN_CACHE.read_text()).get('token')
+        if token and _jwt_expiry(token) - time.time() > 60:
+            return token
+    except Exception:
+        pass
+    return None
+
+def _store_cached_token(token):
+    """Write the token cache atomically with owner-only permissions"""
+    try:
+        tmp = TOKEN_CACHE.with_suffix('.tmp')
+        tmp.write_text(json.dumps({'token': token}))
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, TOKEN_CACHE)
+    except Exception:
+        pass
+
 def print_step(step_num, message):
     """Print formatted step"""
     print(f"\n{'='*60}")
     print(f"Step {step_num}: {message}")
     print('='*60)
 
-def login():
+def login(session):
     """Login and get JWT token"""
     print_step(1, "Logging in")
-    response = requests.post(
+    cached = _load_cached_token()
+    if cached:
+        print(f"✅ Reusing cached token (skipped login round-trip)")
+        print(f"   Token: {cached[:30]}...")
+        return cached
+
+    response = session.post(
         f"{BASE_URL}/auth/login",
         json={"email": LOGIN_EMAIL, "password": LOGIN_PASSWORD}
     )
@@ -40,37 +88,41 @@ def login():
     print(f"✅ Login successful")
     if token:
         print(f"   Token: {token[:30]}...")
+        _store_cached_token(token)
     return token
 
-def create_property(token):
+def create_property(session, token):
     """Create a new property"""
     print_step(2, f"Creating property: {TEST_ADDRESS}")
     
-    # Try to use a real floor plan image if available
+    # Try to use a real floor plan image if available; pass the open
+    # file handle straight to requests so the upload streams instead of
+    # buffering the whole image in memory first
     floor_plan_path = Path('sample_floor_plan.png')
     if floor_plan_path.exists():
-        with open(floor_plan_path, 'rb') as f:
-            test_image = f.read()
+        fh = open(floor_plan_path, 'rb')
+        payload = fh
         print(f"   Using real floor plan: {floor_plan_path}")
     else:
-        # Fallback to simple 1x1 pixel PNG
-        test_image = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\nIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\r\n-\xb4\x00\x00\x00\x00IEND\xaeB`\x82'
+        fh = None
+        payload = FALLBACK_PNG
         print(f"   Using test 1x1 PNG")
-    
-    files = {
-        'file': ('test_floor_plan.png', test_image, 'image/png')
-    }
+
     data = {
         'address': TEST_ADDRESS
     }
-    
-    response = requests.post(
-        f"{BASE_URL}/api/properties/upload",
-        headers={"Authorization": f"Bearer {token}"},
-        files=files,
-        data=data
-    )
-    
+
+    try:
+        response = session.post(
+            f"{BASE_URL}/api/properties/upload",
+            headers={"Authorization": f"Bearer {token}"},
+            files={'file': ('test_floor_plan.png', payload, 'image/png')},
+            data=data
+        )
+    finally:
+        if fh:
+            fh.close()
+
     if response.status_code not in [200, 201]:
         print(f"❌ Property creation failed: {response.status_code}")
         print(response.text)
@@ -91,30 +143,142 @@ def create_property(token):
     print(f"   Address: {address}")
     return property_id
 
-def wait_for_processing(token, property_id, max_wait=120):
-    """Wait for property processing to complete"""
+def _wait_realtime(session, token, property_id, max_wait):
+    """Block on a Supabase Realtime UPDATE instead of polling
+
+    Returns the terminal status ('completed'/'failed') the moment the row
+    changes — wake-up latency is one network hop instead of up to a full
+    poll interval. Returns None when realtime isn't usable here (library
+    or credentials missing, subscribe failure, timeout) so the caller can
+    fall back to the polling loop.
+    """
+    try:
+        from dotenv import load_dotenv
+        from supabase import create_client
+    except ImportError:
+        return None
+
+    load_dotenv(Path(__file__).parent / 'backend' / '.env')
+    load_dotenv()
+    url = os.getenv('SUPABASE_URL')
+    key = os.getenv('SUPABASE_ANON_KEY')
+    if not url or not key:
+        return None
+
+    import threading
+    done = threading.Event()
+    terminal = {}
+
+    def on_update(payload):
+        record = (payload.get('data') or {}).get('record') or payload.get('new') or {}
+        status = record.get('status')
+        if status in ('completed', 'failed'):
+            terminal['status'] = status
+            done.set()
+
+    try:
+        client = create_client(url, key)
+        channel = client.channel(f'property:{property_id}')
+        channel.on_postgres_changes(
+            event='UPDATE',
+            schema='public',
+            table='properties',
+            filter=f'id=eq.{property_id}',
+            callback=on_update,
+        ).subscribe()
+    except Exception:
+        return None
+
+    try:
+        # Guard the subscribe race: if processing finished before the
+        # channel came up, no UPDATE will ever arrive
+        response = session.get(
+            f"{BASE_URL}/api/properties/{property_id}",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        if response.status_code == 200 and response.json().get('status') in ('completed', 'failed'):
+            return response.json().get('status')
+
+        print("   Subscribed to realtime updates (no polling)")
+        done.wait(timeout=max_wait)
+        return terminal.get('status')
+    finally:
+        try:
+            client.remove_channel(channel)
+        except Exception:
+            pass
+
+
+def wait_for_processing(session, token, property_id, max_wait=120):
+    """Wait for property processing to complete
+
+    Prefers a push-based realtime subscription; falls back to the
+    backoff polling loop when realtime is unavailable.
+    """
     print_step(3, "Waiting for AI processing")
-    
+
+    start_time = time.time()
+    status = _wait_realtime(session, token, property_id, max_wait)
+    if status is not None:
+        response = session.get(
+            f"{BASE_URL}/api/properties/{property_id}",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        if response.status_code != 200:
+            print(f"❌ Failed to get property after realtime event: {response.status_code}")
+            return None
+        data = response.json()
+        if status == 'completed':
+            print(f"✅ Processing completed in {int(time.time() - start_time)}s")
+            return data
+        print(f"❌ Processing failed")
+        print(f"   Error: {data.get('error_message', 'Unknown error')}")
+        return None
+
+    remaining = max_wait - (time.time() - start_time)
+    if remaining <= 0:
+        print(f"❌ Timeout after {max_wait}s")
+        return None
+    return _poll_for_processing(session, token, property_id, remaining)
+
+
+def _poll_for_processing(session, token, property_id, max_wait):
+    """Polling fallback with backoff + jitter"""
     start_time = time.time()
     last_status = None
-    
+    attempt = 0
+    consecutive_errors = 0
+
     while time.time() - start_time < max_wait:
-        response = requests.get(
+        response = session.get(
             f"{BASE_URL}/api/properties/{property_id}",
             headers={"Authorization": f"Bearer {token}"}
         )
-        
+
         if response.status_code != 200:
-            print(f"❌ Failed to get property status: {response.status_code}")
-            return None
-        
+            # Circuit-breaker style: tolerate transient errors, but trip
+            # after three in a row instead of polling out the deadline
+            consecutive_errors += 1
+            print(f"⚠️  Status poll failed: {response.status_code} ({consecutive_errors}/3)")
+            if consecutive_errors >= 3:
+                print(f"❌ Giving up after {consecutive_errors} consecutive poll failures")
+                return None
+            delay = min(5.0, 0.5 * 2 ** attempt)
+            time.sleep(random.uniform(0, delay))
+            attempt += 1
+            continue
+        consecutive_errors = 0
+
         data = response.json()
         status = data.get('status')
-        
+
         if status != last_status:
             print(f"   Status: {status}")
             last_status = status
-        
+            # Poll aggressively again around a state transition — the next
+            # one often follows quickly
+            attempt = 0
+
         if status == 'completed':
             print(f"✅ Processing completed in {int(time.time() - start_time)}s")
             return data
@@ -122,8 +286,12 @@ def wait_for_processing(token, property_id, max_wait=120):
             print(f"❌ Processing failed")
             print(f"   Error: {data.get('error_message', 'Unknown error')}")
             return None
-        
-        time.sleep(3)
+
+        # Exponential backoff with full jitter instead of a fixed 3s: fast
+        # completions are detected sooner and long waits poll less often
+        delay = min(5.0, 0.5 * 2 ** attempt)
+        time.sleep(random.uniform(0, delay))
+        attempt += 1
     
     print(f"❌ Timeout after {max_wait}s")
     return None
@@ -191,18 +359,22 @@ def main():
     print("AI FLOOR PLAN INSIGHTS - END-TO-END TEST")
     print("="*60)
     
+    # One keep-alive session for the whole run; the poll loop alone makes
+    # dozens of requests that would each pay a fresh TCP handshake
+    session = requests.Session()
+
     # Login
-    token = login()
+    token = login(session)
     if not token:
         sys.exit(1)
-    
+
     # Create property
-    property_id = create_property(token)
+    property_id = create_property(session, token)
     if not property_id:
         sys.exit(1)
-    
+
     # Wait for processing
-    property_data = wait_for_processing(token, property_id)
+    property_data = wait_for_processing(session, token, property_id)
     if not property_data:
         sys.exit(1)
     